@@ -0,0 +1,466 @@
+"""Benchmarks of the scitorch converters.
+
+Run all benchmarks and store the results as JSON baseline:
+
+    python benchmarks/bench.py run --output baseline.json
+
+Compare a new run against a stored baseline and flag regressions:
+
+    python benchmarks/bench.py run --output current.json
+    python benchmarks/bench.py compare baseline.json current.json --threshold 0.1
+
+Every benchmark is identified by its suite, function, unit, size, dtype and number of intra-op
+threads. The reported time is the median over several repetitions, in seconds per call.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import mmap
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import torch
+
+from scitorch.conversion import aio, digital, distributed, energy, mass, temperature
+from scitorch.conversion.files import convert_file
+from scitorch.conversion.parsing import parse_quantities
+from scitorch.conversion.shards import convert_directory
+from scitorch.client import Client
+from scitorch.server import serve
+from scitorch.conversion.stream import convert_stream
+from scitorch.quantity import Quantity
+
+SIZES = {
+    'scalar': None,
+    '1e3': 10**3,
+    '1e6': 10**6,
+    '1e8': 10**8,
+}
+
+DTYPES = {
+    'float32': torch.float32,
+    'float64': torch.float64,
+}
+
+# (function, unit) pairs covering every converter.
+CONVERTERS = [
+    (digital.to_bytes, 'MiB'),
+    (digital.to_bytes, 'Kbit'),
+    (digital.to_bits, 'GB'),
+    (energy.to_joule, 'eV'),
+    (energy.to_joule, 'KWh'),
+    (mass.to_kilogram, 'mg'),
+    (temperature.to_kelvin, 'f'),
+    (temperature.to_celsius, 'k'),
+    (temperature.to_fahrenheit, 'c'),
+]
+
+# Suites register themselves here as name -> function(args) returning a list of results.
+SUITES = {}
+
+
+def suite(func):
+    SUITES[func.__name__] = func
+    return func
+
+
+def measure(stmt, repeat, min_time=0.05):
+    """Returns the median time per call of `stmt` in seconds."""
+
+    number, _ = timeit.Timer(stmt).autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = timeit.Timer(stmt).repeat(repeat=repeat, number=number)
+    return statistics.median(times) / number
+
+
+def thread_counts(max_threads):
+    counts = [1]
+    while counts[-1] * 2 <= max_threads:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_threads:
+        counts.append(max_threads)
+    return counts
+
+
+def make_input(size, dtype):
+    if size is None:
+        return 1.0
+    return torch.rand(size, dtype=dtype)
+
+
+@suite
+def converters(args):
+    results = []
+    for threads in thread_counts(args.threads):
+        torch.set_num_threads(threads)
+        for size_name in args.sizes:
+            size = SIZES[size_name]
+            for dtype_name in args.dtypes:
+                if size is None and dtype_name != 'float64':
+                    continue
+                val = make_input(size, DTYPES[dtype_name])
+                for func, unit in CONVERTERS:
+                    seconds = measure(lambda: func(val, unit, dtype='preserve'), args.repeat)
+                    results.append(dict(suite='converters', function=f'{func.__module__}.{func.__name__}',
+                                        unit=unit, size=size_name, dtype=dtype_name, threads=threads,
+                                        seconds=seconds))
+    return results
+
+
+@suite
+def quantity(args):
+    """Overhead of unit propagation in Quantity against plain tensors of 1e3 elements."""
+
+    results = []
+    torch.set_num_threads(1)
+    plain = torch.rand(1000, dtype=torch.float64)
+    tagged = Quantity(plain.clone(), 'B')
+    other = Quantity(plain.clone(), 'B')
+    operations = {
+        'add': lambda a, b: a + b,
+        'mul_scalar': lambda a, b: a * 2,
+        'mul': lambda a, b: a * b,
+        'slice': lambda a, b: a[10:500],
+        'sum': lambda a, b: a.sum(),
+        'cat': lambda a, b: torch.cat([a, b]),
+    }
+    for name, operation in operations.items():
+        raw = measure(lambda: operation(plain, plain), args.repeat)
+        wrapped = measure(lambda: operation(tagged, other), args.repeat)
+        for variant, seconds in (('tensor', raw), ('quantity', wrapped)):
+            results.append(dict(suite='quantity', function=name, unit=variant, size='1e3', dtype='float64',
+                                threads=1, seconds=seconds))
+        print(f'quantity {name:12s} overhead {(wrapped - raw) * 1e6:6.2f} us')
+    return results
+
+
+@suite
+def stream(args):
+    """Throughput of convert_stream (scitorch convert) on 10^6 newline and CSV delimited values."""
+
+    results = []
+    torch.set_num_threads(1)
+    values = (torch.rand(10**6, dtype=torch.float64) * 2**40).round().tolist()
+    lines = ''.join(f'{value:.0f}\n' for value in values).encode()
+    rows = ''.join(f'host{i},{value:.0f}\n' for i, value in enumerate(values)).encode()
+    for name, data, kwargs in (('lines', lines, {}), ('csv', rows, dict(delimiter=',', columns=[1]))):
+        seconds = measure(lambda: convert_stream(io.BytesIO(data), io.BytesIO(), 'B', 'GiB', **kwargs), args.repeat)
+        results.append(dict(suite='stream', function=name, unit='B->GiB', size='1e6', dtype='float64', threads=1,
+                            seconds=seconds))
+        print(f'stream {name:6s} {len(data) / seconds / 1e6:8.1f} MB/s')
+    return results
+
+
+@suite
+def formatting(args):
+    """Autoscaling and formatting of 10^6 byte counts."""
+
+    results = []
+    torch.set_num_threads(1)
+    val = torch.rand(10**6, dtype=torch.float64) * 2**50
+    for func in (digital.autoscale, digital.format_bytes):
+        seconds = measure(lambda: func(val), args.repeat)
+        results.append(dict(suite='formatting', function=f'{func.__module__}.{func.__name__}', unit='B', size='1e6',
+                            dtype='float64', threads=1, seconds=seconds))
+    return results
+
+
+@suite
+def parsing(args):
+    """Throughput of parse_quantities on 10^6 storage quantities in eight units."""
+
+    results = []
+    torch.set_num_threads(1)
+    units = ['B', 'KB', 'MiB', 'GiB', 'TiB', 'Kbit', 'Mbit', 'b']
+    values = (torch.rand(10**6, dtype=torch.float64) * 1000).tolist()
+    records = [f'{value:.3f} {units[i % len(units)]}' for i, value in enumerate(values)]
+    data = '\n'.join(records).encode()
+    for name, source in (('list', records), ('bytes', data)):
+        seconds = measure(lambda: parse_quantities(source), args.repeat)
+        results.append(dict(suite='parsing', function=name, unit='mixed', size='1e6', dtype='float64', threads=1,
+                            seconds=seconds))
+        print(f'parsing {name:6s} {len(values) / seconds / 1e6:6.2f} M records/s')
+    return results
+
+
+@suite
+def files(args):
+    """Throughput of convert_file from a flat binary file of 2^26 float32 values (256 MiB) to flat binary and .npy."""
+
+    results = []
+    torch.set_num_threads(1)
+    nbytes = 2**26 * 4
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, 'in.raw')
+        with open(src, 'wb+') as f:
+            f.truncate(nbytes)
+            with mmap.mmap(f.fileno(), 0) as mm:
+                values = torch.frombuffer(mm, dtype=torch.float32)
+                values.uniform_(-100, 100)
+                del values
+        for name in ('raw', 'npy'):
+            dst = os.path.join(directory, f'out.{name}')
+            seconds = measure(lambda: convert_file(src, dst, 'f', 'k', src_dtype='float32', dtype='float32'),
+                              args.repeat)
+            results.append(dict(suite='files', function=name, unit='f->k', size='2^26', dtype='float32', threads=1,
+                                seconds=seconds))
+            print(f'files {name:4s} {nbytes / seconds / 1e6:8.1f} MB/s')
+    return results
+
+
+@suite
+def shards(args):
+    """Scaling of convert_directory with the number of worker processes on 16 shards of 2^23 float32 values."""
+
+    results = []
+    nbytes = 2**23 * 4
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, 'in')
+        os.mkdir(src)
+        for i in range(16):
+            with open(os.path.join(src, f'shard{i:02d}.raw'), 'wb+') as f:
+                f.truncate(nbytes)
+                with mmap.mmap(f.fileno(), 0) as mm:
+                    values = torch.frombuffer(mm, dtype=torch.float32)
+                    values.uniform_(-100, 100)
+                    del values
+        baseline = None
+        for workers in thread_counts(args.threads):
+            dst = os.path.join(directory, f'out{workers}')
+            seconds = statistics.median(
+                convert_directory(src, dst, 'f', 'k', workers=workers, src_dtype='float32', dtype='float32')['seconds']
+                for _ in range(args.repeat))
+            baseline = baseline or seconds
+            results.append(dict(suite='shards', function=f'{workers} workers', unit='f->k', size='16x2^23',
+                                dtype='float32', threads=1, seconds=seconds))
+            print(f'shards {workers:3d} workers {16 * nbytes / seconds / 1e6:8.1f} MB/s '
+                  f'speedup {baseline / seconds:5.2f}')
+    return results
+
+
+def _distributed_rank(rank, world_size, store, repeat, queue):
+    torch.set_num_threads(1)
+    torch.distributed.init_process_group('gloo', init_method=f'file://{store}', rank=rank, world_size=world_size)
+    try:
+        val = torch.rand(2**22, dtype=torch.float64) * 2**40
+        distributed.convert_reduce(val, 'B', 'GiB', bins=64)
+        times = []
+        for _ in range(repeat):
+            torch.distributed.barrier()
+            start = timeit.default_timer()
+            distributed.convert_reduce(val, 'B', 'GiB', bins=64)
+            times.append(timeit.default_timer() - start)
+        queue.put(statistics.median(times))
+    finally:
+        torch.distributed.destroy_process_group()
+
+
+@suite
+def distributed_gloo(args):
+    """Weak scaling of distributed.convert_reduce on gloo with 2^22 values and a 64 bin histogram per rank."""
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    baseline = None
+    for world_size in thread_counts(args.threads):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = context.Queue()
+            processes = [context.Process(target=_distributed_rank,
+                                         args=(rank, world_size, os.path.join(directory, 'store'), args.repeat, queue))
+                         for rank in range(world_size)]
+            for process in processes:
+                process.start()
+            seconds = max(queue.get() for _ in processes)
+            for process in processes:
+                process.join()
+        baseline = baseline or seconds
+        results.append(dict(suite='distributed_gloo', function=f'{world_size} ranks', unit='B->GiB', size='2^22/rank',
+                            dtype='float64', threads=1, seconds=seconds))
+        print(f'distributed {world_size:3d} ranks {seconds * 1e3:8.2f} ms efficiency {baseline / seconds:5.2f}')
+    return results
+
+
+def _server_client(mode, address, requests, queue):
+    """Sends `requests` conversions of 8 values and puts their latencies into `queue`."""
+
+    val = [float(i) for i in range(8)]
+    latencies = []
+    if mode == 'server':
+        client = Client(address)
+        convert = lambda: client.to_bytes(val, 'MiB')
+    else:
+        torch.set_num_threads(1)
+        convert = lambda: digital.to_bytes(val, 'MiB').tolist()
+    convert()
+    for _ in range(requests):
+        start = timeit.default_timer()
+        convert()
+        latencies.append(timeit.default_timer() - start)
+    queue.put(latencies)
+
+
+@suite
+def server(args):
+    """Throughput and p99 latency of the conversion server against conversion in every client process,
+    for concurrent clients sending 2000 requests of 8 values each."""
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    requests = 2000
+    with tempfile.TemporaryDirectory() as directory:
+        address = os.path.join(directory, 'scitorch.sock')
+        process = context.Process(target=serve, args=(address,), daemon=True)
+        process.start()
+        while not os.path.exists(address):
+            time.sleep(0.01)
+        for clients in thread_counts(args.threads):
+            for mode in ('server', 'local'):
+                queue = context.Queue()
+                workers = [context.Process(target=_server_client, args=(mode, address, requests, queue))
+                           for _ in range(clients)]
+                for worker in workers:
+                    worker.start()
+                latencies = sorted(latency for _ in workers for latency in queue.get())
+                for worker in workers:
+                    worker.join()
+                p99 = latencies[int(len(latencies) * 0.99)]
+                throughput = len(latencies) / (sum(latencies) / clients)
+                results.append(dict(suite='server', function=mode, unit='MiB', size='8', dtype='float64',
+                                    threads=clients, seconds=statistics.median(latencies), p99=p99,
+                                    throughput=throughput))
+                print(f'server {mode:6s} {clients:3d} clients {throughput:10.0f} requests/s '
+                      f'p99 {p99 * 1e6:8.1f} us')
+        process.terminate()
+    return results
+
+
+@suite
+def asyncio_lag(args):
+    """Event-loop lag while 8 tasks convert 2^22 values 10 times each, inline and with scitorch.conversion.aio."""
+
+    results = []
+    torch.set_num_threads(1)
+    val = torch.rand(2**22, dtype=torch.float64)
+
+    async def inline(val, unit):
+        return digital.to_bytes(val, unit)
+
+    async def load(convert):
+        lags = []
+        done = False
+
+        async def ticker():
+            while not done:
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start - 0.001)
+
+        async def worker():
+            for _ in range(10):
+                await convert(val, 'MiB')
+
+        tick = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0.01)
+        await asyncio.gather(*(worker() for _ in range(8)))
+        done = True
+        await tick
+        return sorted(lags)
+
+    for name, convert in (('inline', inline), ('aio', aio.to_bytes)):
+        loop = asyncio.new_event_loop()
+        try:
+            lags = loop.run_until_complete(load(convert))
+        finally:
+            loop.close()
+        p99 = lags[int(len(lags) * 0.99)]
+        results.append(dict(suite='asyncio_lag', function=name, unit='MiB', size='2^22', dtype='float64', threads=1,
+                            seconds=p99))
+        print(f'asyncio {name:6s} p99 event-loop lag {p99 * 1e3:8.3f} ms')
+    return results
+
+
+def key(result):
+    return tuple(str(result.get(field)) for field in ('suite', 'function', 'unit', 'size', 'dtype', 'threads'))
+
+
+def run(args):
+    results = []
+    for name in args.suites:
+        results.extend(SUITES[name](args))
+    report = dict(
+        machine=dict(platform=platform.platform(), processor=platform.processor(),
+                     python=platform.python_version(), torch=torch.__version__,
+                     cpus=os.cpu_count()),
+        results=results)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+    for result in results:
+        print(f'{" ".join(key(result)):80s} {result["seconds"]:.3e} s')
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = {key(result): result for result in json.load(f)['results']}
+    with open(args.current) as f:
+        current = {key(result): result for result in json.load(f)['results']}
+
+    regressions = 0
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name]['seconds'], current[name]['seconds']
+        change = after / before - 1
+        flag = ''
+        if change > args.threshold:
+            flag = 'REGRESSION'
+            regressions += 1
+        elif change < -args.threshold:
+            flag = 'improvement'
+        print(f'{" ".join(name):80s} {before:.3e} -> {after:.3e} s {change:+7.1%} {flag}')
+    for name in sorted(baseline.keys() - current.keys()):
+        print(f'{" ".join(name):80s} missing in {args.current}')
+
+    print(f'{regressions} regression(s) beyond {args.threshold:.0%}.')
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the scitorch converters.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help='run benchmarks and store the results as JSON')
+    run_parser.add_argument('--output', default='bench_output.json', help='JSON file for the results')
+    run_parser.add_argument('--suites', nargs='+', default=['converters'], choices=sorted(SUITES),
+                            help='benchmark suites to run')
+    run_parser.add_argument('--sizes', nargs='+', default=list(SIZES), choices=list(SIZES),
+                            help='input sizes')
+    run_parser.add_argument('--dtypes', nargs='+', default=list(DTYPES), choices=list(DTYPES),
+                            help='input dtypes')
+    run_parser.add_argument('--threads', type=int, default=torch.get_num_threads(),
+                            help='largest number of intra-op threads (runs 1, 2, 4, ... up to it)')
+    run_parser.add_argument('--repeat', type=int, default=5, help='repetitions per benchmark')
+
+    compare_parser = commands.add_parser('compare', help='compare two JSON results and flag regressions')
+    compare_parser.add_argument('baseline', help='JSON file of the baseline run')
+    compare_parser.add_argument('current', help='JSON file of the run to check')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative slowdown that counts as regression (default: 0.1)')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+from scitorch._config import set_device, get_device, set_dtype, get_dtype, set_range_check, get_range_check, \
+    set_container, get_container, using
@@ -0,0 +1,260 @@
+"""Runtime configuration of the device, dtype, range check and container type used by scitorch.
+
+The defaults are read once at import time from the environment variables SCITORCH_DEVICE,
+SCITORCH_DTYPE, SCITORCH_RANGE_CHECK and SCITORCH_CONTAINER, falling back to the device stored
+in scitorch/_device.py, float64, 'ignore' and 'tensor'. They can be changed for the whole process, for the current thread only, or for a block of code:
+
+>>> scitorch.set_device('cuda')
+>>> scitorch.set_dtype('float32', local=True)
+>>> with scitorch.using(device='cpu', dtype='preserve'):
+...     digital.to_bytes(x, 'MB')
+
+No file is written and no module has to be reloaded, so concurrent processes and threads can
+each work with their own settings.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from scitorch._lazy import torch
+from scitorch._device import DEVICE as _PERSISTED_DEVICE
+
+# Names accepted as dtype policy besides torch.dtype objects. 'preserve' keeps floating point
+# tensors in their own dtype and promotes everything else to float64.
+_DTYPES = ('preserve', 'float64', 'float32', 'float16', 'bfloat16')
+
+# What to do when a conversion overflows or underflows its dtype, see set_range_check().
+_RANGE_CHECKS = ('ignore', 'warn', 'raise')
+
+# Container type of conversion results, see set_container().
+_CONTAINERS = ('tensor', 'same')
+
+# Per-thread overrides of the process-wide defaults.
+_local = threading.local()
+
+# Process-wide defaults, resolved on first use so that importing scitorch does not import torch.
+_ENV_DEVICE = os.environ.get('SCITORCH_DEVICE')
+_ENV_DTYPE = os.environ.get('SCITORCH_DTYPE')
+_ENV_RANGE_CHECK = os.environ.get('SCITORCH_RANGE_CHECK')
+_ENV_CONTAINER = os.environ.get('SCITORCH_CONTAINER')
+_device = None
+_dtype = None
+_range_check = None
+_container = None
+
+
+def resolve_device(device):
+    """Returns `device` as torch.device."""
+
+    return torch.device(device)
+
+
+def resolve_dtype(dtype):
+    """Returns the dtype policy for `dtype` ('preserve' or a floating point torch.dtype)."""
+
+    if isinstance(dtype, torch.dtype):
+        if not dtype.is_floating_point:
+            raise ValueError(f'{dtype} is not a floating point dtype.')
+        return dtype
+    if dtype == 'preserve':
+        return dtype
+    if dtype in _DTYPES:
+        return getattr(torch, dtype)
+    raise ValueError(f'{dtype} is not a supported dtype policy. Use one of {", ".join(_DTYPES)} '
+                     f'or a floating point torch.dtype.')
+
+
+def resolve_range_check(mode):
+    """Returns `mode` if it is a valid range check mode."""
+
+    if mode in _RANGE_CHECKS:
+        return mode
+    raise ValueError(f'{mode} is not a supported range check. Use one of {", ".join(_RANGE_CHECKS)}.')
+
+
+def resolve_container(container):
+    """Returns `container` if it is a valid container policy."""
+
+    if container in _CONTAINERS:
+        return container
+    raise ValueError(f'{container} is not a supported container. Use one of {", ".join(_CONTAINERS)}.')
+
+
+def _defaults():
+    global _device, _dtype
+    if _device is None:
+        _device = resolve_device(_ENV_DEVICE or _PERSISTED_DEVICE)
+    if _dtype is None:
+        _dtype = resolve_dtype(_ENV_DTYPE or 'float64')
+    return _device, _dtype
+
+
+def set_device(device, local=False):
+    """Sets the device on which conversions create tensors.
+
+    Parameters:
+    -----------
+
+    device -- (str or torch.device) e.g. 'cpu', 'cuda' or 'cuda:1'
+    local -- (bool) only change the device of the calling thread
+
+    """
+
+    global _device
+    device = resolve_device(device)
+    if local:
+        _local.device = device
+    else:
+        _device = device
+
+
+def get_device():
+    """Returns the device of the calling thread."""
+
+    return getattr(_local, 'device', None) or _device or _defaults()[0]
+
+
+def set_dtype(dtype, local=False):
+    """Sets the default dtype policy of all conversions.
+
+    Parameters:
+    -----------
+
+    dtype -- (str or torch.dtype) 'preserve', 'float64', 'float32', 'float16', 'bfloat16' or a
+             floating point torch.dtype
+    local -- (bool) only change the dtype policy of the calling thread
+
+    Example:
+    --------
+
+    >>> scitorch.set_dtype('preserve')
+    >>> digital.to_bytes(torch.ones(2, dtype=torch.float32), 'KB')
+    tensor([1000., 1000.])
+
+    """
+
+    global _dtype
+    dtype = resolve_dtype(dtype)
+    if local:
+        _local.dtype = dtype
+    else:
+        _dtype = dtype
+
+
+def get_dtype():
+    """Returns the dtype policy of the calling thread."""
+
+    return getattr(_local, 'dtype', None) or _dtype or _defaults()[1]
+
+
+def set_range_check(mode, local=False):
+    """Sets how conversions report results that overflow or underflow their dtype.
+
+    With 'warn' or 'raise', every conversion first computes the magnitudes of its results in
+    float64 and emits a RuntimeWarning or raises FloatingPointError if a finite input gives a result
+    beyond the largest finite value of the result dtype (overflow), or a non-zero result below its
+    smallest normal value (underflow, only checked for conversions without offset). This costs
+    an extra pass over the input, so the default is 'ignore'.
+
+    Within the normal range, the relative error of a result is at most 1.5 * eps of its dtype
+    (torch.finfo(dtype).eps), e.g. 3.3e-16 for float64, 1.8e-7 for float32, 1.5e-3 for float16
+    and 1.2e-2 for bfloat16. Temperature conversions have an offset, so for them the bound
+    applies to the absolute error relative to |val * scale| + |offset|.
+
+    Parameters:
+    -----------
+
+    mode -- (str) 'ignore', 'warn' or 'raise'
+    local -- (bool) only change the range check of the calling thread
+
+    Example:
+    --------
+
+    >>> scitorch.set_range_check('raise')
+    >>> energy.to_joule(1, 'eV', dtype='float16')
+    FloatingPointError: 1 of 1 values underflow torch.float16 (smallest magnitude 1.6e-19 < 6.1e-05).
+
+    """
+
+    global _range_check
+    mode = resolve_range_check(mode)
+    if local:
+        _local.range_check = mode
+    else:
+        _range_check = mode
+
+
+def get_range_check():
+    """Returns the range check mode of the calling thread."""
+
+    return (getattr(_local, 'range_check', None) or _range_check
+            or resolve_range_check(_ENV_RANGE_CHECK or 'ignore'))
+
+
+def set_container(container, local=False):
+    """Sets the container type of conversion results.
+
+    With 'tensor' all conversions return tensors. With 'same', NumPy arrays give NumPy arrays that
+    share the memory of the result tensor, and conversions with `out=` or `inplace=True` return the
+    given `out` or `val` object itself. Other inputs still give tensors; DLPack consumers can take
+    them over with from_dlpack without a copy.
+
+    Parameters:
+    -----------
+
+    container -- (str) 'tensor' or 'same'
+    local -- (bool) only change the container type of the calling thread
+
+    Example:
+    --------
+
+    >>> scitorch.set_container('same')
+    >>> digital.to_bytes(numpy.ones(2), 'KB')
+    array([1000., 1000.])
+
+    """
+
+    global _container
+    container = resolve_container(container)
+    if local:
+        _local.container = container
+    else:
+        _container = container
+
+
+def get_container():
+    """Returns the container type of the calling thread."""
+
+    return (getattr(_local, 'container', None) or _container
+            or resolve_container(_ENV_CONTAINER or 'tensor'))
+
+
+@contextmanager
+def using(device=None, dtype=None, range_check=None, container=None):
+    """Context manager that overrides device, dtype policy, range check and/or container type for the
+    calling thread.
+
+    Example:
+    --------
+
+    >>> with scitorch.using(dtype='float32'):
+    ...     energy.to_joule([1, 2], 'eV')
+    tensor([1.6022e-19, 3.2044e-19])
+
+    """
+
+    saved = dict(_local.__dict__)
+    try:
+        if device is not None:
+            set_device(device, local=True)
+        if dtype is not None:
+            set_dtype(dtype, local=True)
+        if range_check is not None:
+            set_range_check(range_check, local=True)
+        if container is not None:
+            set_container(container, local=True)
+        yield
+    finally:
+        _local.__dict__.clear()
+        _local.__dict__.update(saved)
@@ -1,3 +1 @@
-import torch 
-
-DEVICE = torch.device('cpu')
\ No newline at end of file
+DEVICE = 'cpu'
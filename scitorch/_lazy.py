@@ -0,0 +1,25 @@
+"""Lazy import of PyTorch.
+
+Importing torch takes about a second and hundreds of MB of memory, which is wasted on programs
+that only need the constants. Modules of scitorch therefore use
+
+    from scitorch._lazy import torch
+
+which imports torch on first attribute access, i.e. when the first tensor is created.
+"""
+
+import importlib
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        # Later lookups hit the instance dict and cost the same as on the real module.
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+torch = _LazyModule('torch')
@@ -0,0 +1,47 @@
+"""Wire format of the conversion server (scitorch.server) and its client (scitorch.client).
+
+Both directions exchange frames of a fixed header followed by a variable part, little endian:
+
+    request:  request id (uint32), number of values (uint32), length of from_unit and to_unit
+              (uint8 each), from_unit and to_unit (UTF-8), values (float64)
+    response: request id (uint32), number of values or message bytes (uint32), status (uint8),
+              values (float64) if the status is OK, else the error message (UTF-8)
+
+This module does not import torch.
+"""
+
+import struct
+
+REQUEST = struct.Struct('<IIBB')
+RESPONSE = struct.Struct('<IIB')
+
+OK = 0
+ERROR = 1
+
+# values per request; the server closes connections that announce more
+MAX_VALUES = 1 << 24
+
+# Exceptions that are raised again on the client side, by name; everything else is a RuntimeError.
+ERRORS = {error.__name__: error for error in (NotImplementedError, ValueError, TypeError, FloatingPointError)}
+
+
+def recv_exact(sock, size):
+    """Returns exactly `size` bytes from `sock`, or None if the connection is closed first."""
+
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            return None
+        view = view[received:]
+    return buffer
+
+
+def error_message(error):
+    return f'{type(error).__name__}: {error}'.encode()
+
+
+def raise_error(message):
+    name, _, text = message.decode().partition(': ')
+    raise ERRORS.get(name, RuntimeError)(text)
@@ -0,0 +1,122 @@
+"""Client of the local conversion server (see scitorch.server). It does not import torch.
+
+>>> from scitorch.client import Client
+>>> with Client('/tmp/scitorch.sock') as client:
+...     client.to_bytes([1, 2], 'KiB')
+[1024.0, 2048.0]
+"""
+
+import socket
+import threading
+from array import array
+
+from scitorch import _protocol
+
+
+class Client(object):
+    """Connection to a conversion server.
+
+    Calls are safe from several threads, but are sent one at a time; concurrent callers get the
+    best throughput with one Client each, whose requests the server batches together. Conversion
+    errors such as unknown units are raised and keep the connection usable; after any other error,
+    e.g. a timeout, the connection is closed and further calls raise ConnectionError.
+
+    Parameters:
+    -----------
+
+    address -- (str or tuple) path of the Unix socket, or (host, port) of the TCP socket
+    timeout -- (float) seconds to wait for the server; forever if None
+
+    """
+
+    def __init__(self, address, timeout=None):
+        if isinstance(address, tuple):
+            self._sock = socket.create_connection(address, timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(address)
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def convert(self, val, from_unit, to_unit):
+        """Converts numbers from any unit to any other unit of the same family, as
+        scitorch.conversion.convert.
+
+        Parameters:
+        -----------
+
+        val -- (float or iterable of float) value(s)
+        from_unit -- (str) unit of val, e.g. 'Mbit', 'KWh', 'mg' or 'f'
+        to_unit -- (str) unit of the result, from the same family as from_unit
+
+        Returns:
+        --------
+
+        val -- (float or list of float) value(s) in to_unit
+
+        """
+
+        scalar = isinstance(val, (int, float))
+        values = array('d', [val] if scalar else val)
+        if len(values) > _protocol.MAX_VALUES:
+            raise ValueError(f'at most {_protocol.MAX_VALUES} values can be sent per request, not {len(values)}.')
+        units = from_unit.encode(), to_unit.encode()
+        with self._lock:
+            sock = self._sock
+            if sock is None:
+                raise ConnectionError('the connection to the conversion server was closed.')
+            try:
+                self._next_id = request_id = (self._next_id + 1) & 0xffffffff
+                sock.sendall(_protocol.REQUEST.pack(request_id, len(values), *map(len, units))
+                             + b''.join(units) + values.tobytes())
+                header = _protocol.recv_exact(sock, _protocol.RESPONSE.size)
+                if header is None:
+                    raise ConnectionError('the conversion server closed the connection.')
+                response_id, size, status = _protocol.RESPONSE.unpack(header)
+                payload = _protocol.recv_exact(sock, size * 8 if status == _protocol.OK else size)
+                if payload is None or response_id != request_id:
+                    raise ConnectionError('the conversion server sent an invalid response.')
+            except BaseException:
+                # a timeout or an interrupt can leave part of a frame unread, so the connection
+                # cannot be used for further requests
+                sock.close()
+                self._sock = None
+                raise
+        if status != _protocol.OK:
+            _protocol.raise_error(payload)
+        result = array('d', payload).tolist()
+        return result[0] if scalar else result
+
+    def to_bytes(self, val, unit='B'):
+        return self.convert(val, unit, 'B')
+
+    def to_bits(self, val, unit='b'):
+        return self.convert(val, unit, 'b')
+
+    def to_joule(self, val, unit='J'):
+        return self.convert(val, unit, 'J')
+
+    def to_kilogram(self, val, unit='kg'):
+        return self.convert(val, unit, 'kg')
+
+    def to_kelvin(self, val, scale='k'):
+        return self.convert(val, scale, 'k')
+
+    def to_celsius(self, val, scale='c'):
+        return self.convert(val, scale, 'c')
+
+    def to_fahrenheit(self, val, scale='f'):
+        return self.convert(val, scale, 'f')
+
+    def close(self):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,2 @@
+from scitorch.constants._cache import tensor, stack
+from scitorch.constants._dimensions import Dimension, dimension
@@ -0,0 +1,95 @@
+"""Cached tensors of the constants in scitorch.constants.constants."""
+
+from scitorch._lazy import torch
+from scitorch import _config
+from scitorch.constants import constants
+
+# Tensors per (name(s), device, dtype), built on first use. They are shared between all
+# callers and must not be modified in place.
+_CACHE = {}
+
+
+def _value(name):
+    try:
+        val = getattr(constants, name)
+    except (AttributeError, TypeError):
+        raise KeyError(f'{name} is not a known constant.') from None
+    if isinstance(val, dict):
+        return val.get('val')
+    if isinstance(val, (int, float)):
+        return val
+    raise KeyError(f'{name} is not a known constant.')
+
+
+def _cached(names, device, dtype, build):
+    """Returns the cached tensor of `names`, built by `build(device, dtype)` on the first use.
+
+    Hits are looked up by the arguments as given, with the settings of the calling thread for
+    omitted ones, so the device and dtype are only resolved on a miss.
+    """
+
+    key = (names, _config.get_device() if device is None else device,
+           _config.get_dtype() if dtype is None else dtype)
+    try:
+        return _CACHE[key]
+    except KeyError:
+        pass
+    device = _config.resolve_device(key[1])
+    dtype = _config.resolve_dtype(key[2])
+    if dtype == 'preserve':
+        dtype = torch.float64
+    # other spellings of the same device and dtype share one tensor
+    resolved = (names, device, dtype)
+    if resolved not in _CACHE:
+        _CACHE[resolved] = build(device, dtype)
+    _CACHE[key] = _CACHE[resolved]
+    return _CACHE[key]
+
+
+def tensor(name, device=None, dtype=None):
+    """Returns a constant as cached 0-d tensor.
+
+    The tensor is created once per constant, device and dtype and reused afterwards, so it must
+    not be modified in place.
+
+    Parameters:
+    -----------
+
+    name -- (str) name of the constant in scitorch.constants.constants, e.g. 'eV' or 'k_B'
+    device -- (str or torch.device) device of the tensor, defaults to scitorch.get_device()
+    dtype -- (str or torch.dtype) dtype of the tensor, defaults to scitorch.get_dtype()
+
+    Example:
+    --------
+
+    >>> from scitorch import constants
+    >>> constants.tensor('eV')
+    tensor(1.6022e-19, dtype=torch.float64)
+
+    """
+
+    return _cached(name, device, dtype, lambda device, dtype: torch.tensor(_value(name), device=device, dtype=dtype))
+
+
+def stack(names, device=None, dtype=None):
+    """Returns several constants stacked into one cached 1-d tensor.
+
+    Parameters:
+    -----------
+
+    names -- (list of str) names of the constants in scitorch.constants.constants
+    device -- (str or torch.device) device of the tensor, defaults to scitorch.get_device()
+    dtype -- (str or torch.dtype) dtype of the tensor, defaults to scitorch.get_dtype()
+
+    Example:
+    --------
+
+    >>> from scitorch import constants
+    >>> constants.stack(['c', 'h', 'k_B'])
+    tensor([2.9979e+08, 6.6261e-34, 1.3806e-23], dtype=torch.float64)
+
+    """
+
+    names = tuple(names)
+    return _cached(names, device, dtype,
+                   lambda device, dtype: torch.tensor([_value(name) for name in names], device=device, dtype=dtype))
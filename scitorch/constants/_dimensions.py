@@ -0,0 +1,216 @@
+"""Dimension algebra for the dim strings of scitorch.constants.constants.
+
+A dim string such as 'J*mol^(-1)*K^(-1)' is parsed once into the exponents of the seven SI base
+units. The exponents are packed into one integer with a biased 16-bit field per base unit, so that
+multiplying two dimensions is an integer addition, a power is an integer multiplication and an
+equality check is an integer comparison. Exponents are limited to -128...127; the upper 8 bits of
+each field only serve to detect overflows of products and quotients. Parsed exponents and powers
+that could carry across the 16 bits of a field are range checked before they are packed.
+"""
+
+import re
+
+# SI base units in the order of their fields in the packed integer
+BASE = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+
+_BITS = 16
+_OFFSET = 1 << 7
+_BIAS = sum(_OFFSET << (_BITS * i) for i in range(len(BASE)))
+_MASK = (1 << 8) - 1
+_GUARD = sum(((1 << _BITS) - 1 - _MASK) << (_BITS * i) for i in range(len(BASE)))
+_LIMIT = 1 << (_BITS * len(BASE))
+
+# derived SI units as exponents of the base units (m, kg, s, A, K, mol, cd)
+DERIVED = {
+    'Hz': (0, 0, -1, 0, 0, 0, 0),
+    'N': (1, 1, -2, 0, 0, 0, 0),
+    'Pa': (-1, 1, -2, 0, 0, 0, 0),
+    'J': (2, 1, -2, 0, 0, 0, 0),
+    'W': (2, 1, -3, 0, 0, 0, 0),
+    'C': (0, 0, 1, 1, 0, 0, 0),
+    'V': (2, 1, -3, -1, 0, 0, 0),
+    'F': (-2, -1, 4, 2, 0, 0, 0),
+    'Omega': (2, 1, -3, -2, 0, 0, 0),
+    'S': (-2, -1, 3, 2, 0, 0, 0),
+    'Wb': (2, 1, -2, -1, 0, 0, 0),
+    'T': (0, 1, -2, -1, 0, 0, 0),
+    'H': (2, 1, -2, -2, 0, 0, 0),
+}
+
+_TERM = re.compile(r'^(\w+)(?:\^\((-?\d+)\))?$')
+
+# packed integer per dim string, filled by dimension()
+_PARSED = {}
+# Dimension instance per packed integer
+_INTERNED = {}
+
+
+def _overflow():
+    return OverflowError(f'Exponents of a dimension must be between {-_OFFSET} and {_OFFSET - 1}.')
+
+
+def _pack(exponents):
+    if not all(-_OFFSET <= exponent < _OFFSET for exponent in exponents):
+        raise _overflow()
+    code = _BIAS
+    for i, exponent in enumerate(exponents):
+        code += exponent << (_BITS * i)
+    return code
+
+
+def _unpack(code):
+    return tuple(((code >> (_BITS * i)) & _MASK) - _OFFSET for i in range(len(BASE)))
+
+
+_SYMBOLS = {unit: _pack([int(unit == base) for base in BASE]) for unit in BASE}
+_SYMBOLS.update({unit: _pack(exponents) for unit, exponents in DERIVED.items()})
+_SYMBOLS['1'] = _BIAS
+
+
+def _intern(code):
+    try:
+        return _INTERNED[code]
+    except KeyError:
+        if code & _GUARD or not 0 <= code < _LIMIT:
+            raise _overflow()
+        dim = _INTERNED[code] = object.__new__(Dimension)
+        dim._code = code
+        return dim
+
+
+def _parse(dim):
+    exponents = [0] * len(BASE)
+    for term in dim.replace(' ', '').split('*'):
+        match = _TERM.match(term)
+        if match is None:
+            raise ValueError(f'{term!r} in {dim!r} is not of the form unit or unit^(n).')
+        unit, exponent = match.groups()
+        try:
+            symbol = _SYMBOLS[unit]
+        except KeyError:
+            raise NotImplementedError(f'{unit} is not a known unit. See documentation for available units.') \
+                from None
+        factor = 1 if exponent is None else int(exponent)
+        for i, base in enumerate(_unpack(symbol)):
+            exponents[i] += base * factor
+    return _pack(exponents)
+
+
+class Dimension(object):
+    """Dimension of a physical quantity as exponents of the SI base units.
+
+    Instances are interned, so every dimension exists only once. Use dimension() to create them.
+
+    Example:
+    --------
+
+    >>> from scitorch.constants import dimension
+    >>> dimension('J*s^(-1)') == dimension('W')
+    True
+    >>> dimension('m') ** 3 / dimension('kg*s^(2)')
+    Dimension('m^(3)*kg^(-1)*s^(-2)')
+
+    """
+
+    __slots__ = ('_code',)
+
+    def __new__(cls, dim):
+        return dimension(dim)
+
+    def __reduce__(self):
+        return dimension, (str(self),)
+
+    @property
+    def exponents(self):
+        """(tuple of int) exponents of m, kg, s, A, K, mol and cd"""
+        return _unpack(self._code)
+
+    def __mul__(self, other):
+        if type(other) is not Dimension:
+            return NotImplemented
+        # fields of valid codes add up to at most 2 * 255, the guard bits of _intern() catch overflows
+        return _intern(self._code + other._code - _BIAS)
+
+    def __truediv__(self, other):
+        if type(other) is not Dimension:
+            return NotImplemented
+        return _intern(self._code - other._code + _BIAS)
+
+    def __pow__(self, exponent):
+        if type(exponent) is not int:
+            return NotImplemented
+        if -_OFFSET <= exponent < _OFFSET:
+            # fields stay below 128 * 128, so overflows cannot carry past the guard bits
+            return _intern(self._code * exponent - _BIAS * (exponent - 1))
+        return _intern(_pack([base * exponent for base in _unpack(self._code)]))
+
+    def __eq__(self, other):
+        if type(other) is not Dimension:
+            return NotImplemented
+        return self._code == other._code
+
+    def __ne__(self, other):
+        if type(other) is not Dimension:
+            return NotImplemented
+        return self._code != other._code
+
+    def __hash__(self):
+        return hash(self._code)
+
+    def __bool__(self):
+        return self._code != _BIAS
+
+    def __str__(self):
+        terms = []
+        for unit, exponent in zip(BASE, self.exponents):
+            if exponent == 1:
+                terms.append(unit)
+            elif exponent:
+                terms.append(f'{unit}^({exponent})')
+        return '*'.join(terms) or '1'
+
+    def __repr__(self):
+        return f"Dimension('{self}')"
+
+
+def dimension(dim):
+    """Returns the Dimension of a dim string or a constant.
+
+    Dim strings are products of units with optional integer exponents as used in
+    scitorch.constants.constants, e.g. 'm^(3)*kg^(-1)*s^(-2)'. Units are the SI base units
+    (m, kg, s, A, K, mol, cd), the derived units Hz, N, Pa, J, W, C, V, F, Omega, S, Wb, T and H,
+    and '1' for dimensionless. Each string is parsed only once.
+
+    Parameters:
+    -----------
+
+    dim -- (str, dict or Dimension) dim string, constant with a 'dim' entry or Dimension
+
+    Returns:
+    --------
+
+    (Dimension) dimension
+
+    Example:
+    --------
+
+    >>> from scitorch.constants import constants, dimension
+    >>> dimension(constants.R) == dimension(constants.k_B) / dimension('mol')
+    True
+
+    """
+
+    if type(dim) is Dimension:
+        return dim
+    try:
+        return _intern(_PARSED[dim])
+    except KeyError:
+        pass
+    except TypeError:
+        if isinstance(dim, dict) and 'dim' in dim:
+            return dimension(dim['dim'])
+        raise TypeError(f'dim must be a str, a constant or a Dimension, not {type(dim).__name__}.') from None
+    if not isinstance(dim, str):
+        raise TypeError(f'dim must be a str, a constant or a Dimension, not {type(dim).__name__}.')
+    _PARSED[dim] = _parse(dim)
+    return _intern(_PARSED[dim])
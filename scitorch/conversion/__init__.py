@@ -0,0 +1,2 @@
+from scitorch.conversion.generic import convert, parse_unit
+from scitorch.conversion.parsing import parse_quantities
@@ -0,0 +1,588 @@
+"""Registry of unit families and their conversion factors to the base unit of each family."""
+
+import sys
+import threading
+import warnings
+from fractions import Fraction
+
+from scitorch._lazy import torch
+from scitorch import _config
+from scitorch.constants import constants
+from scitorch.tools._tensors import T, ingest, is_read_only, restore
+
+# Every family maps a unit to a tuple (factor, offset) such that
+#
+#     base = val * factor + offset
+#
+# The factors of the units listed below are computed once at import time. Any other prefixed
+# unit (e.g. 'GWh', 'EiB' or 'µg') is parsed on first use and then added to its family, so that
+# every conversion costs one dict lookup and a single elementwise tensor operation.
+
+STORAGE = {
+    'B': (1, 0),
+    'KB': (constants.kilo, 0),
+    'MB': (constants.mega, 0),
+    'GB': (constants.giga, 0),
+    'TB': (constants.tera, 0),
+    'PB': (constants.peta, 0),
+    'KiB': (constants.kibi, 0),
+    'MiB': (constants.mebi, 0),
+    'GiB': (constants.gibi, 0),
+    'TiB': (constants.tebi, 0),
+    'PiB': (constants.pebi, 0),
+    'b': (1 / 8, 0),
+    'Kbit': (125, 0),
+    'Mbit': (125 * constants.kilo, 0),
+    'Gbit': (125 * constants.mega, 0),
+    'Tbit': (125 * constants.giga, 0),
+    'Pbit': (125 * constants.tera, 0),
+    'Kib': (constants.kibi / 8, 0),
+    'Mib': (constants.mebi / 8, 0),
+    'Gib': (constants.gibi / 8, 0),
+    'Tib': (constants.tebi / 8, 0),
+    'Pib': (constants.pebi / 8, 0),
+}
+
+ENERGY = {
+    'J': (1, 0),
+    'KJ': (constants.kilo, 0),
+    'Wh': (3600, 0),
+    'KWh': (3.6 * constants.mega, 0),
+    'eV': (constants.eV.get('val'), 0),
+}
+
+MASS = {
+    'kg': (1, 0),
+    'g': (constants.milli, 0),
+    'mg': (constants.micro, 0),
+    't': (constants.kilo, 0),
+}
+
+# Temperature scales are given by the size of one degree in Kelvin and the freezing point of
+# water on that scale. Every pair of scales collapses into one (scale, offset) pair anchored at
+# the freezing point, which keeps the offset exact in floating point and needs no detour
+# through Kelvin.
+_SCALES = {
+    'k': (Fraction(1), 273.15),
+    'c': (Fraction(1), 0),
+    'f': (Fraction(5, 9), 32),
+}
+
+
+def _temperature_pair(src, dst):
+    scale = float(_SCALES[src][0] / _SCALES[dst][0])
+    return scale, _SCALES[dst][1] - _SCALES[src][1] * scale
+
+
+TEMPERATURE = {scale: _temperature_pair(scale, 'k') for scale in _SCALES}
+
+TEMPERATURE_PAIRS = {(src, dst): _temperature_pair(src, dst) for src in _SCALES for dst in _SCALES}
+
+FAMILIES = {
+    'storage': STORAGE,
+    'energy': ENERGY,
+    'mass': MASS,
+    'temperature': TEMPERATURE,
+}
+
+BASE = {
+    'storage': 'B',
+    'energy': 'J',
+    'mass': 'kg',
+    'temperature': 'k',
+}
+
+_NOUN = {
+    'temperature': 'scales',
+}
+
+SI_PREFIXES = {
+    'Y': constants.yotta,
+    'Z': constants.zetta,
+    'E': constants.exa,
+    'P': constants.peta,
+    'T': constants.tera,
+    'G': constants.giga,
+    'M': constants.mega,
+    'k': constants.kilo,
+    'h': constants.hecto,
+    'da': constants.deka,
+    'd': constants.deci,
+    'c': constants.centi,
+    'm': constants.milli,
+    'µ': constants.micro,
+    'μ': constants.micro,
+    'u': constants.micro,
+    'n': constants.nano,
+    'p': constants.pico,
+    'f': constants.femto,
+    'a': constants.atto,
+    'z': constants.zepto,
+    'y': constants.yocto,
+}
+
+BINARY_PREFIXES = {
+    'Ki': constants.kibi,
+    'Mi': constants.mebi,
+    'Gi': constants.gibi,
+    'Ti': constants.tebi,
+    'Pi': constants.pebi,
+    'Ei': constants.exbi,
+    'Zi': constants.zebi,
+    'Yi': constants.yobi,
+}
+
+# Base units that accept prefixes, with their factor, and the prefixes they accept. Storage
+# takes only whole-number prefixes, with 'K' for kilo; lowercase 'k' is rejected so that 'kb'
+# is not silently read as kilobit. Energy accepts 'K' besides 'k' as in 'KJ' and 'KWh'.
+PREFIXED = {
+    'storage': (
+        {'bit': 1 / 8, 'B': 1, 'b': 1 / 8},
+        dict({'K': constants.kilo}, **{p: SI_PREFIXES[p] for p in 'MGTPEZY'}, **BINARY_PREFIXES),
+    ),
+    'energy': (
+        {'Wh': 3600, 'eV': constants.eV.get('val'), 'J': 1},
+        dict(SI_PREFIXES, K=constants.kilo),
+    ),
+    'mass': (
+        {'g': constants.milli},
+        SI_PREFIXES,
+    ),
+}
+
+# Integer unit codes for mixed-unit conversions: the code of a unit is its position in UNITS.
+# Parsed units are appended in place, so that module level aliases such as digital.UNITS stay
+# current.
+UNITS = {family: list(table) for family, table in FAMILIES.items()}
+CODES = {family: {unit: code for code, unit in enumerate(units)} for family, units in UNITS.items()}
+
+# Factor and offset tensors per (family, device, dtype), built on first use.
+_TABLES = {}
+
+# Serializes the registration of parsed units, see _add().
+_add_lock = threading.Lock()
+
+# Parsed (prefix, base) per (family, unit).
+_SPLITS = {}
+
+# Direct (factor, offset) pairs per (family, src, dst), filled on first use. The temperature pairs
+# are anchored at the freezing point of water (see above) and therefore given up front.
+_PAIRS = {('temperature', src, dst): pair for (src, dst), pair in TEMPERATURE_PAIRS.items()}
+
+
+def lookup(family, unit):
+    """Returns the (factor, offset) pair converting `unit` to the base unit of `family`.
+
+    Unknown units raise NotImplementedError and non-string units raise TypeError, before any
+    tensor has been allocated.
+    """
+
+    try:
+        return FAMILIES[family][unit]
+    except (KeyError, TypeError):
+        if not isinstance(unit, str):
+            raise TypeError(f'unit must be a string, not {type(unit).__name__}') from None
+
+    prefix, base = split(family, unit)
+    bases, prefixes = PREFIXED[family]
+    factor = bases[base]
+    if prefix:
+        # Multiply the decimal values exactly and round once, e.g. 'Mg' gives exactly 1000.
+        factor = float(Fraction(str(prefixes[prefix])) * Fraction(str(factor)))
+    return _add(family, unit, (factor, 0))
+
+
+def split(family, unit):
+    """Splits a prefixed unit of `family` into prefix and base unit, e.g. 'GWh' -> ('G', 'Wh')."""
+
+    try:
+        return _SPLITS[family, unit]
+    except (KeyError, TypeError):
+        pass
+    if family not in PREFIXED and unit in FAMILIES.get(family, ()):
+        return '', unit
+    if family in PREFIXED and isinstance(unit, str):
+        bases, prefixes = PREFIXED[family]
+        for base in bases:
+            if unit.endswith(base):
+                prefix = unit[:len(unit) - len(base)]
+                if not prefix or prefix in prefixes:
+                    _SPLITS[family, unit] = (prefix, base)
+                    return prefix, base
+    noun = _NOUN.get(family, 'units')
+    raise NotImplementedError(f'{unit} is not supported. See documentation for available {noun}.')
+
+
+def _add(family, unit, pair):
+    """Adds a parsed unit to its family and gives it the next free unit code.
+
+    Units are registered under a lock, so that threads parsing different units at the same time
+    never give them the same code. The unit is added to FAMILIES last, since lookups that find it
+    there skip the lock.
+    """
+
+    with _add_lock:
+        if unit not in CODES[family]:
+            UNITS[family].append(unit)
+            # drop the tables before the code can be used, they are rebuilt under the lock
+            for key in [key for key in _TABLES if key[0] == family]:
+                del _TABLES[key]
+            CODES[family][unit] = len(UNITS[family]) - 1
+        FAMILIES[family][unit] = pair
+    return pair
+
+
+def family_of(unit):
+    """Returns the family that `unit` belongs to."""
+
+    for family, table in FAMILIES.items():
+        try:
+            if unit in table:
+                return family
+        except TypeError:
+            break
+    if not isinstance(unit, str):
+        raise TypeError(f'unit must be a string, not {type(unit).__name__}')
+    for family in PREFIXED:
+        try:
+            lookup(family, unit)
+            return family
+        except NotImplementedError:
+            pass
+    raise NotImplementedError(f'{unit} is not supported. See documentation for available units.')
+
+
+def lookup_pair(src, dst, family=None):
+    """Returns the (factor, offset) pair converting unit `src` directly to unit `dst`.
+
+    The pair is composed from the factors of both units once and memoized, so that any
+    conversion costs a single elementwise operation with one rounding. Without `family` it is
+    inferred from the units, which must belong to the same family.
+    """
+
+    try:
+        return _PAIRS[family, src, dst]
+    except (KeyError, TypeError):
+        pass
+
+    if family is None:
+        family = family_of(src)
+        if family_of(dst) != family:
+            raise ValueError(f'{src} ({family}) cannot be converted to {dst} ({family_of(dst)}).')
+    factor_src, offset_src = lookup(family, src)
+    factor_dst, offset_dst = lookup(family, dst)
+    pair = _PAIRS.get((family, src, dst))
+    if pair is None:
+        pair = (factor_src / factor_dst, (offset_src - offset_dst) / factor_dst)
+    _PAIRS[family, src, dst] = _PAIRS[None, src, dst] = pair
+    return pair
+
+
+# Exact number of bits in one unit of storage, filled on first use by storage_bits().
+_BITS = {}
+
+_INT64_MAX = 2 ** 63 - 1
+
+
+def storage_bits(unit):
+    """Returns the exact number of bits in one `unit` of storage as int, e.g. 'Kbit' -> 1000."""
+
+    try:
+        return _BITS[unit]
+    except (KeyError, TypeError):
+        lookup('storage', unit)
+    prefix, base = split('storage', unit)
+    bases, prefixes = PREFIXED['storage']
+    bits = Fraction(str(bases[base])) * 8
+    if prefix:
+        bits *= Fraction(str(prefixes[prefix]))
+    _BITS[unit] = int(bits)
+    return _BITS[unit]
+
+
+def convert_exact(val, src_bits, dst_bits, remainder=True):
+    """Converts integer values from units of `src_bits` bits to units of `dst_bits` bits in int64.
+
+    Returns the result rounded towards minus infinity and the remainder in bits, such that
+    `val * src_bits == result * dst_bits + remainder` holds exactly. The factor is split as
+    `src_bits = q * dst_bits + r`, so no intermediate is larger than the result or `val * r`,
+    and OverflowError is raised before computing if any of them does not fit into int64. With
+    `remainder=False` only the result is returned.
+    """
+
+    original, val = val, ingest(val)
+    if isinstance(val, torch.Tensor):
+        val = val.to(device=_config.get_device())
+    else:
+        val = torch.as_tensor(val, device=_config.get_device())
+    if val.is_floating_point() or val.is_complex():
+        raise TypeError(f'exact conversions require integer values, not {val.dtype}.')
+    val = val.to(torch.int64)
+
+    q, r = divmod(src_bits, dst_bits)
+    largest = 0
+    if val.numel():
+        low, high = torch.aminmax(val)
+        largest = max(int(high), -int(low))
+    if not largest:
+        # zeros convert to zeros in any unit, even if the factor itself does not fit into int64
+        result = restore(torch.zeros_like(val), original)
+        return (result, restore(torch.zeros_like(val), original)) if remainder else result
+    if q > _INT64_MAX or largest * r > _INT64_MAX or largest * q + largest * r // dst_bits > _INT64_MAX:
+        raise OverflowError(f'converting values up to {largest} from units of {src_bits} bits to units of '
+                            f'{dst_bits} bits exceeds the range of int64.')
+
+    if not r:
+        result = val * q if q != 1 or is_read_only(original) else val
+        result = restore(result, original)
+        return (result, restore(torch.zeros_like(val), original)) if remainder else result
+    scaled = val * r
+    result = torch.div(scaled, dst_bits, rounding_mode='floor')
+    if q:
+        result.add_(val, alpha=q)
+    result = restore(result, original)
+    return (result, restore(scaled.remainder_(dst_bits), original)) if remainder else result
+
+
+def owned(tensor, val):
+    """True if `tensor` was newly allocated by T(val), so that it may be overwritten."""
+
+    if isinstance(val, torch.Tensor):
+        return tensor is not val
+    return isinstance(val, (int, float, list, tuple))
+
+
+def apply(val, factor, offset, inplace=False):
+    """Applies the affine map `val * factor + offset`.
+
+    Out of place, at most one new tensor is allocated; the offset is added in place to the
+    product. With `inplace=True` both steps write into `val` itself.
+    """
+
+    if inplace:
+        if factor != 1:
+            val.mul_(factor)
+        if offset:
+            val.add_(offset)
+        return val
+    if offset:
+        if factor != 1:
+            return (val * factor).add_(offset)
+        return val + offset
+    if factor != 1:
+        return val * factor
+    return val
+
+
+def apply_out(val, factor, offset, out):
+    """Applies the affine map `val * factor + offset`, writing the result into `out`."""
+
+    if factor != 1:
+        torch.mul(val, factor, out=out)
+    else:
+        out.copy_(val)
+    if offset:
+        out.add_(offset)
+    return out
+
+
+def convert(val, factor, offset, out=None, inplace=False, dtype=None):
+    """Converts `val` with the given (factor, offset) pair.
+
+    Without `out` or `inplace` the result is a new tensor (or `val` itself for the identity) with
+    the dtype given by `dtype` or the default dtype policy. `out` receives the result in its own
+    dtype and device, and `inplace=True` overwrites `val`, which must then be floating point.
+    Both work on strided views, on tensors backed by memory-mapped storage and on writable NumPy
+    arrays and buffers. The container type of the result follows scitorch.set_container.
+    """
+
+    if inplace:
+        tensor = _check_inplace(val, out)
+        check_range(tensor, factor, offset, tensor.dtype)
+        return restore(apply(tensor, factor, offset, inplace=True), val, shared=True)
+    if out is not None:
+        target, source = _out(out, val)
+        check_range(source, factor, offset, target.dtype)
+        return restore(apply_out(source, factor, offset, target), out, shared=True)
+    tensor = T(val, dtype)
+    check_range(tensor, factor, offset, tensor.dtype)
+    result = apply(tensor, factor, offset, inplace=owned(tensor, val))
+    if result is tensor and is_read_only(val):
+        # the identity must not hand out writable memory of a read-only input
+        result = result.clone()
+    return restore(result, val)
+
+
+def check_range(val, factor, offset, dtype):
+    """Warns or raises if converting `val` overflows or underflows `dtype` (see set_range_check).
+
+    `factor` and `offset` are numbers or float64 tensors broadcastable to `val`. The check is
+    skipped entirely with the default range check 'ignore'.
+    """
+
+    mode = _config.get_range_check()
+    if mode == 'ignore' or not dtype.is_floating_point:
+        return
+    info = torch.finfo(dtype)
+    val = val.detach()
+    finite = torch.isfinite(val)
+    exact = val.double() * factor
+    if isinstance(offset, torch.Tensor) or offset:
+        exact += offset
+    exact = exact.abs_()[finite]
+
+    problems = []
+    overflow = exact > info.max
+    if overflow.any():
+        problems.append(f'{int(overflow.sum())} of {val.numel()} values overflow {dtype} '
+                        f'(largest magnitude {exact.max().item():.2g} > {info.max:.2g})')
+    if not isinstance(offset, torch.Tensor) and not offset:
+        underflow = (exact < info.tiny) & (val[finite] != 0)
+        if underflow.any():
+            problems.append(f'{int(underflow.sum())} of {val.numel()} values underflow {dtype} '
+                            f'(smallest magnitude {exact[underflow].min().item():.2g} < {info.tiny:.2g})')
+    if not problems:
+        return
+    message = '; '.join(problems) + '.'
+    if mode == 'raise':
+        raise FloatingPointError(message)
+    warnings.warn(message, RuntimeWarning, stacklevel=_stacklevel())
+
+
+def _stacklevel():
+    """Returns the stacklevel of warnings.warn() in the caller that points at the first frame
+    outside of scitorch, however many wrappers (e.g. scitorch.instrument) are in between."""
+
+    level = 2
+    frame = sys._getframe(2)
+    while frame is not None:
+        name = frame.f_globals.get('__name__', '')
+        if (name != 'scitorch' and not name.startswith('scitorch.')) or name.startswith('scitorch.tests.'):
+            break
+        frame = frame.f_back
+        level += 1
+    return level
+
+
+def table(family, device, dtype):
+    """Returns the factor and offset tensors of `family`, indexed by unit code."""
+
+    key = (family, device, dtype)
+    try:
+        return _TABLES[key]
+    except KeyError:
+        pass
+    with _add_lock:
+        pairs = [FAMILIES[family][unit] for unit in UNITS[family]]
+        factors = torch.tensor([factor for factor, _ in pairs], device=device, dtype=dtype)
+        offsets = torch.tensor([offset for _, offset in pairs], device=device, dtype=dtype)
+        _TABLES[key] = (factors, offsets if offsets.any() else None)
+        return _TABLES[key]
+
+
+def encode(family, units, device=None):
+    """Returns an integer tensor of unit codes for a (nested) sequence of unit strings or codes."""
+
+    if isinstance(units, torch.Tensor):
+        codes = units.to(device=device, dtype=torch.long)
+    else:
+        flat, shape = _flatten(units)
+        if flat and isinstance(flat[0], str):
+            lookup_codes = CODES[family]
+            try:
+                flat = list(map(lookup_codes.__getitem__, flat))
+            except KeyError:
+                for unit in set(flat).difference(lookup_codes):
+                    lookup(family, unit)
+                flat = list(map(lookup_codes.__getitem__, flat))
+        codes = torch.tensor(flat, device=device, dtype=torch.long).reshape(shape)
+
+    if codes.numel():
+        low, high = torch.aminmax(codes)
+        if low < 0 or high >= len(UNITS[family]):
+            raise IndexError(f'unit codes must be in the range [0, {len(UNITS[family])}).')
+    return codes
+
+
+def convert_mixed(val, family, units, out=None, inplace=False, dtype=None):
+    """Converts every element of `val` from its own unit with one gather and one multiply(-add).
+
+    `units` must have the shape of `val`, or be a single unit. `out`, `inplace` and `dtype` behave
+    as in convert().
+    """
+
+    original, container = val, out
+    if inplace:
+        val = _check_inplace(val, out)
+    elif out is not None:
+        out, val = _out(out, val)
+    else:
+        val = T(val, dtype)
+
+    codes = encode(family, units, device=val.device)
+    if codes.dim() and codes.shape != val.shape:
+        raise ValueError(f'units of shape {tuple(codes.shape)} do not match values of shape {tuple(val.shape)}; '
+                         f'give one unit per value or a single unit.')
+    if _config.get_range_check() != 'ignore':
+        exact_factors, exact_offsets = table(family, val.device, torch.float64)
+        check_range(val, exact_factors.take(codes),
+                    0 if exact_offsets is None else exact_offsets.take(codes),
+                    val.dtype if out is None else out.dtype)
+    factors, offsets = table(family, val.device, val.dtype if out is None else out.dtype)
+    factors = factors.take(codes)
+
+    if inplace:
+        result = val.mul_(factors)
+    elif out is not None:
+        result = torch.mul(val, factors, out=out)
+    else:
+        result = val * factors
+    if offsets is not None:
+        result.add_(offsets.take(codes))
+    if inplace:
+        return restore(result, original, shared=True)
+    if out is not None:
+        return restore(result, container, shared=True)
+    return restore(result, original)
+
+
+def _check_inplace(val, out):
+    """Returns `val` as tensor that shares its memory, for an in-place conversion."""
+
+    if out is not None:
+        raise ValueError('out and inplace=True cannot be used together.')
+    val = ingest(val, writable=True)
+    if not isinstance(val, torch.Tensor) or not val.is_floating_point():
+        raise TypeError('inplace=True requires a floating point tensor, NumPy array or buffer.')
+    return val
+
+
+def _out(out, val):
+    """Returns `out` as tensor that shares its memory and `val` as tensor to read from."""
+
+    target = ingest(out, writable=True)
+    if not isinstance(target, torch.Tensor):
+        raise TypeError('out must be a tensor, a NumPy array or a writable buffer.')
+    val = ingest(val)
+    if not isinstance(val, torch.Tensor):
+        val = torch.as_tensor(val, dtype=target.dtype, device=target.device)
+    return target, val
+
+
+def _flatten(units):
+    """Flattens a nested sequence of units, returning the flat list and its shape."""
+
+    if isinstance(units, str):
+        return [units], ()
+    if hasattr(units, 'tolist'):
+        units = units.tolist()
+    units = list(units)
+    if not units or not isinstance(units[0], (list, tuple)):
+        return units, (len(units),)
+    flat, inner = _flatten(units[0])
+    for row in units[1:]:
+        row_flat, shape = _flatten(row) if isinstance(row, (list, tuple)) else ([row], ())
+        if shape != inner:
+            raise ValueError(f'all rows of units must have the shape {inner}, found a row of shape {shape}.')
+        flat.extend(row_flat)
+    return flat, (len(units),) + inner
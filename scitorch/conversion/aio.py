@@ -0,0 +1,139 @@
+"""Coroutine versions of the converters for asyncio programs.
+
+Inputs with fewer than THRESHOLD elements are converted inline, where a thread switch would cost
+more than the conversion. Larger inputs are converted in a thread pool shared by all event loops,
+so the event loop keeps running while torch works in its kernels without holding the GIL. At most
+MAX_PENDING conversions per event loop wait for or run in the pool; further callers wait
+asynchronously for a free slot, which gives backpressure instead of an unbounded queue.
+
+>>> from scitorch.conversion import aio
+>>> await aio.to_bytes(torch.rand(10**7), 'MB')
+tensor([...], dtype=torch.float64)
+
+Cancelling a waiting call removes it from the pool queue. A conversion that already runs cannot
+be interrupted; its result is discarded, but with `out=` or `inplace=True` it still writes to
+its target. The thread-local settings of scitorch.using and set_*(local=True) apply to the
+offloaded conversions as well.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from scitorch._lazy import torch
+from scitorch import _config
+from scitorch.tools._tensors import is_ndarray
+from scitorch.conversion import digital, energy, generic, mass, temperature
+
+# elements from which conversions are offloaded to the thread pool
+THRESHOLD = 1 << 16
+
+# threads of the shared pool
+WORKERS = min(4, os.cpu_count() or 1)
+
+# conversions per event loop that may wait for or run in the pool at the same time
+MAX_PENDING = 4 * WORKERS
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = weakref.WeakKeyDictionary()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='scitorch-aio')
+        return _executor
+
+
+def _size(val):
+    """Returns the number of elements of `val`, without converting it."""
+
+    if isinstance(val, (int, float)):
+        return 1
+    if isinstance(val, torch.Tensor):
+        return val.numel()
+    if is_ndarray(val):
+        return val.size
+    if isinstance(val, (list, tuple)):
+        if val and (isinstance(val[0], (list, tuple, torch.Tensor)) or is_ndarray(val[0])):
+            # nested sequences must have a regular shape to be converted, so the first element
+            # stands for all of them and the cost only grows with the depth
+            return len(val) * _size(val[0])
+        return len(val)
+    try:
+        view = memoryview(val)
+    except TypeError:
+        return THRESHOLD
+    return view.nbytes // max(view.itemsize, 1)
+
+
+def _call(settings, func, args, kwargs):
+    _config._local.__dict__.update(settings)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _config._local.__dict__.clear()
+
+
+async def offload(func, *args, **kwargs):
+    """Runs `func(*args, **kwargs)` in the shared thread pool and returns its result.
+
+    Waits for a free slot first if MAX_PENDING calls of the running event loop are already
+    waiting for or running in the pool.
+    """
+
+    # get_event_loop() returns the running loop inside a coroutine; get_running_loop() needs Python 3.7
+    loop = asyncio.get_event_loop()
+    slots = _slots.get(loop)
+    if slots is None:
+        slots = _slots[loop] = asyncio.Semaphore(MAX_PENDING)
+    await slots.acquire()
+    try:
+        future = _pool().submit(_call, dict(_config._local.__dict__), func, args, kwargs)
+    except BaseException:
+        slots.release()
+        raise
+    # the slot is free once the conversion has finished, not when its caller was cancelled
+    future.add_done_callback(lambda _: _release(loop, slots))
+    return await asyncio.wrap_future(future)
+
+
+def _release(loop, slots):
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:
+        # the event loop is closed
+        pass
+
+
+def _coroutine(func):
+    """Returns a coroutine function that converts small inputs inline and offloads large ones."""
+
+    @functools.wraps(func)
+    async def wrapper(val, *args, **kwargs):
+        if _size(val) < THRESHOLD:
+            return func(val, *args, **kwargs)
+        return await offload(func, val, *args, **kwargs)
+
+    wrapper.__doc__ = (f'Coroutine version of {func.__module__.rsplit(".", 1)[-1]}.{func.__name__}, with the '
+                       f'same parameters and result.')
+    return wrapper
+
+
+convert = _coroutine(generic.convert)
+to_bytes = _coroutine(digital.to_bytes)
+to_bytes_batch = _coroutine(digital.to_bytes_batch)
+to_bits = _coroutine(digital.to_bits)
+to_joule = _coroutine(energy.to_joule)
+to_joule_batch = _coroutine(energy.to_joule_batch)
+to_kilogram = _coroutine(mass.to_kilogram)
+to_kilogram_batch = _coroutine(mass.to_kilogram_batch)
+to_kelvin = _coroutine(temperature.to_kelvin)
+to_kelvin_batch = _coroutine(temperature.to_kelvin_batch)
+to_celsius = _coroutine(temperature.to_celsius)
+to_fahrenheit = _coroutine(temperature.to_fahrenheit)
@@ -1,10 +1,33 @@
 """Conversion of different digital storage types (Bytes, Bits)."""
 
+from scitorch._lazy import torch
 from scitorch.tools._tensors import T
 from scitorch.constants import constants
+from scitorch.conversion import _registry
+from scitorch.instrument import instrumented
 
+# Units of every prefix system, from the smallest to the largest, for autoscale().
+LADDERS = {
+    ('si', 'B'): ('B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB'),
+    ('binary', 'B'): ('B', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB', 'ZiB', 'YiB'),
+    ('si', 'b'): ('b', 'Kbit', 'Mbit', 'Gbit', 'Tbit', 'Pbit', 'Ebit', 'Zbit', 'Ybit'),
+    ('binary', 'b'): ('b', 'Kib', 'Mib', 'Gib', 'Tib', 'Pib', 'Eib', 'Zib', 'Yib'),
+}
 
-def to_bytes(val=0.0, unit='B', dim=False):
+# Register all units of the ladders, so that they have a code before UNITS is first used.
+for _ladder in LADDERS.values():
+    for _unit in _ladder:
+        _registry.lookup('storage', _unit)
+
+# Units in the order of their integer codes (see to_bytes_batch).
+UNITS = _registry.UNITS['storage']
+
+# Boundaries, factors and unit codes of every ladder per (system, base, device, dtype).
+_LADDER_TABLES = {}
+
+
+@instrumented('unit')
+def to_bytes(val=0.0, unit='B', dim=False, out=None, inplace=False, dtype=None):
     """
     Converts a value from any byte or bit format to bytes.
 
@@ -16,6 +39,16 @@ def to_bytes(val=0.0, unit='B', dim=False):
 
     unit : char
         Specifies as a string the original unit from which the units will be converted to Bytes.
+        Any of 'B', 'b' or 'bit' with a prefix K, M, G, T, P, E, Z, Y or Ki, Mi, ..., Yi is accepted.
+
+    out : Tensor, optional
+        Preallocated tensor that receives the result.
+
+    inplace : bool
+        Converts the floating point tensor `val` in place.
+
+    dtype : str or torch.dtype, optional
+        Dtype policy of the result ('preserve', 'float64', 'float32', ...), overriding scitorch.set_dtype.
 
     Returns:
     --------
@@ -36,58 +69,58 @@ def to_bytes(val=0.0, unit='B', dim=False):
 
     """
 
+    factor, offset = _registry.lookup('storage', unit)
+
     # ds := digital storage
-    ds = T(val)
-    if 'b' not in unit:
-        if unit == 'B':
-            ds = ds
-        elif unit == 'KB':
-            ds = ds * constants.kilo
-        elif unit == 'MB':
-            ds = ds * constants.mega
-        elif unit == 'GB':
-            ds = ds * constants.giga
-        elif unit == 'TB':
-            ds = ds * constants.tera
-        elif unit == 'PB':
-            ds = ds * constants.peta
-        elif unit == 'KiB':
-            ds = ds * constants.kibi
-        elif unit == 'MiB':
-            ds = ds * constants.mebi
-        elif unit == 'GiB':
-            ds = ds * constants.gibi
-        elif unit == 'TiB':
-            ds = ds * constants.tebi
-        elif unit == 'PiB':
-            ds = ds * constants.pebi
-        else:
-            raise NotImplementedError(f'{unit} is not supported. See documentation for available units.')
+    ds = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
+
+    if dim == False:
+        return ds
     else:
-        if unit == 'b':
-            ds = ds / 8
-        elif unit == 'Kbit':
-            ds = ds * 125
-        elif unit == 'Mbit':
-            ds = ds * 125 * constants.kilo
-        elif unit == 'Gbit':
-            ds = ds * 125 * constants.mega
-        elif unit == 'Tbit':
-            ds = ds * 125 * constants.giga
-        elif unit == 'Pbit':
-            ds = ds * 125 * constants.tera
-        elif unit == 'Kib':
-            ds = ds * constants.kibi / 8
-        elif unit == 'Mib':
-            ds = ds * constants.mebi / 8
-        elif unit == 'Gib':
-            ds = ds * constants.gibi / 8
-        elif unit == 'Tib':
-            ds = ds * constants.tebi / 8
-        elif unit == 'Pib':
-            ds = ds * constants.pebi / 8
-        else:
-            raise NotImplementedError(f'{unit} is not supported. See documentation for available units.')
+        return dict(val=ds, dim='B')
+
+
+@instrumented('units')
+def to_bytes_batch(val, units, dim=False, out=None, inplace=False, dtype=None):
+    """
+    Converts values given in mixed byte and bit formats to bytes in a single pass.
+
+    Parameters:
+    -----------
+
+    val : float
+        Value(s) to be converted to Bytes.
+
+    units : list of str or Tensor
+        Unit of every value, either as strings or as integer codes indexing `digital.UNITS`.
+        Must have the same shape as `val`, or be a single unit.
+
+    out : Tensor, optional
+        Preallocated tensor that receives the result.
+
+    inplace : bool
+        Converts the floating point tensor `val` in place.
+
+    dtype : str or torch.dtype, optional
+        Dtype policy of the result ('preserve', 'float64', 'float32', ...), overriding scitorch.set_dtype.
+
+    Returns:
+    --------
+
+    temp -- (Tensor) value in bytes
+
+    Example:
+    --------
+
+    >>> digital.to_bytes_batch([200, 1, 8], ['MB', 'GiB', 'Kbit'])
+    tensor([2.0000e+08, 1.0737e+09, 1.0000e+03], dtype=torch.float64)
+    >>> digital.to_bytes_batch([1, 1], torch.tensor([1, 7]))
+    tensor([   1000., 1048576.], dtype=torch.float64)
+
+    """
+
+    # ds := digital storage
+    ds = _registry.convert_mixed(val, 'storage', units, out=out, inplace=inplace, dtype=dtype)
 
     if dim == False:
         return ds
@@ -446,7 +479,8 @@ def to_bytes(val=0.0, unit='B', dim=False):
 #
 #     return ds
 
-def to_bits(val=0.0, unit='b', dim=False):
+@instrumented('unit')
+def to_bits(val=0.0, unit='b', dim=False, out=None, inplace=False, dtype=None):
     """Converts a value from any byte or bit format to bits.
 
      Parameters:
@@ -454,6 +488,9 @@ def to_bits(val=0.0, unit='b', dim=False):
 
         val -- (int) value
         scale -- (char) new unit
+        out -- (Tensor) optional preallocated tensor that receives the result
+        inplace -- (bool) convert the floating point tensor val in place
+        dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
 
         Returns:
         --------
@@ -474,19 +511,217 @@ def to_bits(val=0.0, unit='b', dim=False):
 
         """
 
+    factor, offset = _registry.lookup('storage', unit)
+
     # ds := digital storage
+    ds = _registry.convert(val, factor * 8, offset, out=out, inplace=inplace, dtype=dtype)
 
-    if unit == 'b':
-        ds = T(val)
+    if dim == False:
+        return ds
     else:
-        ds = to_bytes(val, unit)
-        ds = ds * 8
+        return dict(val=ds, dim='b')
+
+
+@instrumented('unit')
+def to_bytes_exact(val=0, unit='B', dim=False):
+    """Converts integer values from any byte or bit format to whole bytes and remaining bits.
+
+    The conversion is exact: it stays in int64 with the integer number of bits of every unit
+    (e.g. 1000 for 'Kbit', 8192 for 'KiB'), so counts above 2^53 keep every digit and bit
+    counts that are no multiple of 8 return the rest in bits instead of a fraction.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s), as int, list of int or integer tensor
+    unit -- (str) unit of val, e.g. 'B', 'b', 'Kbit' or 'PiB'
+
+    Returns:
+    --------
+
+    (bytes, bits) -- (tuple of Tensor) whole bytes (rounded down) and remaining bits (0 to 7)
+                     as int64 tensors, such that val [unit] == bytes [B] + bits [b]
+
+    or
+
+    {'val' : bytes, 'remainder' : bits, 'dim' : 'B'} -- (dict) dictionary of value, remainder and dimension
+
+    Raises OverflowError if a result does not fit into int64 and TypeError for floating point values.
+
+    Example:
+    --------
+
+    >>> digital.to_bytes_exact([12, 16], 'b')
+    (tensor([1, 2]), tensor([4, 0]))
+    >>> digital.to_bytes_exact(2**60 + 1, 'B')
+    (tensor(1152921504606846977), tensor(0))
+
+    """
+
+    # ds := digital storage
+    ds, bits = _registry.convert_exact(val, _registry.storage_bits(unit), 8)
+
+    if dim == False:
+        return ds, bits
+    else:
+        return dict(val=ds, remainder=bits, dim='B')
+
+
+@instrumented('unit')
+def to_bits_exact(val=0, unit='b', dim=False):
+    """Converts integer values from any byte or bit format to bits, exactly in int64.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s), as int, list of int or integer tensor
+    unit -- (str) unit of val, e.g. 'B', 'Kbit' or 'PiB'
+
+    Returns:
+    --------
+
+    bits -- (Tensor) value in bits as int64 tensor
+
+    or
+
+    {'value' : bits, 'dim' : 'b'} -- (dict) dictionary of value and dimension
+
+    Raises OverflowError if a result does not fit into int64 and TypeError for floating point values.
+
+    Example:
+    --------
+
+    >>> digital.to_bits_exact([1, 2], 'KiB')
+    tensor([ 8192, 16384])
+
+    """
+
+    # ds := digital storage
+    ds = _registry.convert_exact(val, _registry.storage_bits(unit), 1, remainder=False)
 
     if dim == False:
         return ds
     else:
         return dict(val=ds, dim='b')
 
+
+def _ladder_table(system, base, device, dtype):
+    key = (system, base, device, dtype)
+    try:
+        return _LADDER_TABLES[key]
+    except KeyError:
+        pass
+    try:
+        ladder = LADDERS[system, base]
+    except KeyError:
+        raise NotImplementedError(f'{system} is not supported. See documentation for available prefix systems.') \
+            from None
+    scale = 8 if base == 'b' else 1
+    factors = torch.tensor([_registry.lookup('storage', unit)[0] * scale for unit in ladder], device=device,
+                           dtype=dtype)
+    codes = torch.tensor([_registry.CODES['storage'][unit] for unit in ladder], device=device)
+    _LADDER_TABLES[key] = (factors[1:], factors, codes)
+    return _LADDER_TABLES[key]
+
+
+@instrumented('unit')
+def autoscale(val=0.0, unit='B', system='binary', bits=False, decimals=None, dtype=None):
+    """Picks the best prefix for every element and returns the scaled values and their units.
+
+    All elements are scaled in one pass: the largest unit of the prefix system that is not
+    larger than the value is found with torch.bucketize, so that 1 <= |scaled| < 1000 (or 1024)
+    for all values from 1 B on.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s)
+    unit -- (str) unit of val, e.g. 'B', 'b' or 'MiB'
+    system -- (str) 'binary' (KiB, MiB, ...) or 'si' (KB, MB, ...)
+    bits -- (bool) scale to bit units (Kib, Mib, ... or Kbit, Mbit, ...) instead of byte units
+    decimals -- (int) number of decimals the values will be rounded to; values that round up to
+                1000 (1024) move to the next unit
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    (scaled, codes) -- (tuple of Tensor) scaled values and their unit codes indexing `digital.UNITS`
+
+    Example:
+    --------
+
+    >>> scaled, codes = digital.autoscale([512, 2048, 3 * 2**30])
+    >>> scaled
+    tensor([512.,   2.,   3.], dtype=torch.float64)
+    >>> [digital.UNITS[code] for code in codes]
+    ['B', 'KiB', 'GiB']
+
+    """
+
+    base = 'b' if bits else 'B'
+    ds = (to_bits if bits else to_bytes)(val, unit, dtype=dtype)
+    boundaries, factors, codes = _ladder_table(system, base, ds.device, ds.dtype)
+
+    magnitude = ds.abs()
+    index = torch.bucketize(magnitude, boundaries, right=True)
+    scaled = ds / factors.take(index)
+    if decimals is not None:
+        step = factors[1] / factors[0]
+        index += (scaled.abs().round(decimals=decimals) >= step) & (index < len(boundaries))
+        scaled = ds / factors.take(index)
+    return scaled, codes.take(index)
+
+
+@instrumented('unit')
+def format_bytes(val=0.0, unit='B', system='binary', bits=False, precision=2, sep=None, dtype=None):
+    """Formats byte or bit counts as human-readable strings such as '1.23 GiB'.
+
+    Prefixes are picked by autoscale() for all elements at once, and all strings are produced by
+    a single %-format call, so formatting millions of values needs no Python loop per element.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s)
+    unit -- (str) unit of val, e.g. 'B', 'b' or 'MiB'
+    system -- (str) 'binary' (KiB, MiB, ...) or 'si' (KB, MB, ...)
+    bits -- (bool) format in bit units (Kib, Mib, ... or Kbit, Mbit, ...) instead of byte units
+    precision -- (int) number of decimals
+    sep -- (str) if given, return one string with the formatted values joined by sep
+    dtype -- (str or torch.dtype) dtype policy of the computation, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    strings -- (list of str) formatted values in the order of the flattened input, or a single
+               str for a scalar input or if sep is given
+
+    Example:
+    --------
+
+    >>> digital.format_bytes([512, 1.5 * 2**20, 1234567890], precision=1)
+    ['512.0 B', '1.5 MiB', '1.1 GiB']
+    >>> digital.format_bytes(1234567890, system='si')
+    '1.23 GB'
+    >>> digital.format_bytes([1, 8], 'KB', bits=True, system='si', sep=', ')
+    '8.00 Kbit, 64.00 Kbit'
+
+    """
+
+    scaled, codes = autoscale(val, unit, system=system, bits=bits, decimals=precision, dtype=dtype)
+    count = scaled.numel()
+    fields = [None] * (2 * count)
+    fields[0::2] = scaled.reshape(-1).tolist()
+    fields[1::2] = map(UNITS.__getitem__, codes.reshape(-1).tolist())
+    template = f'%.{int(precision)}f %s'
+
+    if sep is not None:
+        return sep.join([template] * count) % tuple(fields)
+    if scaled.dim() == 0:
+        return template % tuple(fields)
+    return ((template + '\0') * count % tuple(fields)).split('\0')[:-1]
+
 # def to_kilobits(val=0.0, unit='Kbit'):
 #     """Converts a value from any byte or bit format to kilobits.
 #
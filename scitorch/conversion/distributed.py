@@ -0,0 +1,126 @@
+"""Sharded conversion with global reductions across the ranks of a torch.distributed process group.
+
+Works with every backend that supports all_reduce on CPU tensors, including gloo. Without an
+initialized process group, every function works on the local shard alone, as a job of one rank.
+
+>>> import glob
+>>> import torch.distributed as dist
+>>> dist.init_process_group('gloo')
+>>> from scitorch.conversion import distributed
+>>> paths = distributed.shard(sorted(glob.glob('dumps/*.raw')))
+>>> stats = distributed.convert_reduce(load(paths), 'eV', 'J', bins=64)
+>>> stats['total'], stats['min'], stats['max'], stats['hist']
+"""
+
+from scitorch._lazy import torch
+from scitorch.conversion import generic
+
+
+def _group_info(group):
+    """Returns the rank and world size within `group`, or (0, 1) without a process group."""
+
+    if not torch.distributed.is_available() or not torch.distributed.is_initialized():
+        return 0, 1
+    return torch.distributed.get_rank(group), torch.distributed.get_world_size(group)
+
+
+def shard(items, group=None):
+    """Returns the items handled by the calling rank, e.g. its share of a sorted list of files.
+
+    Parameters:
+    -----------
+
+    items -- (list) all items of the job, in the same order on every rank
+    group -- (ProcessGroup) process group; the default group if None
+
+    Returns:
+    --------
+
+    items -- (list) every world_size-th item, starting at the rank
+
+    """
+
+    rank, world_size = _group_info(group)
+    return list(items)[rank::world_size]
+
+
+def convert_reduce(val, from_unit, to_unit, bins=None, range=None, dtype=None, group=None):
+    """Converts the shard of the calling rank and reduces the results of all ranks.
+
+    Every rank converts its own values with generic.convert. The total, count, minimum and
+    maximum of all converted values, and optionally their histogram, are then computed with two
+    all_reduce calls on float64 tensors, whatever the number of ranks and bins. Every rank of
+    `group` has to call it with the same units, `bins` and `range`.
+
+    Parameters:
+    -----------
+
+    val -- (Tensor) values of the calling rank
+    from_unit -- (str) unit of val, e.g. 'B', 'eV' or 'f'
+    to_unit -- (str) unit of the result, from the same family as from_unit
+    bins -- (int) number of equal-width histogram bins; no histogram if None
+    range -- (tuple of float) lower and upper edge of the histogram in to_unit; the global
+             minimum and maximum if None
+    dtype -- (str or torch.dtype) dtype policy of the converted values, overriding scitorch.set_dtype
+    group -- (ProcessGroup) process group; the default group if None
+
+    Returns:
+    --------
+
+    {'val' : val, 'total' : total, 'count' : count, 'min' : min, 'max' : max, 'hist' : hist,
+    'edges' : edges, 'dim' : to_unit} -- (dict) converted values of the calling rank, and the
+    global sum, number, minimum and maximum of the values of all ranks (min and max are inf and
+    -inf for no values), with the histogram counts and bin edges if bins is given
+
+    Example:
+    --------
+
+    >>> stats = distributed.convert_reduce(torch.tensor([1., 2.]), 'KiB', 'B', bins=2)
+    >>> stats['total'], stats['count'], stats['max'], stats['hist']
+    (3072.0, 2, 2048.0, tensor([1., 1.], dtype=torch.float64))
+
+    """
+
+    val = generic.convert(val, from_unit, to_unit, dtype=dtype)
+    if not isinstance(val, torch.Tensor):
+        raise TypeError(f'convert_reduce needs tensor results, not {type(val).__name__}; '
+                        f'use scitorch.set_container(\'tensor\').')
+    _, world_size = _group_info(group)
+    flat = val.detach().reshape(-1).to(device='cpu', dtype=torch.float64)
+
+    # minimum and maximum in one MIN reduction
+    extrema = torch.tensor([float('inf'), float('inf')], dtype=torch.float64)
+    if flat.numel():
+        extrema[0] = flat.min()
+        extrema[1] = -flat.max()
+    if world_size > 1:
+        torch.distributed.all_reduce(extrema, op=torch.distributed.ReduceOp.MIN, group=group)
+    low, high = extrema[0].item(), -extrema[1].item()
+
+    # total, count and histogram in one SUM reduction
+    if bins is not None:
+        lower, upper = _hist_range(low, high) if range is None else map(float, range)
+        if not upper > lower:
+            raise ValueError(f'the histogram range must be increasing, not {range}.')
+        hist = torch.histc(flat, bins=bins, min=lower, max=upper)
+    else:
+        hist = flat.new_empty(0)
+    sums = torch.cat([torch.stack([flat.sum(), flat.new_tensor(float(flat.numel()))]), hist])
+    if world_size > 1:
+        torch.distributed.all_reduce(sums, op=torch.distributed.ReduceOp.SUM, group=group)
+
+    stats = dict(val=val, total=sums[0].item(), count=int(sums[1].item()), min=low, max=high)
+    if bins is not None:
+        stats.update(hist=sums[2:], edges=torch.linspace(lower, upper, bins + 1, dtype=torch.float64))
+    stats['dim'] = to_unit
+    return stats
+
+
+def _hist_range(low, high):
+    """Histogram range of values in [low, high], widened by 0.5 for a single value as in NumPy."""
+
+    if low > high:
+        return 0., 1.
+    if low == high:
+        return low - 0.5, high + 0.5
+    return low, high
@@ -2,8 +2,14 @@
 
 from scitorch.tools._tensors import T
 from scitorch.constants import constants
+from scitorch.conversion import _registry
+from scitorch.instrument import instrumented
 
-def to_joule(val=0.0, unit='J', dim=False):
+# Units in the order of their integer codes (see to_joule_batch).
+UNITS = _registry.UNITS['energy']
+
+@instrumented('unit')
+def to_joule(val=0.0, unit='J', dim=False, out=None, inplace=False, dtype=None):
     """Converts a value from any energy unit to Kelvin.
 
     Parameters:
@@ -11,6 +17,9 @@ def to_joule(val=0.0, unit='J', dim=False):
 
     val -- (int) value
     scale -- (char) new scale
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
 
     Returns:
     --------
@@ -35,19 +44,46 @@ def to_joule(val=0.0, unit='J', dim=False):
 
     """
 
-    energy = T(val)
-    if unit == 'J':
-        energy = energy
-    elif unit == 'KJ':
-        energy = energy * 1000
-    elif unit == 'Wh':
-        energy = energy * 3600
-    elif unit == 'KWh':
-        energy = energy * 3.6 * constants.mega
-    elif unit == 'eV':
-        energy = energy * constants.eV.get('val')
+    factor, offset = _registry.lookup('energy', unit)
+    energy = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
+
+    if dim == False:
+        return energy
     else:
-        raise NotImplementedError(f'{unit} is not supported. See documentation for available units.')
+        return dict(val=energy, dim='J')
+
+
+@instrumented('units')
+def to_joule_batch(val, units, dim=False, out=None, inplace=False, dtype=None):
+    """Converts values given in mixed energy units to Joule in a single pass.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s)
+    units -- (list of str or Tensor) unit of every value, as strings or integer codes indexing `energy.UNITS`
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    energy -- (Tensor) value in Joule
+
+    or
+
+    {'value' : energy, 'dim' : 'J'} -- (dict) dictionary of value and dimension
+
+    Example:
+    --------
+
+    >>> energy.to_joule_batch([1, 2], ['KJ', 'Wh'])
+    tensor([1000., 7200.], dtype=torch.float64)
+
+    """
+
+    energy = _registry.convert_mixed(val, 'energy', units, out=out, inplace=inplace, dtype=dtype)
 
     if dim == False:
         return energy
@@ -0,0 +1,218 @@
+"""Out-of-core conversion of flat binary and .npy files through memory maps, in bounded chunks."""
+
+import ast
+import functools
+import mmap
+import operator
+import os
+import struct
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from scitorch._lazy import torch
+from scitorch import _config
+from scitorch.conversion import _registry, generic
+
+# bytes of input converted per chunk
+CHUNK_SIZE = 1 << 24
+
+_MAGIC = b'\x93NUMPY'
+
+# .npy type codes without byte order, by torch dtype name
+_CODES = {
+    'float64': 'f8',
+    'float32': 'f4',
+    'float16': 'f2',
+    'int64': 'i8',
+    'int32': 'i4',
+    'int16': 'i2',
+    'int8': 'i1',
+    'uint8': 'u1',
+}
+
+_NATIVE = '<' if sys.byteorder == 'little' else '>'
+
+
+def convert_file(src, dst, from_unit, to_unit, src_dtype='float64', dtype=None, chunk_size=CHUNK_SIZE):
+    """Converts the numbers of a flat binary or .npy file and writes them to another file.
+
+    Both files are memory-mapped, and the values are converted in chunks of about `chunk_size`
+    bytes with the converters of scitorch. A read-ahead thread copies the next chunk out of the
+    input map while the current one is converted into the output map, so reading overlaps with
+    the conversion. Pages of finished chunks are written back and released from both maps, so the
+    resident memory stays at a few chunks for files of any size.
+
+    Parameters:
+    -----------
+
+    src -- (str or path) input file; .npy files are read with the dtype and shape of their header,
+           anything else as flat binary in native byte order
+    dst -- (str or path) output file; written as .npy with the shape of the input if it ends with
+           '.npy', as flat binary otherwise
+    from_unit -- (str) unit of the values, e.g. 'B', 'eV' or 'f'
+    to_unit -- (str) unit of the result, from the same family as from_unit
+    src_dtype -- (str or torch.dtype) dtype of a flat binary input, e.g. 'float32' or 'int16'
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype;
+             'preserve' keeps a floating point input dtype
+    chunk_size -- (int) bytes of input converted per chunk
+
+    If the conversion fails, e.g. with range_check='raise', `dst` is removed.
+
+    Returns:
+    --------
+
+    count -- (int) number of converted values
+
+    Example:
+    --------
+
+    >>> from scitorch.conversion.files import convert_file
+    >>> convert_file('temperatures.npy', 'kelvin.npy', 'f', 'k', dtype='float32')
+    2000000000
+    >>> convert_file('energies.raw', 'joule.raw', 'eV', 'J', src_dtype='float32', dtype='preserve')
+    500000000
+
+    """
+
+    # check the units before creating the output
+    _registry.lookup_pair(from_unit, to_unit)
+    src_dtype = _resolve_src_dtype(src_dtype)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ValueError('src and dst must be different files.')
+
+    with open(src, 'rb') as fin:
+        src_offset, src_dtype, shape, fortran_order = _read_layout(fin, src_dtype)
+        out_dtype = _result_dtype(dtype, src_dtype)
+        count = _count(shape)
+        header = _npy_header(out_dtype, shape, fortran_order) if os.fspath(dst).endswith('.npy') else b''
+        with open(dst, 'wb+') as fout:
+            try:
+                fout.write(header)
+                fout.truncate(len(header) + count * _itemsize(out_dtype))
+                if count:
+                    _convert_mapped(fin, fout, src_offset, len(header), count, src_dtype, out_dtype, from_unit,
+                                    to_unit, max(1, chunk_size // _itemsize(src_dtype)))
+            except BaseException:
+                # do not leave a truncated or partly converted file behind
+                os.remove(dst)
+                raise
+    return count
+
+
+def _count(shape):
+    # math.prod needs Python 3.8
+    return functools.reduce(operator.mul, shape, 1)
+
+
+def _itemsize(dtype):
+    # torch.dtype.itemsize needs torch 2.1
+    return torch.empty((), dtype=dtype).element_size()
+
+
+def _resolve_src_dtype(dtype):
+    if isinstance(dtype, str) and dtype in _CODES:
+        dtype = getattr(torch, dtype)
+    if not isinstance(dtype, torch.dtype) or str(dtype).replace('torch.', '') not in _CODES:
+        raise TypeError(f'{dtype} is not a supported input dtype. Use one of {", ".join(_CODES)}.')
+    return dtype
+
+
+def _result_dtype(dtype, src_dtype):
+    dtype = _config.get_dtype() if dtype is None else _config.resolve_dtype(dtype)
+    if dtype == 'preserve':
+        return src_dtype if src_dtype.is_floating_point else torch.float64
+    return dtype
+
+
+def _read_layout(f, src_dtype):
+    """Returns the offset of the data, the dtype, the shape and the order of the file `f`."""
+
+    size = os.fstat(f.fileno()).st_size
+    magic = f.read(8)
+    if not magic.startswith(_MAGIC):
+        count, remainder = divmod(size, _itemsize(src_dtype))
+        if remainder:
+            raise ValueError(f'the file size {size} is not a multiple of the {src_dtype} item size.')
+        return 0, src_dtype, (count,), False
+
+    length_format = '<H' if magic[6] == 1 else '<I'
+    length, = struct.unpack(length_format, f.read(struct.calcsize(length_format)))
+    header = ast.literal_eval(f.read(length).decode('latin1'))
+    descr = header['descr']
+    if not isinstance(descr, str) or descr[1:] not in _CODES.values():
+        raise TypeError(f'.npy files of dtype {descr} are not supported.')
+    if descr[0] not in (_NATIVE, '|'):
+        raise ValueError(f'.npy files of dtype {descr} are not in native byte order.')
+    name = next(name for name, code in _CODES.items() if code == descr[1:])
+    shape = tuple(header['shape'])
+    offset = f.tell()
+    if offset + _count(shape) * _itemsize(getattr(torch, name)) > size:
+        raise ValueError(f'the .npy file is shorter than its shape {shape}.')
+    return offset, getattr(torch, name), shape, header['fortran_order']
+
+
+def _npy_header(dtype, shape, fortran_order):
+    """Returns a version 1.0 .npy header, padded to a multiple of 64 bytes."""
+
+    name = str(dtype).replace('torch.', '')
+    if name not in _CODES:
+        raise TypeError(f'.npy files of dtype {dtype} are not supported. Write a flat binary file instead.')
+    code = ('|' if _itemsize(dtype) == 1 else _NATIVE) + _CODES[name]
+    text = f"{{'descr': '{code}', 'fortran_order': {fortran_order}, 'shape': {tuple(shape)}, }}"
+    text += ' ' * (-(len(_MAGIC) + 4 + len(text) + 1) % 64) + '\n'
+    return _MAGIC + b'\x01\x00' + struct.pack('<H', len(text)) + text.encode('latin1')
+
+
+def _convert_mapped(fin, fout, src_offset, dst_offset, count, src_dtype, out_dtype, from_unit, to_unit, step):
+    src_map = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+    dst_map = mmap.mmap(fout.fileno(), 0)
+    # The tensor views of the maps only live within _convert_chunks; if it raises, the maps are
+    # left to the garbage collector, since they cannot be closed while a traceback holds a view.
+    _convert_chunks(src_map, dst_map, src_offset, dst_offset, count, src_dtype, out_dtype, from_unit, to_unit, step)
+    dst_map.flush()
+    dst_map.close()
+    src_map.close()
+
+
+def _convert_chunks(src_map, dst_map, src_offset, dst_offset, count, src_dtype, out_dtype, from_unit, to_unit,
+                    step):
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='The given buffer is not writable')
+        src = torch.frombuffer(src_map, dtype=src_dtype, count=count, offset=src_offset)
+    dst = torch.frombuffer(dst_map, dtype=out_dtype, count=count, offset=dst_offset)
+    src_size, dst_size = src.element_size(), dst.element_size()
+    # Two staging buffers: one is filled by the read-ahead thread while the other is converted.
+    # They have the dtype of the result, so that the values are computed in that dtype.
+    buffers = [torch.empty(min(step, count), dtype=out_dtype) for _ in range(2)]
+
+    def read(start, buffer):
+        stop = min(start + step, count)
+        buffer = buffer[:stop - start]
+        buffer.copy_(src[start:stop])
+        _release(src_map, src_offset + start * src_size, src_offset + stop * src_size)
+        return buffer
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(read, 0, buffers[0])
+        for i, start in enumerate(range(0, count, step)):
+            chunk = pending.result()
+            if start + step < count:
+                pending = pool.submit(read, start + step, buffers[(i + 1) % 2])
+            stop = start + len(chunk)
+            generic.convert(chunk, from_unit, to_unit, out=dst[start:stop])
+            _release(dst_map, dst_offset + start * dst_size, dst_offset + stop * dst_size, flush=True)
+
+
+def _release(mm, start, stop, flush=False):
+    """Drops the pages of `mm` that lie completely before `stop` and not before the page of `start`
+    from the resident memory. With `flush=True` they are written back to the file first."""
+
+    start -= start % mmap.PAGESIZE
+    stop -= stop % mmap.PAGESIZE
+    if stop <= start:
+        return
+    if flush:
+        mm.flush(start, stop - start)
+    if hasattr(mm, 'madvise'):
+        mm.madvise(mmap.MADV_DONTNEED, start, stop - start)
@@ -0,0 +1,86 @@
+"""Conversion between any two units of the same family (storage, energy, mass, temperature)."""
+
+from scitorch.conversion import _registry
+from scitorch.instrument import instrumented
+
+
+@instrumented('from_unit', 'to_unit')
+def convert(val, from_unit, to_unit, dim=False, out=None, inplace=False, dtype=None):
+    """Converts a value from any unit to any other unit of the same family.
+
+    The factors of both units are composed into a single (factor, offset) pair, memoized per
+    pair of units, so every conversion is one elementwise operation with one rounding.
+
+    Parameters:
+    -----------
+
+    val -- (int) value
+    from_unit -- (str) unit of val, e.g. 'Mbit', 'KWh', 'mg' or 'f'
+    to_unit -- (str) unit of the result, from the same family as from_unit
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    val -- (Tensor) value in to_unit
+
+    or
+
+    {'value' : val, 'dim' : to_unit} -- (dict) dictionary of value and dimension
+
+    Example:
+    --------
+
+    >>> from scitorch.conversion import convert
+    >>> convert(8192, 'Mbit', 'GiB')
+    tensor(0.9537, dtype=torch.float64)
+    >>> convert([0, 100], 'c', 'f')
+    tensor([ 32., 212.], dtype=torch.float64)
+    >>> convert(1, 'KWh', 'Wh', dim=True)
+    {'val': tensor(1000., dtype=torch.float64), 'dim': 'Wh'}
+
+    """
+
+    factor, offset = _registry.lookup_pair(from_unit, to_unit)
+    val = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
+
+    if dim == False:
+        return val
+    else:
+        return dict(val=val, dim=to_unit)
+
+
+def parse_unit(unit, family=None):
+    """Splits a unit string into its prefix and base unit.
+
+    SI prefixes (yotta ... yocto) and binary prefixes (kibi ... yobi) are taken from
+    scitorch.constants. The result is cached per string, and so is the conversion factor of every
+    parsed unit, which makes all prefixed units as fast to convert as the built-in ones.
+
+    Parameters:
+    -----------
+
+    unit -- (str) unit, e.g. 'µJ', 'GWh', 'EiB', 'Yb' or 'mg'
+    family -- (str) 'storage', 'energy' or 'mass'; inferred from the unit if not given
+
+    Returns:
+    --------
+
+    (prefix, base) -- (tuple of str) prefix ('' if there is none) and base unit
+
+    Example:
+    --------
+
+    >>> from scitorch.conversion import parse_unit
+    >>> parse_unit('GWh')
+    ('G', 'Wh')
+    >>> parse_unit('EiB')
+    ('Ei', 'B')
+
+    """
+
+    if family is None:
+        family = _registry.family_of(unit)
+    return _registry.split(family, unit)
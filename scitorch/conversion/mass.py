@@ -2,8 +2,14 @@
 
 from scitorch.tools._tensors import T
 from scitorch.constants import constants
+from scitorch.conversion import _registry
+from scitorch.instrument import instrumented
 
-def to_kilogram(val=0.0, unit='kg', dim=False):
+# Units in the order of their integer codes (see to_kilogram_batch).
+UNITS = _registry.UNITS['mass']
+
+@instrumented('unit')
+def to_kilogram(val=0.0, unit='kg', dim=False, out=None, inplace=False, dtype=None):
     """Converts a value from any mass unit to Kilogram.
 
     Parameters:
@@ -11,6 +17,9 @@ def to_kilogram(val=0.0, unit='kg', dim=False):
 
     val -- (int) value
     scale -- (char) new scale
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
 
     Returns:
     --------
@@ -37,17 +46,46 @@ def to_kilogram(val=0.0, unit='kg', dim=False):
 
     """
 
-    mass = T(val)
-    if unit == 'kg':
-        mass = mass
-    elif unit == 'g':
-        mass = mass / constants.kilo
-    elif unit == 'mg':
-        mass = mass / constants.mega
-    elif unit == 't':
-        mass = mass * constants.kilo
+    factor, offset = _registry.lookup('mass', unit)
+    mass = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
+
+    if dim == False:
+        return mass
     else:
-        raise NotImplementedError(f'{unit} is not supported. See documentation for available units.')
+        return dict(val=mass, dim='kg')
+
+
+@instrumented('units')
+def to_kilogram_batch(val, units, dim=False, out=None, inplace=False, dtype=None):
+    """Converts values given in mixed mass units to Kilogram in a single pass.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s)
+    units -- (list of str or Tensor) unit of every value, as strings or integer codes indexing `mass.UNITS`
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    mass -- (Tensor) value in Kilogram
+
+    or
+
+    {'value' : mass, 'dim' : 'kg'} -- (dict) dictionary of value and dimension
+
+    Example:
+    --------
+
+    >>> mass.to_kilogram_batch([3000, 3], ['mg', 't'])
+    tensor([3.0000e-03, 3.0000e+03], dtype=torch.float64)
+
+    """
+
+    mass = _registry.convert_mixed(val, 'mass', units, out=out, inplace=inplace, dtype=dtype)
 
     if dim == False:
         return mass
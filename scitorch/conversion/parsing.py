@@ -0,0 +1,141 @@
+"""Bulk parsing of quantity strings such as '12.5 GiB', '300 KWh' or '-40 f' into tensors."""
+
+import os
+import re
+from array import array
+
+from scitorch._lazy import torch
+from scitorch import _config
+from scitorch.tools._tensors import T
+from scitorch.conversion import _registry
+from scitorch.instrument import instrumented
+
+_NUMBER = r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?'
+
+# One quantity per line: a number, optional blanks and a unit that starts with a letter.
+_QUANTITY = re.compile(rf'^[ \t]*({_NUMBER})[ \t]*([^\W\d_]\w*)[ \t]*\r?$', re.MULTILINE)
+_RECORD = re.compile(r'^[ \t]*\S', re.MULTILINE)
+
+# Dimension of the converted values of every family, as in the dim=True results of the converters.
+_DIMS = {
+    'storage': 'B',
+    'energy': 'J',
+    'mass': 'kg',
+    'temperature': 'K',
+}
+
+
+@instrumented('to_unit')
+def parse_quantities(data, to_unit=None, dim=False, dtype=None):
+    """Parses quantity strings of one unit family and converts them into one tensor.
+
+    The whole input is split into numbers and units by a single precompiled regular expression.
+    Every distinct unit is resolved once to the factor and offset that take it directly to
+    to_unit, and all values are converted in float64 with one gather and multiply(-add) as in
+    to_bytes_batch, to_joule_batch, to_kilogram_batch and to_kelvin_batch, so there is no Python
+    code per record besides float() and the result is rounded to its dtype only once.
+
+    Parameters:
+    -----------
+
+    data -- (list of str, str, bytes, path or file) quantities, one per list element or line, e.g.
+            ['4 TiB', '512 Mbit'], b'12.5 GiB\\n300 KB', a pathlib.Path or an open file; a str is
+            always read as quantities, never as a file name
+    to_unit -- (str) unit of the result; defaults to the base unit of the family (B, J, kg, K) and
+               is required for the dimension of empty input
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    val -- (Tensor) values in to_unit
+
+    or
+
+    {'value' : val, 'dim' : to_unit} -- (dict) dictionary of value and dimension
+
+    Example:
+    --------
+
+    >>> from scitorch.conversion import parse_quantities
+    >>> parse_quantities(['4 TiB', '512 Mbit', '1.5KB'])
+    tensor([4.3980e+12, 6.4000e+07, 1.5000e+03], dtype=torch.float64)
+    >>> parse_quantities(b'-40 f\\n100 c', dim=True)
+    {'val': tensor([233.1500, 373.1500], dtype=torch.float64), 'dim': 'K'}
+
+    """
+
+    text, records = _text(data)
+    matches = _QUANTITY.findall(text)
+    if records is None:
+        records = len(_RECORD.findall(text))
+    if len(matches) != records:
+        _invalid(text)
+
+    if not matches:
+        val = T([], dtype)
+        if dim == False:
+            return val
+        if to_unit is None:
+            raise ValueError('The dimension of empty input is unknown, give to_unit to get it with dim=True.')
+        # same dim as for values converted to to_unit, which must be a known unit
+        _registry.family_of(to_unit)
+        return dict(val=val, dim=to_unit)
+    numbers, units = zip(*matches)
+
+    distinct = sorted(set(units))
+    families = {unit: _registry.family_of(unit) for unit in distinct}
+    family = families[units[0]]
+    if to_unit is not None:
+        families[to_unit] = _registry.family_of(to_unit)
+    if len(set(families.values())) > 1:
+        found = ', '.join(f'{unit} ({family})' for unit, family in sorted(families.items()))
+        raise ValueError(f'All quantities must belong to one unit family, found {found}.')
+
+    # one (factor, offset) pair per distinct unit, straight to the target unit
+    target = _registry.BASE[family] if to_unit is None else to_unit
+    index = {unit: i for i, unit in enumerate(distinct)}
+    pairs = [_registry.lookup_pair(unit, target, family) for unit in distinct]
+    codes = torch.tensor(list(map(index.__getitem__, units)), dtype=torch.long)
+    factors = torch.tensor([factor for factor, _ in pairs], dtype=torch.float64).take(codes)
+    offsets = [offset for _, offset in pairs]
+    offsets = torch.tensor(offsets, dtype=torch.float64).take(codes) if any(offsets) else 0
+
+    policy = _config.get_dtype() if dtype is None else _config.resolve_dtype(dtype)
+    result_dtype = torch.float64 if policy == 'preserve' else policy
+    val = torch.frombuffer(array('d', map(float, numbers)), dtype=torch.float64)
+    _registry.check_range(val, factors, offsets, result_dtype)
+    val.mul_(factors)
+    if isinstance(offsets, torch.Tensor):
+        val.add_(offsets)
+    val = T(val, result_dtype)
+
+    if dim == False:
+        return val
+    else:
+        return dict(val=val, dim=_DIMS[family] if to_unit is None else to_unit)
+
+
+def _text(data):
+    """Returns the input as one string with a quantity per line, and the number of records if known."""
+
+    if isinstance(data, (list, tuple)):
+        return '\n'.join(data), len(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data).decode(), None
+    if isinstance(data, str):
+        return data, None
+    if isinstance(data, os.PathLike):
+        with open(data, 'rb') as f:
+            return f.read().decode(), None
+    if hasattr(data, 'read'):
+        text = data.read()
+        return (text.decode() if isinstance(text, bytes) else text), None
+    raise TypeError(f'data must be a list of str, str, bytes, a path or a file, not {type(data).__name__}.')
+
+
+def _invalid(text):
+    for line in text.split('\n'):
+        if line.strip() and _QUANTITY.fullmatch(line) is None:
+            raise ValueError(f'{line.strip()!r} is not a quantity such as \'12.5 GiB\'.')
+    raise ValueError('Every element must hold exactly one quantity such as \'12.5 GiB\'.')
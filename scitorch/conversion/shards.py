@@ -0,0 +1,106 @@
+"""Conversion of a directory of shard files across a pool of worker processes."""
+
+import fnmatch
+import multiprocessing
+import os
+import time
+
+from scitorch._lazy import torch
+from scitorch import _config
+from scitorch.conversion import _registry, files
+
+
+def convert_directory(src, dst, from_unit, to_unit, pattern='*', workers=None, threads=1, src_dtype='float64',
+                      dtype=None, chunk_size=files.CHUNK_SIZE, context='spawn'):
+    """Converts every flat binary or .npy file of a directory with convert_file in a process pool.
+
+    Every worker process converts whole files and runs torch with `threads` intra-op threads, so
+    by default one worker per available core keeps all cores busy without oversubscribing them.
+    The largest files are submitted first, so that the last files to finish are small ones. The
+    device, dtype policy, range check and container type of the calling thread apply to the
+    workers as well.
+
+    Parameters:
+    -----------
+
+    src -- (str or path) directory of the input files
+    dst -- (str or path) directory of the output files, which get the names of the input files;
+           created if it does not exist
+    from_unit -- (str) unit of the values, e.g. 'B', 'eV' or 'f'
+    to_unit -- (str) unit of the result, from the same family as from_unit
+    pattern -- (str) glob pattern of the file names to convert, e.g. '*.npy'
+    workers -- (int) number of worker processes; available cores // threads if None
+    threads -- (int) torch intra-op threads per worker
+    src_dtype -- (str or torch.dtype) dtype of flat binary input files (see convert_file)
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+    chunk_size -- (int) bytes of input converted per chunk (see convert_file)
+    context -- (str) multiprocessing start method; 'spawn' is safe after torch has started threads
+
+    Returns:
+    --------
+
+    {'files' : n, 'values' : count, 'bytes' : nbytes, 'seconds' : seconds, 'values_per_second' : rate,
+    'bytes_per_second' : rate} -- (dict) number of files, converted values and input bytes, the
+    wall time and the aggregate throughput
+
+    Example:
+    --------
+
+    >>> from scitorch.conversion.shards import convert_directory
+    >>> convert_directory('dumps', 'kelvin', 'f', 'k', pattern='*.npy', threads=2)
+    {'files': 4096, 'values': 68719476736, 'bytes': 274877906944, 'seconds': 301.5,
+     'values_per_second': 227925295.3, 'bytes_per_second': 911701181.1}
+
+    """
+
+    # check the arguments before starting any process
+    _registry.lookup_pair(from_unit, to_unit)
+    files._resolve_src_dtype(src_dtype)
+    dtype = _config.get_dtype() if dtype is None else _config.resolve_dtype(dtype)
+    if not isinstance(threads, int) or threads < 1:
+        raise ValueError(f'threads must be a positive int, not {threads!r}.')
+    if workers is None:
+        workers = max(1, _available_cores() // threads)
+
+    names = sorted(name for name in os.listdir(src)
+                   if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(src, name)))
+    sizes = {name: os.path.getsize(os.path.join(src, name)) for name in names}
+    os.makedirs(dst, exist_ok=True)
+
+    start = time.perf_counter()
+    count = 0
+    if names:
+        tasks = [(os.path.join(src, name), os.path.join(dst, name), from_unit, to_unit, src_dtype, dtype, chunk_size)
+                 for name in sorted(names, key=sizes.get, reverse=True)]
+        # multiprocessing.Pool rather than ProcessPoolExecutor, whose mp_context and initializer
+        # need Python 3.7; leaving the block terminates the workers, so the first error stops all
+        settings = (_config.get_device(), dtype, _config.get_range_check(), _config.get_container())
+        pool = multiprocessing.get_context(context).Pool(min(workers, len(names)), _init_worker,
+                                                         (threads,) + settings)
+        with pool:
+            for converted in pool.imap_unordered(_convert_file, tasks):
+                count += converted
+    seconds = time.perf_counter() - start
+
+    nbytes = sum(sizes.values())
+    return dict(files=len(names), values=count, bytes=nbytes, seconds=seconds,
+                values_per_second=count / seconds if seconds else 0., bytes_per_second=nbytes / seconds if seconds else 0.)
+
+
+def _available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker(threads, device, dtype, range_check, container):
+    torch.set_num_threads(threads)
+    _config.set_device(device)
+    _config.set_dtype(dtype)
+    _config.set_range_check(range_check)
+    _config.set_container(container)
+
+
+def _convert_file(task):
+    src, dst, from_unit, to_unit, src_dtype, dtype, chunk_size = task
+    return files.convert_file(src, dst, from_unit, to_unit, src_dtype=src_dtype, dtype=dtype, chunk_size=chunk_size)
@@ -0,0 +1,167 @@
+"""Conversion of delimited numbers streamed from a file object, e.g. stdin, in large chunks."""
+
+from array import array
+from itertools import chain
+
+from scitorch._lazy import torch
+from scitorch.conversion import _registry, generic
+
+# bytes read per chunk
+CHUNK_SIZE = 1 << 24
+
+
+def convert_stream(src, dst, from_unit, to_unit, delimiter=None, columns=None, header=False, fmt='%r',
+                   chunk_size=CHUNK_SIZE):
+    """Converts delimited numbers from `src` and writes them to `dst`.
+
+    `src` is read in chunks of about `chunk_size` bytes, cut at the last line break. All values of
+    a chunk are parsed into one float64 buffer, converted in place as a single tensor and written
+    back with one formatting call, so the cost per value does not depend on the number of lines.
+    Columns that are not converted are written unchanged and blank lines are skipped.
+
+    Parameters:
+    -----------
+
+    src -- (file) binary file object to read from, or a text file with a buffer such as sys.stdin
+    dst -- (file) binary file object to write to, or a text file with a buffer such as sys.stdout
+    from_unit -- (str) unit of the values, e.g. 'B', 'eV' or 'f'
+    to_unit -- (str) unit of the result, from the same family as from_unit
+    delimiter -- (str) column delimiter, e.g. ','; any whitespace if None, in which case the
+                 columns of the output are separated by single spaces
+    columns -- (list of int) indices of the columns to convert; all columns if None
+    header -- (bool) write the first line unchanged
+    fmt -- (str) %-format of converted values; '%r' writes the shortest exact representation
+    chunk_size -- (int) bytes read per chunk
+
+    Returns:
+    --------
+
+    count -- (int) number of converted values
+
+    Example:
+    --------
+
+    >>> import io
+    >>> from scitorch.conversion.stream import convert_stream
+    >>> out = io.BytesIO()
+    >>> convert_stream(io.BytesIO(b'1024\\n2048\\n'), out, 'B', 'KiB')
+    2
+    >>> out.getvalue()
+    b'1.0\\n2.0\\n'
+
+    """
+
+    src = getattr(src, 'buffer', src)
+    dst = getattr(dst, 'buffer', dst)
+    # check the units before reading anything
+    _registry.lookup_pair(from_unit, to_unit)
+
+    separator = ' ' if delimiter is None else delimiter
+    count = 0
+    rest = b''
+    layout = None
+    line = 1
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            break
+        data = rest + data
+        end = data.rfind(b'\n') + 1
+        if not end:
+            rest = data
+            continue
+        rest = data[end:]
+        text = data[:end].decode()
+        if header:
+            first, _, text = text.partition('\n')
+            dst.write(first.encode() + b'\n')
+            header = False
+            line += 1
+        layout = layout or _layout(text, delimiter, separator, columns, fmt)
+        if layout:
+            count += _convert_chunk(text, dst, from_unit, to_unit, delimiter, line, *layout)
+        line += text.count('\n')
+    if rest and header:
+        dst.write(rest.rstrip(b'\r\n') + b'\n')
+    elif rest:
+        text = rest.decode()
+        layout = layout or _layout(text, delimiter, separator, columns, fmt)
+        if layout:
+            count += _convert_chunk(text, dst, from_unit, to_unit, delimiter, line, *layout)
+    dst.flush()
+    return count
+
+
+def _layout(text, delimiter, separator, columns, fmt):
+    """Returns the number of columns, the converted columns and the format of a row, or None if
+    `text` has no data."""
+
+    for line in text.splitlines():
+        if line.strip():
+            ncols = len(line.split(delimiter))
+            break
+    else:
+        return None
+    if columns is None:
+        columns = range(ncols)
+    for column in columns:
+        if not -ncols <= column < ncols:
+            raise IndexError(f'column {column} does not exist in rows with {ncols} columns.')
+    columns = sorted(set(column % ncols for column in columns))
+    row = separator.join(fmt if column in columns else '%s' for column in range(ncols)) + '\n'
+    return ncols, columns, row
+
+
+def _convert_chunk(text, dst, from_unit, to_unit, delimiter, first, ncols, columns, row):
+    """Converts the lines of `text`, the first of which is line `first` of the stream."""
+
+    rows = [line.split(delimiter) for line in text.splitlines() if line.strip()]
+    if any(len(fields) != ncols for fields in rows):
+        _check_rows(text, delimiter, first, ncols)
+    nrows = len(rows)
+    if not nrows:
+        return 0
+    fields = list(chain.from_iterable(rows))
+
+    values = array('d')
+    try:
+        if len(columns) == ncols:
+            values.extend(map(float, fields))
+        else:
+            for column in columns:
+                values.extend(map(float, fields[column::ncols]))
+    except ValueError:
+        _check_values(text, delimiter, first, columns)
+        raise
+    if values:
+        generic.convert(torch.frombuffer(values, dtype=torch.float64), from_unit, to_unit, inplace=True)
+
+    if len(columns) == ncols:
+        fields = values
+    else:
+        for i, column in enumerate(columns):
+            fields[column::ncols] = values[i * nrows:(i + 1) * nrows]
+    dst.write(((row * nrows) % tuple(fields)).encode())
+    return len(values)
+
+
+def _check_rows(text, delimiter, first, ncols):
+    """Raises a ValueError naming the first line of `text` that does not have `ncols` columns."""
+
+    for number, line in enumerate(text.splitlines(), first):
+        found = len(line.split(delimiter))
+        if line.strip() and found != ncols:
+            raise ValueError(f'line {number} has {found} columns instead of {ncols}: {line!r}.')
+
+
+def _check_values(text, delimiter, first, columns):
+    """Raises a ValueError naming the first line of `text` with a converted column that is not a number."""
+
+    for number, line in enumerate(text.splitlines(), first):
+        fields = line.split(delimiter)
+        for column in columns if line.strip() else ():
+            try:
+                float(fields[column])
+            except ValueError:
+                raise ValueError(f'line {number} has {fields[column]!r} in column {column} instead of a number: '
+                                 f'{line!r}.') from None
@@ -1,8 +1,14 @@
 """Conversion of different temperature scales (Kelvin, Fahrenheit and Celsius)."""
 
 from scitorch.tools._tensors import T
+from scitorch.conversion import _registry
+from scitorch.instrument import instrumented
 
-def to_kelvin(val=0.0, scale='k', dim=False):
+# Scales in the order of their integer codes (see to_kelvin_batch).
+SCALES = _registry.UNITS['temperature']
+
+@instrumented('scale')
+def to_kelvin(val=0.0, scale='k', dim=False, out=None, inplace=False, dtype=None):
     """Converts a value from Celsius/Fahrenheit to Kelvin.
 
     Parameters:
@@ -10,6 +16,9 @@ def to_kelvin(val=0.0, scale='k', dim=False):
 
     val -- (int) value
     scale -- (char) new scale
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
 
     Returns:
     --------
@@ -34,22 +43,54 @@ def to_kelvin(val=0.0, scale='k', dim=False):
 
     """
 
-    temp = T(val)
-    if scale == 'k':
-        temp = temp
-    elif scale == 'c':
-        temp = temp + 273.15
-    elif scale == 'f':
-        temp = (temp - 32) * 5 / 9 + 273.15
+    factor, offset = _registry.lookup('temperature', scale)
+    temp = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
+
+    if dim == False:
+        return temp
     else:
-        raise NotImplementedError(f'{scale} is not supported. See documentation for available scales.')
+        return dict(val=temp, dim='K')
+
+
+@instrumented('scales')
+def to_kelvin_batch(val, scales, dim=False, out=None, inplace=False, dtype=None):
+    """Converts values given in mixed temperature scales to Kelvin in a single pass.
+
+    Parameters:
+    -----------
+
+    val -- (int) value(s)
+    scales -- (list of str or Tensor) scale of every value, as strings or integer codes indexing `temperature.SCALES`
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
+
+    Returns:
+    --------
+
+    temp -- (Tensor) value in Kelvin scale
+
+    or
+
+    {'value' : temp, 'dim' : 'K'} -- (dict) dictionary of value and dimension
+
+    Example:
+    --------
+
+    >>> temperature.to_kelvin_batch([32, 0, 10], ['f', 'c', 'k'])
+    tensor([273.1500, 273.1500,  10.0000], dtype=torch.float64)
+
+    """
+
+    temp = _registry.convert_mixed(val, 'temperature', scales, out=out, inplace=inplace, dtype=dtype)
 
     if dim == False:
         return temp
     else:
         return dict(val=temp, dim='K')
 
-def to_celsius(val=0.0, scale='c', dim=False):
+@instrumented('scale')
+def to_celsius(val=0.0, scale='c', dim=False, out=None, inplace=False, dtype=None):
     """Converts a value from Kelvin/Fahrenheit to Celsius.
 
     Parameters:
@@ -57,6 +98,9 @@ def to_celsius(val=0.0, scale='c', dim=False):
 
     val -- (int) value
     scale -- (char) new scale
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
 
     Returns:
     --------
@@ -81,18 +125,16 @@ def to_celsius(val=0.0, scale='c', dim=False):
 
     """
 
-    if scale =='c':
-        temp = T(val)
-    else:
-        temp = to_kelvin(val, scale)
-        temp = temp - 273.15
+    factor, offset = _registry.lookup_pair(scale, 'c', 'temperature')
+    temp = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
 
     if dim == False:
         return temp
     else:
         return dict(val=temp, dim='C')
 
-def to_fahrenheit(val=0.0, scale='f', dim=False):
+@instrumented('scale')
+def to_fahrenheit(val=0.0, scale='f', dim=False, out=None, inplace=False, dtype=None):
     """Converts a value from Kelvin/Celsius to Fahrenheit.
 
     Parameters:
@@ -100,6 +142,9 @@ def to_fahrenheit(val=0.0, scale='f', dim=False):
 
     val -- (int) value
     scale -- (char) new scale
+    out -- (Tensor) optional preallocated tensor that receives the result
+    inplace -- (bool) convert the floating point tensor val in place
+    dtype -- (str or torch.dtype) dtype policy of the result, overriding scitorch.set_dtype
 
     Returns:
     --------
@@ -124,11 +169,8 @@ def to_fahrenheit(val=0.0, scale='f', dim=False):
 
     """
 
-    if scale == 'f':
-        temp = T(val)
-    else:
-        temp = to_kelvin(val, scale)
-        temp = (temp - 273.15) * 9/5 + 32
+    factor, offset = _registry.lookup_pair(scale, 'f', 'temperature')
+    temp = _registry.convert(val, factor, offset, out=out, inplace=inplace, dtype=dtype)
 
     if dim == False:
         return temp
@@ -0,0 +1,162 @@
+"""Opt-in instrumentation of the scitorch converters.
+
+When enabled, every call of a converter is counted per (function, unit, dtype, size bucket)
+together with the number of converted elements and the cumulative wall time, and runs inside a
+torch.profiler.record_function label such as 'scitorch::digital.to_bytes(MB)', so that it shows
+up in profiler traces. When disabled (the default), the converters only check a module flag.
+
+>>> from scitorch import instrument
+>>> from scitorch.conversion import digital
+>>> instrument.enable()
+>>> digital.to_bytes([1, 2], 'MB')
+>>> instrument.snapshot()
+[{'function': 'digital.to_bytes', 'unit': 'MB', 'dtype': 'float64', 'size': '1e1', 'calls': 1,
+  'elements': 2, 'seconds': 2.1e-05}]
+
+Set the environment variable SCITORCH_INSTRUMENT=1 to enable it from the start of a process.
+Times of nested converter calls, e.g. to_bytes within format_bytes, are included in both.
+"""
+
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+
+from scitorch._lazy import torch
+
+_enabled = os.environ.get('SCITORCH_INSTRUMENT', '0') not in ('', '0')
+_synchronize = False
+
+# [calls, elements, seconds] per (function, unit, dtype, size bucket)
+_STATS = {}
+_lock = threading.Lock()
+
+
+def enable(synchronize=False):
+    """Starts recording converter calls.
+
+    Parameters:
+    -----------
+
+    synchronize -- (bool) wait for CUDA kernels to finish before stopping the timer, so that the
+                   times include the GPU work instead of only the kernel launches
+
+    """
+
+    global _enabled, _synchronize
+    _synchronize = synchronize
+    _enabled = True
+
+
+def disable():
+    """Stops recording converter calls. Recorded stats are kept until reset()."""
+
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """Returns True if converter calls are recorded."""
+
+    return _enabled
+
+
+def reset():
+    """Discards all recorded stats."""
+
+    with _lock:
+        _STATS.clear()
+
+
+def snapshot():
+    """Returns the recorded stats, the most time consuming first.
+
+    Returns:
+    --------
+
+    stats -- (list of dict) one dict per function, unit, dtype and size bucket with the number of
+             calls, converted elements and cumulative seconds; size '1e3' counts calls with 101 to
+             1000 elements
+
+    """
+
+    with _lock:
+        items = [(key, list(value)) for key, value in _STATS.items()]
+    stats = [dict(function=function, unit=unit, dtype=dtype, size=size, calls=calls, elements=elements,
+                  seconds=seconds)
+             for (function, unit, dtype, size), (calls, elements, seconds) in items]
+    return sorted(stats, key=lambda stat: stat['seconds'], reverse=True)
+
+
+def instrumented(*params):
+    """Decorator that records the calls of a converter while instrumentation is enabled.
+
+    `params` name the arguments that make up the unit label, e.g. 'unit' or 'from_unit' and
+    'to_unit'. Arguments that are not strings, such as the unit lists of the batch converters,
+    are labelled 'mixed', and omitted optional units 'default'.
+    """
+
+    def decorate(func):
+        parameters = inspect.signature(func).parameters
+        names = list(parameters)
+        spec = [(names.index(param), param, parameters[param].default) for param in params]
+        name = f'{func.__module__.rsplit(".", 1)[-1]}.{func.__name__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return _record(name, _label(spec, args, kwargs), func, args, kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _label(spec, args, kwargs):
+    labels = []
+    for index, param, default in spec:
+        unit = args[index] if index < len(args) else kwargs.get(param, default)
+        labels.append(unit if isinstance(unit, str) else 'default' if unit is None else 'mixed')
+    return '->'.join(labels)
+
+
+def _record(name, unit, func, args, kwargs):
+    start = time.perf_counter()
+    with torch.profiler.record_function(f'scitorch::{name}({unit})'):
+        result = func(*args, **kwargs)
+        if _synchronize and torch.cuda.is_available():
+            torch.cuda.synchronize()
+    seconds = time.perf_counter() - start
+
+    dtype, elements = _describe(result)
+    key = (name, unit, dtype, _bucket(elements))
+    with _lock:
+        stats = _STATS.setdefault(key, [0, 0, 0.])
+        stats[0] += 1
+        stats[1] += elements
+        stats[2] += seconds
+    return result
+
+
+def _describe(result):
+    """Returns the dtype and number of elements of a converter result."""
+
+    if isinstance(result, dict):
+        result = result.get('val')
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, torch.Tensor):
+        return str(result.dtype).replace('torch.', ''), result.numel()
+    if isinstance(result, str):
+        return 'str', 1
+    if isinstance(result, list):
+        return 'str', len(result)
+    size = getattr(result, 'size', 1)
+    return str(getattr(result, 'dtype', type(result).__name__)), size if isinstance(size, int) else 1
+
+
+def _bucket(elements):
+    return f'1e{math.ceil(math.log10(elements)) if elements > 1 else 0}'
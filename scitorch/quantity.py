@@ -0,0 +1,164 @@
+"""Tensors tagged with a unit.
+
+A Quantity is a torch.Tensor that carries a unit tag (a short string such as 'B' or 'J') through
+indexing, arithmetic, torch.cat/torch.stack and reductions:
+
+>>> from scitorch.quantity import Quantity
+>>> q = Quantity([1, 2, 3], 'MB')
+>>> q[1:].sum() * 2
+Quantity(10., dtype=torch.float64, unit='MB')
+>>> q.convert_to('KB')
+Quantity([1000., 2000., 3000.], dtype=torch.float64, unit='KB')
+
+Results inherit the unit of their first Quantity operand, except for multiplication, division
+and powers, which combine the units in the notation of scitorch.constants (e.g. 'J*s^(-1)').
+Adding, subtracting or concatenating quantities with different units raises a ValueError.
+Comparisons and integer results are returned as plain tensors.
+"""
+
+import torch
+
+from scitorch.tools._tensors import T
+from scitorch.conversion import _registry
+
+_DisableTorchFunctionSubclass = getattr(torch._C, 'DisableTorchFunctionSubclass', None) \
+    or torch._C.DisableTorchFunction
+
+
+def _functions(*names):
+    """Returns the torch functions and Tensor methods of the given names that exist."""
+
+    functions = set()
+    for name in names:
+        for owner in (torch, torch.Tensor):
+            function = getattr(owner, name, None)
+            if function is not None:
+                functions.add(function)
+    return functions
+
+
+_MUL = _functions('mul', 'multiply', 'mul_', '__mul__', '__rmul__', '__imul__')
+_DIV = _functions('div', 'divide', 'true_divide', 'div_', '__truediv__', '__itruediv__')
+_RDIV = _functions('__rtruediv__')
+_POW = _functions('pow', 'pow_', '__pow__', '__ipow__')
+_SAME = _functions('add', 'sub', 'subtract', 'add_', 'sub_', '__add__', '__radd__', '__iadd__',
+                   '__sub__', '__rsub__', '__isub__', 'cat', 'stack', 'where', 'maximum', 'minimum')
+
+
+class Quantity(torch.Tensor):
+    """Tensor with a unit tag.
+
+    Parameters:
+    -----------
+
+    data -- (int, list or Tensor) value(s), converted with T() unless already a tensor
+    unit -- (str) unit tag, e.g. 'B', 'J' or 'm*s^(-1)'
+
+    """
+
+    @staticmethod
+    def __new__(cls, data, unit=None):
+        if not isinstance(data, torch.Tensor):
+            data = T(data)
+        with _DisableTorchFunctionSubclass():
+            instance = data.as_subclass(cls)
+        instance.unit = unit
+        return instance
+
+    def __repr__(self, *, tensor_contents=None):
+        with _DisableTorchFunctionSubclass():
+            text = torch.Tensor.__repr__(self)
+        return f'Quantity{text[len("tensor"):-1]}, unit={self.unit!r})'
+
+    @classmethod
+    def __torch_function__(cls, func, types, args=(), kwargs=None):
+        with _DisableTorchFunctionSubclass():
+            result = func(*args, **(kwargs or {}))
+            return _wrap(result, _result_unit(func, args))
+
+    def convert_to(self, unit, out=None):
+        """Converts the quantity to another unit of the same family (see conversion.convert)."""
+
+        factor, offset = _registry.lookup_pair(self.unit, unit)
+        with _DisableTorchFunctionSubclass():
+            result = _registry.convert(self, factor, offset, out=out)
+            if result is self:
+                result = self.clone()
+            return _wrap(result, unit)
+
+
+def _result_unit(func, args):
+    if func in _MUL:
+        return _multiply(_unit(args, 0), _unit(args, 1))
+    if func in _DIV:
+        return _multiply(_unit(args, 0), _power(_unit(args, 1), -1))
+    if func in _RDIV:
+        return _power(_unit(args, 0), -1)
+    if func in _POW:
+        exponent = args[1] if len(args) > 1 else 1
+        if isinstance(exponent, (int, float)):
+            return _power(_unit(args, 0), exponent)
+    elif func in _SAME:
+        units = _units(args)
+        if len(units) > 1:
+            raise ValueError(f'{func.__name__} of quantities with different units: {", ".join(sorted(units))}.')
+        return units.pop() if units else None
+
+    for arg in args:
+        if isinstance(arg, Quantity):
+            return arg.unit
+        if isinstance(arg, (list, tuple)):
+            for item in arg:
+                if isinstance(item, Quantity):
+                    return item.unit
+    return None
+
+
+def _unit(args, index):
+    arg = args[index] if index < len(args) else None
+    return arg.unit if isinstance(arg, Quantity) else None
+
+
+def _units(args):
+    """Returns the unit tags of all Quantity arguments, also within list arguments (cat, stack)."""
+
+    units = set()
+    for arg in args:
+        for item in arg if isinstance(arg, (list, tuple)) else (arg,):
+            if isinstance(item, Quantity) and item.unit is not None:
+                units.add(item.unit)
+    return units
+
+
+def _multiply(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return f'{a}*{b}'
+
+
+def _power(unit, exponent):
+    if unit is None or exponent == 1:
+        return unit
+    if isinstance(exponent, float) and exponent.is_integer():
+        exponent = int(exponent)
+    return f'{unit}^({exponent})'
+
+
+def _wrap(result, unit):
+    """Tags floating point tensors in `result` with `unit`; other results are returned as they are.
+
+    Must be called with torch functions of subclasses disabled.
+    """
+
+    if isinstance(result, torch.Tensor):
+        if not (result.is_floating_point() or result.is_complex()):
+            return result.as_subclass(torch.Tensor) if isinstance(result, Quantity) else result
+        if not isinstance(result, Quantity):
+            result = result.as_subclass(Quantity)
+        result.unit = unit
+        return result
+    if isinstance(result, (tuple, list)):
+        return type(result)([_wrap(item, unit) for item in result])
+    return result
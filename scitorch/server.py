@@ -0,0 +1,238 @@
+"""Local conversion server with dynamic micro-batching, for programs that should not import torch.
+
+Clients (scitorch.client, which does not import torch) send conversion requests over a Unix
+domain socket or a localhost TCP socket. A single batching thread collects the requests that
+arrive within a short window, groups them by source and target unit, converts every group with
+one in-place tensor operation and sends the results back.
+
+>>> from scitorch.server import Server
+>>> server = Server('/tmp/scitorch.sock')
+>>> server.start()
+
+or from a shell: scitorch serve /tmp/scitorch.sock
+"""
+
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+from scitorch._lazy import torch
+from scitorch import _protocol
+from scitorch.conversion import generic
+
+# seconds to collect requests before converting them
+WINDOW = 200e-6
+
+# values per batch at which the window is cut short
+MAX_BATCH = 1 << 20
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Reads the requests of one connection and hands them to the batching thread."""
+
+    def setup(self):
+        if self.request.family != socket.AF_UNIX:
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        sock = self.request
+        while True:
+            header = _protocol.recv_exact(sock, _protocol.REQUEST.size)
+            if header is None:
+                return
+            request_id, count, from_length, to_length = _protocol.REQUEST.unpack(header)
+            if count > _protocol.MAX_VALUES:
+                # the rest of the stream cannot be trusted, and reading it could exhaust the memory
+                return
+            data = _protocol.recv_exact(sock, from_length + to_length + count * 8)
+            if data is None:
+                return
+            try:
+                units = data[:from_length].decode(), data[from_length:from_length + to_length].decode()
+            except UnicodeDecodeError:
+                # answered by the batching thread, which sends all responses of the connection
+                units = ValueError('units must be UTF-8 encoded.')
+            self.server.pending.put((sock, request_id, units, data[from_length + to_length:]))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Server(object):
+    """Conversion server on a Unix domain socket or a localhost TCP socket.
+
+    Parameters:
+    -----------
+
+    address -- (str or tuple) path of the Unix socket, or (host, port) of the TCP socket; a stale
+               socket at the path is replaced, anything else raises FileExistsError
+    window -- (float) seconds to collect requests after the first one before converting them
+    max_batch -- (int) number of values at which a batch is converted before the window ends
+
+    Example:
+    --------
+
+    >>> with Server('/tmp/scitorch.sock') as server:
+    ...     server.serve_forever()
+
+    """
+
+    def __init__(self, address, window=WINDOW, max_batch=MAX_BATCH):
+        if isinstance(address, tuple):
+            self._server = _TCPServer(address, _Handler)
+        else:
+            if os.path.lexists(address):
+                if not stat.S_ISSOCK(os.lstat(address).st_mode):
+                    raise FileExistsError(f'{address} exists and is not a socket.')
+                # a socket left behind by a server that did not shut down
+                os.unlink(address)
+            self._server = _UnixServer(address, _Handler)
+            bound = os.lstat(address)
+            self._bound = bound.st_dev, bound.st_ino
+        self._server.pending = queue.Queue()
+        self.address = self._server.server_address
+        self.window = window
+        self.max_batch = max_batch
+        self._serving = False
+        self._threads = []
+
+    def serve_forever(self):
+        """Serves requests until shutdown() is called from another thread."""
+
+        self._serving = True
+        batcher = threading.Thread(target=self._batch_loop, name='scitorch-batcher', daemon=True)
+        batcher.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.pending.put(None)
+            batcher.join()
+
+    def start(self):
+        """Serves requests in a background thread."""
+
+        self._serving = True
+        thread = threading.Thread(target=self.serve_forever, name='scitorch-server', daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return self
+
+    def shutdown(self):
+        """Stops serving and closes the socket."""
+
+        if self._serving:
+            self._server.shutdown()
+        for thread in self._threads:
+            thread.join()
+        self._server.server_close()
+        if isinstance(self.address, str):
+            # only remove the socket this server bound, not one that replaced it since
+            try:
+                current = os.lstat(self.address)
+            except FileNotFoundError:
+                return
+            if (current.st_dev, current.st_ino) == self._bound:
+                os.unlink(self.address)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def _batch_loop(self):
+        pending = self._server.pending
+        while True:
+            request = pending.get()
+            if request is None:
+                return
+            batch = [request]
+            nbytes = len(request[3])
+            deadline = time.perf_counter() + self.window
+            while nbytes < self.max_batch * 8:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = pending.get(timeout=timeout) if timeout > 0 else pending.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    _convert(batch)
+                    return
+                batch.append(request)
+                nbytes += len(request[3])
+            _convert(batch)
+
+
+def _convert(batch):
+    """Converts the requests of a batch with one tensor operation per pair of units."""
+
+    groups = {}
+    for request in batch:
+        if isinstance(request[2], Exception):
+            _send_error(request, request[2])
+        else:
+            groups.setdefault(request[2], []).append(request)
+    for (from_unit, to_unit), requests in groups.items():
+        try:
+            _reply(requests, from_unit, to_unit)
+        except Exception as error:
+            if len(requests) == 1:
+                _send_error(requests[0], error)
+                continue
+            # retry every request on its own, so that errors only reach the requests causing them
+            for request in requests:
+                try:
+                    _reply([request], from_unit, to_unit)
+                except Exception as error:
+                    _send_error(request, error)
+
+
+def _reply(requests, from_unit, to_unit):
+    """Converts the values of `requests` with one tensor operation and sends the results. Raises
+    without sending anything if the conversion fails."""
+
+    data = bytearray().join(request[3] for request in requests)
+    if data:
+        generic.convert(torch.frombuffer(data, dtype=torch.float64), from_unit, to_unit, inplace=True)
+    else:
+        generic.convert([], from_unit, to_unit)
+    view = memoryview(data)
+    start = 0
+    for sock, request_id, _, values in requests:
+        stop = start + len(values)
+        _send(sock, _protocol.RESPONSE.pack(request_id, len(values) // 8, _protocol.OK) + view[start:stop])
+        start = stop
+
+
+def _send_error(request, error):
+    sock, request_id, _, _ = request
+    message = _protocol.error_message(error)
+    _send(sock, _protocol.RESPONSE.pack(request_id, len(message), _protocol.ERROR) + message)
+
+
+def _send(sock, frame):
+    try:
+        sock.sendall(frame)
+    except OSError:
+        # the client is gone; its handler thread ends on the closed connection
+        pass
+
+
+def serve(address, window=WINDOW, max_batch=MAX_BATCH):
+    """Runs a conversion server until the process is interrupted."""
+
+    with Server(address, window=window, max_batch=max_batch) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,55 @@
+import torch
+
+import scitorch
+from pytest import raises
+from scitorch import constants as cached
+from scitorch.constants import constants
+
+
+class TestTensor(object):
+    def test_tensor_value(self):
+        eV = cached.tensor('eV')
+        assert eV.dim() == 0
+        assert eV.dtype == torch.float64
+        assert eV.item() == constants.eV.get('val')
+
+    def test_tensor_prefix(self):
+        assert cached.tensor('kibi').item() == constants.kibi
+
+    def test_tensor_is_cached(self):
+        assert cached.tensor('k_B') is cached.tensor('k_B')
+
+    def test_tensor_per_dtype(self):
+        double = cached.tensor('h')
+        single = cached.tensor('h', dtype='float32')
+        assert single.dtype == torch.float32
+        assert single is not double
+        assert single is cached.tensor('h', dtype=torch.float32)
+
+    def test_tensor_follows_settings(self):
+        double = cached.tensor('h', device='cpu')
+        assert double is cached.tensor('h', device=torch.device('cpu'), dtype='float64')
+        with scitorch.using(dtype='float32'):
+            assert cached.tensor('h').dtype == torch.float32
+        with scitorch.using(dtype='preserve'):
+            assert cached.tensor('h') is double
+        assert cached.tensor('h') is double
+
+    def test_tensor_wrong_name(self):
+        with raises(KeyError):
+            cached.tensor('not_a_constant')
+        with raises(KeyError):
+            cached.tensor('_math')
+
+
+class TestStack(object):
+    def test_stack_values(self):
+        values = cached.stack(['c', 'h', 'k_B'])
+        assert values.tolist() == [constants.c.get('val'), constants.h.get('val'), constants.k_B.get('val')]
+
+    def test_stack_is_cached(self):
+        assert cached.stack(['c', 'h']) is cached.stack(('c', 'h'))
+
+    def test_stack_wrong_name(self):
+        with raises(KeyError):
+            cached.stack(['c', 'not_a_constant'])
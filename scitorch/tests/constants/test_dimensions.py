@@ -0,0 +1,98 @@
+import pickle
+
+from pytest import raises
+from scitorch.constants import constants, Dimension, dimension
+
+
+class TestDimension(object):
+    def test_base_units(self):
+        assert dimension('m').exponents == (1, 0, 0, 0, 0, 0, 0)
+        assert dimension('cd').exponents == (0, 0, 0, 0, 0, 0, 1)
+
+    def test_exponents(self):
+        assert dimension('m^(3)*kg^(-1)*s^(-2)').exponents == (3, -1, -2, 0, 0, 0, 0)
+
+    def test_derived_units(self):
+        assert dimension('J') == dimension('kg*m^(2)*s^(-2)')
+        assert dimension('Omega') == dimension('V*A^(-1)')
+        assert dimension('S') == dimension('Omega^(-1)')
+        assert dimension('Wb') == dimension('V*s')
+        assert dimension('C') == dimension('A*s')
+        assert dimension('T') == dimension('Wb*m^(-2)')
+
+    def test_all_constants(self):
+        for name in dir(constants):
+            val = getattr(constants, name)
+            if not name.startswith('_') and isinstance(val, dict):
+                assert isinstance(dimension(val), Dimension)
+
+    def test_constant_relations(self):
+        assert dimension(constants.R) == dimension(constants.k_B) * dimension(constants.N_A)
+        assert dimension(constants.hbar) == dimension(constants.h)
+        assert dimension(constants.phi_0) == dimension(constants.h) / dimension(constants.e)
+        assert dimension(constants.G_0) ** -1 == dimension(constants.R_K)
+
+    def test_algebra(self):
+        assert dimension('J') / dimension('s') == dimension('W')
+        assert dimension('N') * dimension('m') == dimension('J')
+        assert dimension('m') ** 2 == dimension('m*m')
+        assert dimension('Hz') ** -1 == dimension('s')
+        assert dimension('J') != dimension('W')
+
+    def test_dimensionless(self):
+        assert not dimension('m') / dimension('m')
+        assert dimension('m') / dimension('m') == dimension('1')
+        assert str(dimension('1')) == '1'
+
+    def test_interned(self):
+        assert dimension('J*s^(-1)') is dimension('W')
+        assert Dimension('W') is dimension('W')
+
+    def test_str(self):
+        assert str(dimension('J*mol^(-1)*K^(-1)')) == 'm^(2)*kg*s^(-2)*K^(-1)*mol^(-1)'
+        assert repr(dimension('Hz')) == "Dimension('s^(-1)')"
+        assert dimension(str(dimension('F*m^(-1)'))) == dimension('F*m^(-1)')
+
+    def test_pickle(self):
+        assert pickle.loads(pickle.dumps(dimension('V'))) is dimension('V')
+
+    def test_unknown_unit(self):
+        with raises(NotImplementedError):
+            dimension('furlong')
+
+    def test_malformed(self):
+        with raises(ValueError):
+            dimension('m^2')
+
+    def test_wrong_type(self):
+        with raises(TypeError):
+            dimension(1)
+        with raises(TypeError):
+            dimension('m') * 2
+
+    def test_overflow(self):
+        with raises(OverflowError):
+            dimension('m') ** 200
+        with raises(OverflowError):
+            dimension('m') ** 65536
+        with raises(OverflowError):
+            dimension('m^(2)') ** -100
+        with raises(OverflowError):
+            dimension('m^(127)') * dimension('m')
+        with raises(OverflowError):
+            dimension('m^(-128)') / dimension('m')
+
+    def test_parse_overflow(self):
+        with raises(OverflowError):
+            dimension('m^(65408)')
+        with raises(OverflowError):
+            dimension('m^(128)')
+        with raises(OverflowError):
+            dimension('J^(64)')
+
+    def test_exponent_limits(self):
+        assert dimension('m^(127)').exponents == (127, 0, 0, 0, 0, 0, 0)
+        assert dimension('m^(-128)').exponents == (-128, 0, 0, 0, 0, 0, 0)
+        assert dimension('m^(200)*m^(-100)').exponents == (100, 0, 0, 0, 0, 0, 0)
+        assert dimension('m^(-1)') ** -127 == dimension('m^(127)')
+        assert dimension('1') ** 65536 == dimension('1')
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+
+import torch
+
+import scitorch
+from pytest import raises
+from scitorch.conversion import aio
+
+
+def run(coroutine):
+    # asyncio.run() needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAio(object):
+    def test_small_inline(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(aio, 'offload', lambda *args, **kwargs: calls.append(args))
+        assert run(aio.to_bytes([1, 2], 'KB')).tolist() == [1000., 2000.]
+        assert calls == []
+
+    def test_large_offloaded(self):
+        val = torch.ones(aio.THRESHOLD)
+        result = run(aio.to_bytes(val, 'KiB', dtype='float32'))
+        assert torch.equal(result, torch.full_like(val, 1024))
+
+    def test_all_converters(self, monkeypatch):
+        monkeypatch.setattr(aio, 'THRESHOLD', 0)
+
+        async def main():
+            return await asyncio.gather(aio.to_bits(1, 'B'), aio.to_joule(1, 'KJ'), aio.to_kilogram(1, 'Mg'),
+                                        aio.to_kelvin(0, 'c'), aio.to_celsius(273.15, 'k'),
+                                        aio.to_fahrenheit(100, 'c'), aio.convert(1, 'KiB', 'B'),
+                                        aio.to_bytes_batch([1, 1], ['KB', 'KiB']), aio.to_joule_batch([1], ['Wh']),
+                                        aio.to_kilogram_batch([1], ['g']), aio.to_kelvin_batch([0], ['c']))
+
+        results = [result.tolist() for result in run(main())]
+        assert results == [8., 1000., 1000., 273.15, 0., 212., 1024., [1000., 1024.], [3600.], [0.001], [273.15]]
+
+    def test_nested_offloaded(self, monkeypatch):
+        calls = []
+        offload = aio.offload
+
+        async def record(*args, **kwargs):
+            calls.append(args)
+            return await offload(*args, **kwargs)
+
+        monkeypatch.setattr(aio, 'offload', record)
+        monkeypatch.setattr(aio, 'THRESHOLD', 6)
+        assert run(aio.to_bytes([[1, 2], [3, 4]], 'KB')).tolist() == [[1000., 2000.], [3000., 4000.]]
+        assert calls == []
+        assert run(aio.to_bytes([[[1, 2]] * 2] * 2, 'KB')).shape == (2, 2, 2)
+        assert len(calls) == 1
+
+    def test_size(self):
+        assert aio._size([[1, 2, 3]] * 4) == 12
+        assert aio._size(([[1], [2]], [[3], [4]])) == 4
+        assert aio._size([torch.ones(3, 2)] * 2) == 12
+        assert aio._size([]) == 0
+
+    def test_offload_runs_in_pool(self):
+        assert run(aio.offload(threading.get_ident)) != threading.get_ident()
+
+    def test_errors(self, monkeypatch):
+        monkeypatch.setattr(aio, 'THRESHOLD', 0)
+        with raises(NotImplementedError):
+            run(aio.to_bytes([1], 'xyz'))
+
+    def test_local_settings(self, monkeypatch):
+        monkeypatch.setattr(aio, 'THRESHOLD', 0)
+        with scitorch.using(dtype='float32'):
+            assert run(aio.to_joule([1, 2], 'eV')).dtype == torch.float32
+        assert run(aio.to_joule([1, 2], 'eV')).dtype == torch.float64
+
+    def test_wraps(self):
+        assert aio.to_bytes.__name__ == 'to_bytes'
+        assert 'digital.to_bytes' in aio.to_bytes.__doc__
+        assert asyncio.iscoroutinefunction(aio.to_bytes)
+
+
+class TestBackpressure(object):
+    def test_pending_limit(self, monkeypatch):
+        monkeypatch.setattr(aio, 'MAX_PENDING', 2)
+        release = threading.Event()
+
+        async def main():
+            tasks = [asyncio.ensure_future(aio.offload(release.wait)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            slots = aio._slots[asyncio.get_event_loop()]
+            assert slots.locked()
+            assert not any(task.done() for task in tasks)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        assert run(main()) == [True, True, True]
+
+    def test_cancel_waiting(self, monkeypatch):
+        monkeypatch.setattr(aio, 'MAX_PENDING', 1)
+        release = threading.Event()
+        calls = []
+
+        async def main():
+            running = asyncio.ensure_future(aio.offload(release.wait))
+            waiting = asyncio.ensure_future(aio.offload(calls.append, 1))
+            await asyncio.sleep(0.05)
+            waiting.cancel()
+            with raises(asyncio.CancelledError):
+                await waiting
+            release.set()
+            await running
+            # the slot of the finished conversion is free again
+            await asyncio.wait_for(aio.offload(calls.append, 2), timeout=5)
+
+        run(main())
+        assert calls == [2]
+
+    def test_cancel_running(self):
+        release = threading.Event()
+
+        async def main():
+            task = asyncio.ensure_future(aio.offload(release.wait))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with raises(asyncio.CancelledError):
+                await task
+            release.set()
+
+        run(main())
+
+    def test_loop_stays_responsive(self, monkeypatch):
+        monkeypatch.setattr(aio, 'THRESHOLD', 0)
+        release = threading.Event()
+
+        async def main():
+            task = asyncio.ensure_future(aio.offload(release.wait, 5))
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.001)
+                ticks += 1
+            release.set()
+            await task
+            return ticks
+
+        assert run(main()) == 5
@@ -5,6 +5,8 @@
     mainly the default values and the conversion from bytes to the new unit are tested in the other functions.
 """
 
+import struct
+
 import torch
 from pytest import raises
 from scitorch.tools._tensors import T
@@ -475,6 +477,117 @@ class TestToBit(object):
         assert torch.all(torch.eq(bits, T([0, 8])))
 
 
+
+# Test writing into preallocated and caller-owned tensors
+class TestToBytesOutInplace(object):
+    def test_to_bytes_out(self):
+        out = torch.empty(2, dtype=torch.float64)
+        bytes = to_bytes([0, 1], 'KiB', out=out)
+        assert bytes is out
+        assert torch.all(torch.eq(out, T([0, constants.kibi])))
+
+    def test_to_bytes_out_strided_view(self):
+        buffer = torch.zeros(4, dtype=torch.float64)
+        to_bytes(T([1, 2]), 'KB', out=buffer[::2])
+        assert torch.all(torch.eq(buffer, T([constants.kilo, 0, 2 * constants.kilo, 0])))
+
+    def test_to_bytes_out_float32(self):
+        out = torch.empty(2, dtype=torch.float32)
+        to_bytes([1, 2], 'b', out=out)
+        assert torch.all(torch.eq(out, torch.tensor([0.125, 0.25])))
+
+    def test_to_bytes_inplace(self):
+        bytes_tensor = T([1, 2])
+        bytes = to_bytes(bytes_tensor, 'MB', inplace=True)
+        assert bytes is bytes_tensor
+        assert torch.all(torch.eq(bytes_tensor, T([constants.mega, 2 * constants.mega])))
+
+    def test_to_bytes_inplace_memory_mapped(self, tmp_path):
+        path = str(tmp_path / 'bytes.bin')
+        with open(path, 'wb') as f:
+            f.write(struct.pack('2d', 1, 2))
+        mapped = torch.from_file(path, shared=True, size=2, dtype=torch.float64)
+        to_bytes(mapped, 'Kib', inplace=True)
+        reread = torch.from_file(path, shared=False, size=2, dtype=torch.float64)
+        assert torch.all(torch.eq(reread, T([constants.kibi / 8, constants.kibi / 4])))
+
+    def test_to_bytes_inplace_requires_float_tensor(self):
+        with raises(TypeError):
+            to_bytes([0, 1], 'KB', inplace=True)
+        with raises(TypeError):
+            to_bytes(torch.tensor([0, 1]), 'KB', inplace=True)
+
+    def test_to_bytes_out_and_inplace(self):
+        with raises(ValueError):
+            to_bytes(T([0, 1]), 'KB', out=torch.empty(2), inplace=True)
+
+    def test_to_bits_out(self):
+        out = torch.empty(2, dtype=torch.float64)
+        to_bits([1, 2], 'KB', out=out)
+        assert torch.all(torch.eq(out, T([8000, 16000])))
+
+    def test_to_bytes_batch_inplace(self):
+        bytes_tensor = T([1, 8])
+        to_bytes_batch(bytes_tensor, ['KB', 'b'], inplace=True)
+        assert torch.all(torch.eq(bytes_tensor, T([constants.kilo, 1])))
+
+# Test units that are only available through the prefix parser
+class TestToBytesPrefixed(object):
+    def test_to_bytes_from_exabyte(self):
+        assert torch.all(torch.eq(to_bytes([0, 1], 'EB'), T([0, constants.exa])))
+
+    def test_to_bytes_from_yobibit(self):
+        assert torch.all(torch.eq(to_bytes(8, 'Yib'), T(constants.yobi)))
+
+    def test_to_bytes_batch_prefixed(self):
+        bytes = to_bytes_batch([1, 1], ['ZB', 'EiB'])
+        assert torch.all(torch.eq(bytes, T([constants.zetta, constants.exbi])))
+
+
+# Test the mixed-unit entry point
+class TestToBytesBatch(object):
+    def test_to_bytes_batch_strings(self):
+        bytes = to_bytes_batch([200, 1, 8], ['MB', 'GiB', 'Kbit'])
+        assert torch.all(torch.eq(bytes, T([200 * constants.mega, constants.gibi, 8 * 125])))
+
+    def test_to_bytes_batch_codes(self):
+        codes = torch.tensor([UNITS.index('KB'), UNITS.index('Pib')])
+        bytes = to_bytes_batch([1, 1], codes)
+        assert torch.all(torch.eq(bytes, T([constants.kilo, constants.pebi / 8])))
+
+    def test_to_bytes_batch_matches_to_bytes(self):
+        values = T(list(range(len(UNITS))))
+        bytes = to_bytes_batch(values, UNITS)
+        expected = torch.stack([to_bytes(v, u) for v, u in zip(values, UNITS)])
+        assert torch.all(torch.eq(bytes, expected))
+
+    def test_to_bytes_batch_nested(self):
+        bytes = to_bytes_batch([[1, 1], [8, 8]], [['B', 'KB'], ['b', 'Kbit']])
+        assert torch.all(torch.eq(bytes, T([[1, constants.kilo], [1, constants.kilo]])))
+
+    def test_to_bytes_batch_wrong_unit(self):
+        with raises(NotImplementedError):
+            to_bytes_batch([0, 1], ['B', 'kb'])
+
+    def test_to_bytes_batch_wrong_shape(self):
+        with raises(ValueError):
+            to_bytes_batch([1, 1], [['B'], ['KB']])
+        with raises(ValueError):
+            to_bytes_batch([1, 1], torch.tensor([0, 1, 2]))
+
+    def test_to_bytes_batch_single_unit(self):
+        bytes = to_bytes_batch([1, 2], 'KB')
+        assert torch.all(torch.eq(bytes, T([constants.kilo, 2 * constants.kilo])))
+
+    def test_to_bytes_batch_wrong_code(self):
+        with raises(IndexError):
+            to_bytes_batch([0, 1], torch.tensor([0, len(UNITS)]))
+
+    def test_to_bytes_batch_with_dimension(self):
+        bytes = to_bytes_batch([0, 1], ['B', 'GB'], dim=True)
+        assert torch.all(torch.eq(bytes['val'], T([0, constants.giga]))) and bytes['dim'] == 'B'
+
+
 # class TestToKilobit(object):
 #     def test_to_kilobits_default_values_scalar(self):
 #         kilobits = to_kilobits()
@@ -709,3 +822,150 @@ class TestToBit(object):
 #     assert round(hd1_price.item(), 4) == 0.08
 #     assert round(hd2_price.item(), 4) == 0.0782
 
+
+
+class TestToBytesExact(object):
+    def test_bytes(self):
+        result, bits = to_bytes_exact([1, 2], 'KiB')
+        assert result.dtype == torch.int64
+        assert torch.equal(result, torch.tensor([1024, 2048]))
+        assert torch.equal(bits, torch.tensor([0, 0]))
+
+    def test_bits_remainder(self):
+        result, bits = to_bytes_exact([12, 16, 7], 'b')
+        assert torch.equal(result, torch.tensor([1, 2, 0]))
+        assert torch.equal(bits, torch.tensor([4, 0, 7]))
+
+    def test_negative_rounds_down(self):
+        result, bits = to_bytes_exact(-12, 'bit')
+        assert result.item() == -2 and bits.item() == 4
+
+    def test_decimal_bit_prefix(self):
+        result, bits = to_bytes_exact([3, 7], 'Kbit')
+        assert torch.equal(result, torch.tensor([375, 875]))
+        assert torch.equal(bits, torch.tensor([0, 0]))
+
+    def test_above_float64_precision(self):
+        result, _ = to_bytes_exact(2**53 + 1, 'B')
+        assert result.item() == 2**53 + 1
+        result, _ = to_bytes_exact(2**50 + 1, 'KB')
+        assert result.item() == (2**50 + 1) * 1000
+
+    def test_large_bit_count(self):
+        result, bits = to_bytes_exact(2**62 + 3, 'b')
+        assert result.item() == (2**62 + 3) // 8
+        assert bits.item() == 3
+
+    def test_integer_tensor(self):
+        result, _ = to_bytes_exact(torch.tensor([1, 2], dtype=torch.int32), 'MB')
+        assert result.dtype == torch.int64
+        assert torch.equal(result, torch.tensor([10**6, 2 * 10**6]))
+
+    def test_dim(self):
+        converted = to_bytes_exact(9, 'b', dim=True)
+        assert converted['dim'] == 'B'
+        assert converted['val'].item() == 1 and converted['remainder'].item() == 1
+
+    def test_overflow(self):
+        with raises(OverflowError):
+            to_bytes_exact(2**40, 'PB')
+        with raises(OverflowError):
+            to_bytes_exact(1, 'YB')
+
+    def test_zero_in_large_unit(self):
+        result, _ = to_bytes_exact([0], 'PiB')
+        assert result.item() == 0
+
+    def test_zero_beyond_int64_factor(self):
+        result, bits = to_bytes_exact([0, 0], 'YB')
+        assert torch.equal(result, torch.tensor([0, 0])) and torch.equal(bits, torch.tensor([0, 0]))
+        assert to_bits_exact([], 'YiB').tolist() == []
+        assert to_bytes_exact(0, 'Yibit')[0].item() == 0
+
+    def test_float_values(self):
+        with raises(TypeError):
+            to_bytes_exact([1.5], 'B')
+        with raises(TypeError):
+            to_bytes_exact(torch.tensor([1.]), 'B')
+
+    def test_wrong_unit(self):
+        with raises(NotImplementedError):
+            to_bytes_exact(1, 'kb')
+
+
+class TestToBitsExact(object):
+    def test_bits(self):
+        assert torch.equal(to_bits_exact([1, 2], 'KiB'), torch.tensor([8192, 16384]))
+        assert to_bits_exact(3, 'Mbit').item() == 3 * 10**6
+
+    def test_dim(self):
+        assert to_bits_exact(1, 'B', dim=True)['dim'] == 'b'
+
+    def test_overflow(self):
+        with raises(OverflowError):
+            to_bits_exact(2**61, 'B')
+
+
+class TestAutoscale(object):
+    def test_binary(self):
+        scaled, codes = autoscale([512, 2048, 3 * constants.gibi])
+        assert torch.equal(scaled, T([512, 2, 3]))
+        assert [UNITS[code] for code in codes] == ['B', 'KiB', 'GiB']
+
+    def test_si(self):
+        scaled, codes = autoscale([999, 1000, 2.5 * constants.peta], system='si')
+        assert torch.equal(scaled, T([999, 1, 2.5]))
+        assert [UNITS[code] for code in codes] == ['B', 'KB', 'PB']
+
+    def test_from_unit(self):
+        scaled, codes = autoscale(2048, 'MiB')
+        assert scaled.item() == 2 and UNITS[codes.item()] == 'GiB'
+
+    def test_bits(self):
+        scaled, codes = autoscale([1, 1000], 'B', system='si', bits=True)
+        assert torch.equal(scaled, T([8, 8]))
+        assert [UNITS[code] for code in codes] == ['b', 'Kbit']
+
+    def test_small_and_negative(self):
+        scaled, codes = autoscale([0, 0.5, -2048])
+        assert torch.equal(scaled, T([0, 0.5, -2]))
+        assert [UNITS[code] for code in codes] == ['B', 'B', 'KiB']
+
+    def test_largest_unit(self):
+        scaled, codes = autoscale(2048 * constants.yobi)
+        assert scaled.item() == 2048 and UNITS[codes.item()] == 'YiB'
+
+    def test_decimals_round_up(self):
+        scaled, codes = autoscale(1023.999, decimals=2)
+        assert UNITS[codes.item()] == 'KiB'
+        _, codes = autoscale(1023.999)
+        assert UNITS[codes.item()] == 'B'
+
+    def test_codes_invert_with_batch(self):
+        values = T([3, 5000, 7e12])
+        scaled, codes = autoscale(values, system='si')
+        assert torch.allclose(to_bytes_batch(scaled, codes), values, rtol=1e-15)
+
+    def test_wrong_system(self):
+        with raises(NotImplementedError):
+            autoscale(1, system='decimal')
+
+
+class TestFormatBytes(object):
+    def test_list(self):
+        assert format_bytes([512, 1.5 * constants.mebi, 1234567890], precision=1) == ['512.0 B', '1.5 MiB', '1.1 GiB']
+
+    def test_scalar(self):
+        assert format_bytes(1234567890, system='si') == '1.23 GB'
+
+    def test_sep(self):
+        assert format_bytes([1, 8], 'KB', bits=True, system='si', sep=', ') == '8.00 Kbit, 64.00 Kbit'
+
+    def test_rounding_moves_to_next_unit(self):
+        assert format_bytes(1023.999) == '1.00 KiB'
+
+    def test_nested(self):
+        assert format_bytes([[1, 2], [3, 4]], 'KiB', precision=0) == ['1 KiB', '2 KiB', '3 KiB', '4 KiB']
+
+    def test_empty(self):
+        assert format_bytes([]) == []
@@ -0,0 +1,83 @@
+import multiprocessing
+
+import torch
+
+from pytest import approx, mark, raises
+from scitorch.conversion import distributed
+
+WORLD_SIZE = 3
+
+
+def _worker(rank, store, queue):
+    torch.distributed.init_process_group('gloo', init_method=f'file://{store}', rank=rank, world_size=WORLD_SIZE)
+    try:
+        # rank r holds r + 1 values: 1, 2, ... KiB
+        val = torch.arange(rank * (rank + 1) // 2 + 1, (rank + 1) * (rank + 2) // 2 + 1, dtype=torch.float64)
+        stats = distributed.convert_reduce(val, 'KiB', 'B', bins=3)
+        queue.put((rank, distributed.shard(list('abcdefg')), stats['val'].tolist(), stats['total'], stats['count'],
+                   stats['min'], stats['max'], stats['hist'].tolist(), stats['edges'].tolist()))
+    finally:
+        torch.distributed.destroy_process_group()
+
+
+@mark.skipif(not torch.distributed.is_available(), reason='torch.distributed is not available')
+class TestGloo(object):
+    def test_three_ranks(self, tmp_path):
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        processes = [context.Process(target=_worker, args=(rank, tmp_path / 'store', queue))
+                     for rank in range(WORLD_SIZE)]
+        for process in processes:
+            process.start()
+        results = sorted(queue.get(timeout=120) for _ in processes)
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        assert [result[1] for result in results] == [['a', 'd', 'g'], ['b', 'e'], ['c', 'f']]
+        assert [result[2] for result in results] == [[1024.], [2048., 3072.], [4096., 5120., 6144.]]
+        for _, _, _, total, count, low, high, hist, edges in results:
+            assert total == 21 * 1024.
+            assert count == 6
+            assert (low, high) == (1024., 6144.)
+            assert hist == [2., 2., 2.]
+            assert edges == approx([1024., 1024. + 5120. / 3, 1024. + 10240. / 3, 6144.])
+
+
+class TestSingleProcess(object):
+    def test_reductions(self):
+        stats = distributed.convert_reduce(torch.tensor([1., 2.]), 'KiB', 'B', bins=2)
+        assert stats['total'] == 3072.
+        assert stats['count'] == 2
+        assert (stats['min'], stats['max']) == (1024., 2048.)
+        assert stats['hist'].tolist() == [1., 1.]
+        assert stats['edges'].tolist() == [1024., 1536., 2048.]
+        assert stats['dim'] == 'B'
+        assert stats['val'].tolist() == [1024., 2048.]
+
+    def test_no_histogram(self):
+        stats = distributed.convert_reduce(torch.tensor([32., 212.]), 'f', 'c')
+        assert 'hist' not in stats
+        assert stats['total'] == 100.
+
+    def test_range(self):
+        stats = distributed.convert_reduce(torch.tensor([1., 2., 5.]), 'KB', 'B', bins=2, range=(0, 4000))
+        assert stats['hist'].tolist() == [1., 1.]
+
+    def test_single_value(self):
+        stats = distributed.convert_reduce(torch.tensor([1.]), 'KB', 'B', bins=2)
+        assert stats['edges'].tolist() == [999.5, 1000., 1000.5]
+
+    def test_empty(self):
+        stats = distributed.convert_reduce(torch.tensor([]), 'KB', 'B', bins=2)
+        assert stats['count'] == 0
+        assert stats['min'] == float('inf')
+        assert stats['max'] == float('-inf')
+        assert stats['hist'].tolist() == [0., 0.]
+
+    def test_wrong_range(self):
+        with raises(ValueError):
+            distributed.convert_reduce(torch.tensor([1.]), 'KB', 'B', bins=2, range=(1, 1))
+
+    def test_shard(self):
+        assert distributed.shard(range(3)) == [0, 1, 2]
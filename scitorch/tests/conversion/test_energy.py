@@ -73,4 +73,23 @@ class TestToJoule(object):
 
     def test_to_joule_from_fahrenheit_list(self):
         joule = to_joule([0, 1], 'eV')
-        assert torch.equal(joule, T([0, constants.eV.get('val')]))
\ No newline at end of file
+        assert torch.equal(joule, T([0, constants.eV.get('val')]))
+
+    def test_to_joule_from_prefixed_units(self):
+        assert torch.equal(to_joule([0, 1], 'µJ'), T([0, constants.micro]))
+        assert torch.equal(to_joule([0, 1], 'GWh'), T([0, 3600 * constants.giga]))
+        assert torch.equal(to_joule([0, 1], 'kJ'), T([0, constants.kilo]))
+
+
+class TestToJouleBatch(object):
+    def test_to_joule_batch_strings(self):
+        joule = to_joule_batch([1, 2, 1], ['KJ', 'Wh', 'eV'])
+        assert torch.equal(joule, T([1000, 7200, constants.eV.get('val')]))
+
+    def test_to_joule_batch_codes(self):
+        joule = to_joule_batch([1, 1], torch.tensor([UNITS.index('J'), UNITS.index('KWh')]))
+        assert torch.equal(joule, T([1, 3.6 * constants.mega]))
+
+    def test_to_joule_batch_wrong_unit(self):
+        with raises(NotImplementedError):
+            to_joule_batch([0, 0], ['J', 'Kcal'])
@@ -0,0 +1,125 @@
+from array import array
+
+import torch
+
+import scitorch
+from pytest import importorskip, raises
+from scitorch.conversion import temperature
+from scitorch.conversion.files import convert_file, _npy_header
+
+
+def write_raw(path, typecode, values):
+    with open(path, 'wb') as f:
+        array(typecode, values).tofile(f)
+
+
+def read_raw(path, typecode):
+    with open(path, 'rb') as f:
+        return array(typecode, f.read()).tolist()
+
+
+class TestConvertFile(object):
+    def test_raw(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'd', [32, 212, -40])
+        assert convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'f', 'c') == 3
+        assert read_raw(tmp_path / 'out.raw', 'd') == [0., 100., -40.]
+
+    def test_chunks(self, tmp_path):
+        values = [float(i) for i in range(10000)]
+        write_raw(tmp_path / 'in.raw', 'f', values)
+        count = convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'f', 'k', src_dtype='float32',
+                             chunk_size=4 * 999)
+        assert count == len(values)
+        expected = temperature.to_kelvin(torch.tensor(values, dtype=torch.float32), 'f').tolist()
+        assert read_raw(tmp_path / 'out.raw', 'd') == expected
+
+    def test_preserve_dtype(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'f', [1, 2])
+        convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'KB', 'B', src_dtype='float32', dtype='preserve')
+        assert read_raw(tmp_path / 'out.raw', 'f') == [1000., 2000.]
+
+    def test_integer_input(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'h', [1, -2])
+        convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'KiB', 'B', src_dtype='int16', dtype='preserve')
+        assert read_raw(tmp_path / 'out.raw', 'd') == [1024., -2048.]
+
+    def test_npy_roundtrip(self, tmp_path):
+        with open(tmp_path / 'in.npy', 'wb') as f:
+            f.write(_npy_header(torch.float32, (2, 3), False))
+            array('f', range(6)).tofile(f)
+        assert convert_file(tmp_path / 'in.npy', tmp_path / 'out.npy', 'g', 'mg', dtype='float32') == 6
+        data = (tmp_path / 'out.npy').read_bytes()
+        header = _npy_header(torch.float32, (2, 3), False)
+        assert data[:len(header)] == header
+        assert array('f', data[len(header):]).tolist() == [0., 1000., 2000., 3000., 4000., 5000.]
+
+    def test_npy_header_alignment(self):
+        for shape in [(), (1,), (10, 20, 30), (2 ** 40,)]:
+            assert len(_npy_header(torch.float64, shape, False)) % 64 == 0
+
+    def test_empty(self, tmp_path):
+        (tmp_path / 'in.raw').write_bytes(b'')
+        assert convert_file(tmp_path / 'in.raw', tmp_path / 'out.npy', 'B', 'KB') == 0
+        assert (tmp_path / 'out.npy').read_bytes() == _npy_header(torch.float64, (0,), False)
+
+    def test_wrong_unit(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'd', [1])
+        with raises(NotImplementedError):
+            convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'B', 'xyz')
+        assert not (tmp_path / 'out.raw').exists()
+
+    def test_error_removes_output(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'd', [1] * 100 + [1e6])
+        with scitorch.using(range_check='raise'):
+            with raises(FloatingPointError):
+                convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'B', 'KB', dtype='float16', chunk_size=8 * 10)
+        assert not (tmp_path / 'out.raw').exists()
+
+    def test_truncated_raw(self, tmp_path):
+        (tmp_path / 'in.raw').write_bytes(b'\x00' * 12)
+        with raises(ValueError):
+            convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'B', 'KB')
+
+    def test_wrong_src_dtype(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'd', [1])
+        with raises(TypeError):
+            convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'B', 'KB', src_dtype='complex64')
+
+    def test_bfloat16_npy(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'd', [1])
+        with raises(TypeError):
+            convert_file(tmp_path / 'in.raw', tmp_path / 'out.npy', 'B', 'KB', dtype='bfloat16')
+
+    def test_same_file(self, tmp_path):
+        write_raw(tmp_path / 'in.raw', 'd', [1])
+        with raises(ValueError):
+            convert_file(tmp_path / 'in.raw', tmp_path / 'in.raw', 'B', 'KB')
+        assert read_raw(tmp_path / 'in.raw', 'd') == [1.]
+
+
+class TestNumpyFiles(object):
+    def test_npy(self, tmp_path):
+        numpy = importorskip('numpy')
+        values = numpy.arange(12, dtype=numpy.float32).reshape(3, 4) * 10
+        numpy.save(tmp_path / 'in.npy', values)
+        convert_file(tmp_path / 'in.npy', tmp_path / 'out.npy', 'eV', 'J', dtype='float64', chunk_size=20)
+        result = numpy.load(tmp_path / 'out.npy')
+        assert result.shape == (3, 4)
+        assert result.dtype == numpy.float64
+        assert numpy.allclose(result, values * 1.602176634e-19, rtol=1e-6)
+
+    def test_fortran_order(self, tmp_path):
+        numpy = importorskip('numpy')
+        values = numpy.asfortranarray(numpy.arange(6, dtype=numpy.float64).reshape(2, 3))
+        numpy.save(tmp_path / 'in.npy', values)
+        convert_file(tmp_path / 'in.npy', tmp_path / 'out.npy', 'KB', 'B')
+        assert (numpy.load(tmp_path / 'out.npy') == values * 1000).all()
+
+    def test_memmap_input(self, tmp_path):
+        numpy = importorskip('numpy')
+        values = numpy.memmap(tmp_path / 'in.raw', dtype=numpy.int32, mode='w+', shape=(5,))
+        values[:] = [1, 2, 3, 4, 5]
+        values.flush()
+        convert_file(tmp_path / 'in.raw', tmp_path / 'out.raw', 'Kibit', 'b', src_dtype='int32')
+        assert numpy.fromfile(tmp_path / 'out.raw', dtype=numpy.float64).tolist() == [1024., 2048., 3072., 4096.,
+                                                                                     5120.]
@@ -0,0 +1,80 @@
+import torch
+
+from pytest import raises
+from scitorch.tools._tensors import T
+from scitorch.conversion import convert, parse_unit
+from scitorch.conversion import digital, energy, mass, temperature
+from scitorch.constants import constants
+
+
+class TestConvert(object):
+    def test_convert_storage(self):
+        assert torch.equal(convert([0, 8], 'Mbit', 'MB'), T([0, 1]))
+        assert torch.equal(convert(1, 'GiB', 'MiB'), T(constants.kibi))
+        assert torch.equal(convert(1, 'B', 'b'), T(8))
+
+    def test_convert_energy(self):
+        assert torch.equal(convert(1, 'KWh', 'Wh'), T(1000))
+
+    def test_convert_mass(self):
+        assert torch.equal(convert([0, 1], 't', 'kg'), T([0, constants.kilo]))
+
+    def test_convert_temperature(self):
+        assert torch.equal(convert([0, -15], 'c', 'f'), T([32, 5]))
+        assert torch.equal(convert([32, 5], 'f', 'k'), T([273.15, 258.15]))
+
+    def test_convert_same_unit(self):
+        tensor = T([0, 1])
+        assert convert(tensor, 'KB', 'KB') is tensor
+
+    def test_convert_matches_to_base(self):
+        values = T([1, 3, 1000])
+        for unit in digital.UNITS:
+            assert torch.allclose(convert(values, unit, 'B'), digital.to_bytes(values, unit), rtol=1e-15)
+        for unit in energy.UNITS:
+            assert torch.allclose(convert(values, unit, 'J'), energy.to_joule(values, unit), rtol=1e-15)
+        for unit in mass.UNITS:
+            assert torch.allclose(convert(values, unit, 'kg'), mass.to_kilogram(values, unit), rtol=1e-15)
+
+    def test_convert_round_trip(self):
+        values = T([1, 3, 1000])
+        for unit in digital.UNITS:
+            assert torch.allclose(convert(convert(values, 'GB', unit), unit, 'GB'), values, rtol=1e-15)
+
+    def test_convert_out(self):
+        out = torch.empty(2, dtype=torch.float64)
+        convert([1, 2], 'KiB', 'B', out=out)
+        assert torch.equal(out, T([constants.kibi, 2 * constants.kibi]))
+
+    def test_convert_with_dimension(self):
+        joule = convert([0, 1], 'KWh', 'Wh', dim=True)
+        assert torch.equal(joule['val'], T([0, 1000])) and joule['dim'] == 'Wh'
+
+    def test_convert_different_families(self):
+        with raises(ValueError):
+            convert(1, 'MB', 'J')
+
+    def test_convert_wrong_unit(self):
+        with raises(NotImplementedError):
+            convert(1, 'MB', 'kb')
+
+    def test_convert_wrong_arguments(self):
+        with raises(TypeError):
+            convert('MB', 1, 'B')
+
+
+class TestParseUnit(object):
+    def test_parse_unit(self):
+        assert parse_unit('GWh') == ('G', 'Wh')
+        assert parse_unit('EiB') == ('Ei', 'B')
+        assert parse_unit('kg') == ('k', 'g')
+        assert parse_unit('f') == ('', 'f')
+
+    def test_parse_unit_wrong_unit(self):
+        with raises(NotImplementedError):
+            parse_unit('furlong')
+
+    def test_convert_prefixed(self):
+        assert torch.equal(convert(1, 'EiB', 'PiB'), T(constants.kibi))
+        assert torch.equal(convert(1, 'GWh', 'MWh'), T(constants.kilo))
+        assert torch.equal(convert(1, 'kg', 'mg'), T(constants.mega))
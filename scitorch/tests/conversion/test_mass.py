@@ -65,4 +65,14 @@ class TestToKilogram(object):
 
     def test_to_kilogram_from_tonne_list(self):
         kilogram = to_kilogram([0, 1], 't')
-        assert torch.equal(kilogram, T([0, constants.kilo]))
\ No newline at end of file
+        assert torch.equal(kilogram, T([0, constants.kilo]))
+
+
+class TestToKilogramBatch(object):
+    def test_to_kilogram_batch_strings(self):
+        kilogram = to_kilogram_batch([1, 1, 1, 1], ['kg', 'g', 'mg', 't'])
+        assert torch.equal(kilogram, T([1, constants.milli, constants.micro, constants.kilo]))
+
+    def test_to_kilogram_batch_wrong_unit(self):
+        with raises(NotImplementedError):
+            to_kilogram_batch([0, 0], ['kg', 'l'])
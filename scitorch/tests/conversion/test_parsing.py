@@ -0,0 +1,94 @@
+import io
+
+import torch
+
+import scitorch
+from pytest import raises
+from scitorch.tools._tensors import T
+from scitorch.conversion import parse_quantities
+from scitorch.constants import constants
+
+
+class TestParseQuantities(object):
+    def test_list(self):
+        val = parse_quantities(['4 TiB', '512 Mbit', '1.5KB'])
+        assert torch.equal(val, T([4 * constants.tebi, 512 * 125 * constants.kilo, 1.5 * constants.kilo]))
+
+    def test_bytes(self):
+        val = parse_quantities(b'12.5 GiB\n300 B\n')
+        assert torch.equal(val, T([12.5 * constants.gibi, 300]))
+
+    def test_str(self):
+        assert torch.equal(parse_quantities('1 KWh\n2 J'), T([3.6 * constants.mega, 2]))
+
+    def test_file(self):
+        assert torch.equal(parse_quantities(io.BytesIO(b'1 g\r\n2 kg\r\n')), T([constants.milli, 2]))
+
+    def test_path(self, tmp_path):
+        path = tmp_path / 'quantities.txt'
+        path.write_text('-40 f\n0 c\n')
+        assert torch.allclose(parse_quantities(path), T([233.15, 273.15]))
+
+    def test_numbers(self):
+        val = parse_quantities(['-1 B', '+2 B', '.5 B', '1e3 B', '2.5E-1 B'])
+        assert torch.equal(val, T([-1, 2, 0.5, 1000, 0.25]))
+
+    def test_prefixed_units(self):
+        val = parse_quantities(['1 µJ', '1 GWh'])
+        assert torch.equal(val, T([constants.micro, 3600 * constants.giga]))
+
+    def test_to_unit(self):
+        assert torch.equal(parse_quantities(['2048 KiB', '1 GiB'], to_unit='MiB'), T([2, 1024]))
+        assert torch.equal(parse_quantities(['0 c'], to_unit='f'), T([32]))
+
+    def test_with_dimension(self):
+        converted = parse_quantities(b'-40 f\n100 c', dim=True)
+        assert converted['dim'] == 'K'
+        assert torch.allclose(converted['val'], T([233.15, 373.15]))
+        assert parse_quantities(['1 KB'], to_unit='KiB', dim=True)['dim'] == 'KiB'
+
+    def test_dtype(self):
+        assert parse_quantities(['1 KB'], dtype='float32').dtype == torch.float32
+
+    def test_to_unit_single_rounding(self):
+        assert parse_quantities(['4 TiB'], to_unit='TiB', dtype='float16').tolist() == [4.]
+        assert parse_quantities(['-40 f', '100 c'], to_unit='c', dtype='bfloat16').tolist() == [-40., 100.]
+
+    def test_range_check_in_target_unit(self):
+        with scitorch.using(range_check='raise'):
+            assert parse_quantities(['1 TiB'], to_unit='GiB', dtype='float16').item() == 1024
+            with raises(FloatingPointError, match='overflow'):
+                parse_quantities(['1 TiB'], to_unit='KiB', dtype='float16')
+
+    def test_empty(self):
+        assert parse_quantities([]).numel() == 0
+        assert parse_quantities(b'\n').numel() == 0
+
+    def test_empty_dim(self):
+        converted = parse_quantities([], 'KiB', dim=True)
+        assert converted['dim'] == parse_quantities(['1 B'], 'KiB', dim=True)['dim'] == 'KiB'
+        assert converted['val'].numel() == 0
+        with raises(ValueError, match='to_unit'):
+            parse_quantities(b'', dim=True)
+        with raises(NotImplementedError):
+            parse_quantities([], 'xyz', dim=True)
+
+    def test_invalid_record(self):
+        with raises(ValueError, match='4 TiB extra'):
+            parse_quantities(['1 B', '4 TiB extra'])
+        with raises(ValueError):
+            parse_quantities(['1 B', ''])
+
+    def test_unknown_unit(self):
+        with raises(NotImplementedError):
+            parse_quantities(['1 B', '1 furlong'])
+
+    def test_mixed_families(self):
+        with raises(ValueError):
+            parse_quantities(['4 TiB', '300 KWh'])
+        with raises(ValueError):
+            parse_quantities(['4 TiB'], to_unit='J')
+
+    def test_wrong_type(self):
+        with raises(TypeError):
+            parse_quantities(42)
@@ -0,0 +1,146 @@
+import warnings
+
+import torch
+
+import scitorch
+from pytest import mark, raises, warns
+from scitorch import instrument
+from scitorch.conversion import _registry, digital, energy, mass, temperature
+
+DTYPES = [torch.float64, torch.float32, torch.float16, torch.bfloat16]
+
+# Largest relative error of a converted value within the normal range of each dtype, as
+# documented in scitorch.set_range_check: 1.5 * eps, from rounding the input, the factor and the
+# result.
+MAX_RELATIVE_ERROR = {dtype: 1.5 * torch.finfo(dtype).eps for dtype in DTYPES}
+
+# Units per family whose results for values in [1, 50] stay within the normal range of float16.
+FAMILIES = {
+    'storage': (digital.to_bytes, ['b', 'B', 'KiB', 'KB']),
+    'energy': (energy.to_joule, ['J', 'mWh', 'KJ']),
+    'mass': (mass.to_kilogram, ['g', 'kg', 'Mg']),
+}
+
+
+def values(dtype):
+    """Values in [1, 50] that are exactly representable in `dtype`, and their float64 copy."""
+
+    val = torch.linspace(1, 50, 1001, dtype=torch.float64).to(dtype)
+    return val, val.double()
+
+
+@mark.parametrize('dtype', DTYPES)
+@mark.parametrize('family', sorted(FAMILIES))
+def test_relative_error(family, dtype):
+    func, units = FAMILIES[family]
+    val, reference = values(dtype)
+    for unit in units:
+        result = func(val, unit, dtype=dtype)
+        assert result.dtype == dtype
+        exact = func(reference, unit, dtype=torch.float64)
+        error = ((result.double() - exact).abs() / exact.abs()).max().item()
+        assert error <= MAX_RELATIVE_ERROR[dtype], (unit, error)
+
+
+@mark.parametrize('dtype', [torch.float32, torch.bfloat16])
+def test_electronvolt_relative_error(dtype):
+    val, reference = values(dtype)
+    for unit in ['eV', 'meV', 'KeV', 'MeV', 'GeV']:
+        result = energy.to_joule(val, unit, dtype=dtype)
+        exact = energy.to_joule(reference, unit, dtype=torch.float64)
+        error = ((result.double() - exact).abs() / exact).max().item()
+        assert error <= MAX_RELATIVE_ERROR[dtype], (unit, error)
+
+
+@mark.parametrize('dtype', DTYPES)
+def test_temperature_error(dtype):
+    val, reference = values(dtype)
+    eps = MAX_RELATIVE_ERROR[dtype]
+    for scale in ['c', 'f', 'k']:
+        scale_factor, offset = _registry.lookup('temperature', scale)
+        result = temperature.to_kelvin(val, scale, dtype=dtype)
+        exact = temperature.to_kelvin(reference, scale, dtype=torch.float64)
+        bound = eps * (reference.abs() * scale_factor + abs(offset))
+        assert ((result.double() - exact).abs() <= bound).all(), scale
+
+
+@mark.parametrize('dtype', [torch.float16, torch.bfloat16])
+def test_batch_relative_error(dtype):
+    val, reference = values(dtype)
+    units = ['b', 'B', 'KiB'] * 333 + ['B'] * 2
+    result = digital.to_bytes_batch(val, units, dtype=dtype)
+    exact = digital.to_bytes_batch(reference, units, dtype=torch.float64)
+    assert ((result.double() - exact).abs() / exact).max().item() <= MAX_RELATIVE_ERROR[dtype]
+
+
+class TestRangeCheck(object):
+    def test_ignore_by_default(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert energy.to_joule(1, 'eV', dtype='float16').item() == 0
+
+    def test_electronvolt_underflows_float16(self):
+        with scitorch.using(range_check='raise'):
+            with raises(FloatingPointError, match='underflow'):
+                energy.to_joule([1, 2], 'eV', dtype='float16')
+
+    def test_electronvolt_fits_float32(self):
+        with scitorch.using(range_check='raise'):
+            assert energy.to_joule(1, 'eV', dtype='float32').item() > 0
+
+    def test_electronvolt_fits_bfloat16(self):
+        with scitorch.using(range_check='raise'):
+            assert energy.to_joule(1, 'eV', dtype='bfloat16').item() > 0
+
+    def test_overflow_warns(self):
+        with scitorch.using(range_check='warn'):
+            with warns(RuntimeWarning, match='overflow'):
+                result = digital.to_bytes([1, 100], 'KiB', dtype='float16')
+        assert torch.isinf(result[1])
+
+    def test_warning_points_at_caller(self):
+        with scitorch.using(range_check='warn'):
+            with warns(RuntimeWarning) as record:
+                digital.to_bytes([100], 'KiB', dtype='float16')
+                energy.to_joule_batch([1], ['eV'], dtype='float16')
+            instrument.enable()
+            try:
+                with warns(RuntimeWarning) as instrumented:
+                    digital.to_bytes([100], 'KiB', dtype='float16')
+            finally:
+                instrument.disable()
+                instrument.reset()
+        assert [warning.filename for warning in record] == [__file__] * 2
+        assert [warning.filename for warning in instrumented] == [__file__]
+
+    def test_overflow_out(self):
+        out = torch.empty(2, dtype=torch.float16)
+        with scitorch.using(range_check='raise'):
+            with raises(FloatingPointError, match='1 of 2 values overflow'):
+                digital.to_bytes(torch.tensor([1., 1e6]), 'B', out=out)
+
+    def test_overflow_inplace(self):
+        val = torch.tensor([1., 1e38], dtype=torch.float32)
+        with scitorch.using(range_check='raise'):
+            with raises(FloatingPointError, match='overflow'):
+                digital.to_bytes(val, 'KB', inplace=True)
+        assert val[1].item() == torch.tensor(1e38, dtype=torch.float32).item()
+
+    def test_batch(self):
+        with scitorch.using(range_check='raise'):
+            with raises(FloatingPointError, match='underflow'):
+                energy.to_joule_batch([1, 1], ['J', 'eV'], dtype='float16')
+
+    def test_temperature_offset_is_not_underflow(self):
+        with scitorch.using(range_check='raise'):
+            assert abs(temperature.to_kelvin(-273.15, 'c', dtype='float16').item()) < 0.5
+
+    def test_zero_and_infinite_input(self):
+        with scitorch.using(range_check='raise'):
+            digital.to_bytes([0, float('inf')], 'KB', dtype='float16')
+
+    def test_in_range(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            with scitorch.using(range_check='warn'):
+                mass.to_kilogram([1, 2], 'g', dtype='float16')
@@ -0,0 +1,125 @@
+import threading
+
+from pytest import raises
+from scitorch.conversion import _registry
+from scitorch.constants import constants
+
+
+class TestLookup(object):
+    def test_lookup_base_units(self):
+        for family, unit in _registry.BASE.items():
+            assert _registry.lookup(family, unit) == (1, 0)
+
+    def test_lookup_storage(self):
+        assert _registry.lookup('storage', 'GiB') == (constants.gibi, 0)
+        assert _registry.lookup('storage', 'Mbit') == (125 * constants.kilo, 0)
+
+    def test_lookup_temperature_freezing_point(self):
+        factor, offset = _registry.lookup('temperature', 'f')
+        assert 32 * factor + offset == 273.15
+
+    def test_lookup_pair_temperature(self):
+        assert _registry.lookup_pair('c', 'f', 'temperature') == (1.8, 32)
+        assert _registry.lookup_pair('k', 'k') == (1, 0)
+
+    def test_lookup_pair_composed(self):
+        assert _registry.lookup_pair('Mbit', 'MB') == (0.125, 0)
+        assert _registry.lookup_pair('GiB', 'MiB') == (constants.kibi, 0)
+        assert _registry.lookup_pair('t', 'g', 'mass') == (constants.kilo / constants.milli, 0)
+
+    def test_lookup_pair_is_memoized(self):
+        assert _registry.lookup_pair('KWh', 'eV') is _registry.lookup_pair('KWh', 'eV')
+
+    def test_lookup_pair_different_families(self):
+        with raises(ValueError):
+            _registry.lookup_pair('MB', 'kg')
+
+    def test_lookup_pair_wrong_unit(self):
+        with raises(NotImplementedError):
+            _registry.lookup_pair('MB', 'kb')
+        with raises(NotImplementedError):
+            _registry.lookup_pair('k', 'l', 'temperature')
+
+    def test_lookup_wrong_unit(self):
+        with raises(NotImplementedError):
+            _registry.lookup('storage', 'kb')
+
+    def test_lookup_wrong_type(self):
+        with raises(TypeError):
+            _registry.lookup('energy', 0)
+        with raises(TypeError):
+            _registry.lookup('energy', [0, 1])
+
+
+class TestPrefixes(object):
+    def test_split(self):
+        assert _registry.split('energy', 'GWh') == ('G', 'Wh')
+        assert _registry.split('storage', 'EiB') == ('Ei', 'B')
+        assert _registry.split('storage', 'Yb') == ('Y', 'b')
+        assert _registry.split('storage', 'Tbit') == ('T', 'bit')
+        assert _registry.split('mass', 'mg') == ('m', 'g')
+        assert _registry.split('energy', 'µJ') == ('µ', 'J')
+        assert _registry.split('temperature', 'k') == ('', 'k')
+
+    def test_lookup_prefixed(self):
+        assert _registry.lookup('energy', 'µJ') == (constants.micro, 0)
+        assert _registry.lookup('energy', 'GWh') == (3600 * constants.giga, 0)
+        assert _registry.lookup('energy', 'meV') == (constants.eV.get('val') * constants.milli, 0)
+        assert _registry.lookup('storage', 'EiB') == (constants.exbi, 0)
+        assert _registry.lookup('storage', 'Yb') == (constants.yotta / 8, 0)
+        assert _registry.lookup('mass', 'Mg') == (constants.kilo, 0)
+        assert _registry.lookup('mass', 'µg') == (constants.nano, 0)
+
+    def test_lookup_prefixed_is_cached(self):
+        _registry.lookup('storage', 'ZiB')
+        assert 'ZiB' in _registry.FAMILIES['storage']
+        assert _registry.UNITS['storage'][_registry.CODES['storage']['ZiB']] == 'ZiB'
+
+    def test_module_units_stay_current(self):
+        from scitorch.conversion import digital
+        _registry.lookup('storage', 'Pibit')
+        assert digital.UNITS[_registry.CODES['storage']['Pibit']] == 'Pibit'
+
+    def test_concurrent_registration(self):
+        units = [prefix + base for prefix in ['a', 'f', 'p', 'n', 'c', 'h', 'da', 'P', 'E', 'Z']
+                 for base in ['J', 'eV', 'Wh']]
+        barrier = threading.Barrier(len(units))
+
+        def register(unit):
+            barrier.wait()
+            _registry.lookup('energy', unit)
+
+        threads = [threading.Thread(target=register, args=(unit,)) for unit in units]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        codes = [_registry.CODES['energy'][unit] for unit in units]
+        assert len(set(codes)) == len(units)
+        assert [_registry.UNITS['energy'][code] for code in codes] == units
+
+    def test_lookup_prefixed_wrong_unit(self):
+        for family, unit in [('storage', 'kb'), ('storage', 'mB'), ('storage', 'KiKB'),
+                             ('energy', 'Kcal'), ('energy', 'xJ'), ('mass', 'l'), ('temperature', 'mk')]:
+            with raises(NotImplementedError):
+                _registry.lookup(family, unit)
+
+    def test_family_of_prefixed(self):
+        assert _registry.family_of('GeV') == 'energy'
+        assert _registry.family_of('Tib') == 'storage'
+        assert _registry.family_of('ng') == 'mass'
+
+
+class TestFlatten(object):
+    def test_nested(self):
+        assert _registry._flatten([['B', 'KB'], ('b', 'KiB')]) == (['B', 'KB', 'b', 'KiB'], (2, 2))
+        assert _registry._flatten('B') == (['B'], ())
+        assert _registry._flatten([]) == ([], (0,))
+
+    def test_ragged(self):
+        with raises(ValueError, match=r'shape \(2,\), found a row of shape \(1,\)'):
+            _registry._flatten([['B', 'KB'], ['B']])
+        with raises(ValueError, match='shape'):
+            _registry._flatten([['B'], 'KB'])
+        with raises(ValueError, match='shape'):
+            _registry._flatten([[['B']], [['B'], ['KB']]])
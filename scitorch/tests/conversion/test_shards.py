@@ -0,0 +1,69 @@
+from array import array
+
+import scitorch
+from pytest import raises
+from scitorch.conversion.shards import convert_directory
+
+
+def write_raw(path, typecode, values):
+    with open(path, 'wb') as f:
+        array(typecode, values).tofile(f)
+
+
+def read_raw(path, typecode):
+    with open(path, 'rb') as f:
+        return array(typecode, f.read()).tolist()
+
+
+class TestConvertDirectory(object):
+    def test_directory(self, tmp_path):
+        (tmp_path / 'in').mkdir()
+        for i in range(5):
+            write_raw(tmp_path / 'in' / f'shard{i}.raw', 'd', [i, 1024 * i])
+        (tmp_path / 'in' / 'README').write_text('not a shard')
+        stats = convert_directory(tmp_path / 'in', tmp_path / 'out', 'B', 'KiB', pattern='*.raw', workers=2)
+        assert stats['files'] == 5
+        assert stats['values'] == 10
+        assert stats['bytes'] == 80
+        assert stats['seconds'] > 0
+        assert stats['values_per_second'] > 0
+        assert sorted(path.name for path in (tmp_path / 'out').iterdir()) == [f'shard{i}.raw' for i in range(5)]
+        for i in range(5):
+            assert read_raw(tmp_path / 'out' / f'shard{i}.raw', 'd') == [i / 1024, float(i)]
+
+    def test_dtype(self, tmp_path):
+        (tmp_path / 'in').mkdir()
+        write_raw(tmp_path / 'in' / 'a', 'f', [32, 212])
+        convert_directory(tmp_path / 'in', tmp_path / 'out', 'f', 'c', workers=1, threads=1, src_dtype='float32',
+                          dtype='float32')
+        assert read_raw(tmp_path / 'out' / 'a', 'f') == [0., 100.]
+
+    def test_caller_settings(self, tmp_path):
+        (tmp_path / 'in').mkdir()
+        write_raw(tmp_path / 'in' / 'a', 'd', [1, 1e6])
+        with scitorch.using(dtype='float32'):
+            convert_directory(tmp_path / 'in', tmp_path / 'out', 'KB', 'B', workers=1)
+        assert read_raw(tmp_path / 'out' / 'a', 'f') == [1000., 1e9]
+        with scitorch.using(dtype='float16', range_check='raise'):
+            with raises(FloatingPointError):
+                convert_directory(tmp_path / 'in', tmp_path / 'out16', 'KB', 'B', workers=1)
+
+    def test_empty(self, tmp_path):
+        stats = convert_directory(tmp_path, tmp_path / 'out', 'B', 'KB')
+        assert stats['files'] == 0
+        assert stats['values'] == 0
+
+    def test_wrong_unit(self, tmp_path):
+        with raises(NotImplementedError):
+            convert_directory(tmp_path, tmp_path / 'out', 'B', 'xyz')
+
+    def test_wrong_threads(self, tmp_path):
+        with raises(ValueError):
+            convert_directory(tmp_path, tmp_path / 'out', 'B', 'KB', threads=0)
+
+    def test_worker_error(self, tmp_path):
+        (tmp_path / 'in').mkdir()
+        write_raw(tmp_path / 'in' / 'a', 'd', [1])
+        (tmp_path / 'in' / 'b').write_bytes(b'\x00' * 3)
+        with raises(ValueError):
+            convert_directory(tmp_path / 'in', tmp_path / 'out', 'B', 'KB', workers=2)
@@ -0,0 +1,83 @@
+import io
+
+from pytest import raises
+from scitorch.conversion.stream import convert_stream
+
+
+def run(data, *args, **kwargs):
+    out = io.BytesIO()
+    count = convert_stream(io.BytesIO(data), out, *args, **kwargs)
+    return count, out.getvalue()
+
+
+class TestConvertStream(object):
+    def test_lines(self):
+        assert run(b'1024\n2048\n', 'B', 'KiB') == (2, b'1.0\n2.0\n')
+
+    def test_no_trailing_newline(self):
+        assert run(b'1024\n2048', 'B', 'KiB') == (2, b'1.0\n2.0\n')
+
+    def test_temperature(self):
+        assert run(b'32\n212\n', 'f', 'c') == (2, b'0.0\n100.0\n')
+
+    def test_whitespace_columns(self):
+        assert run(b'1 2\n3 4\n', 'KB', 'B') == (4, b'1000.0 2000.0\n3000.0 4000.0\n')
+
+    def test_csv_columns(self):
+        data = b'host,bytes\na,1024\nb,2048\n'
+        assert run(data, 'B', 'KiB', delimiter=',', columns=[1], header=True) == \
+            (2, b'host,bytes\na,1.0\nb,2.0\n')
+
+    def test_negative_column(self):
+        assert run(b'a,1000\n', 'g', 'kg', delimiter=',', columns=[-1]) == (1, b'a,1.0\n')
+
+    def test_format(self):
+        assert run(b'1\n', 'KB', 'B', fmt='%.2f') == (1, b'1000.00\n')
+
+    def test_small_chunks(self):
+        data = b''.join(b'%d\n' % i for i in range(100))
+        expected = b''.join(b'%r\n' % (i * 8.) for i in range(100))
+        assert run(data, 'B', 'b', chunk_size=7) == (100, expected)
+
+    def test_text_streams(self):
+        src = io.TextIOWrapper(io.BytesIO(b'1\n'))
+        dst = io.TextIOWrapper(io.BytesIO())
+        convert_stream(src, dst, 'KB', 'B')
+        assert dst.buffer.getvalue() == b'1000.0\n'
+
+    def test_empty(self):
+        assert run(b'', 'B', 'KiB') == (0, b'')
+
+    def test_wrong_unit(self):
+        with raises(NotImplementedError):
+            run(b'1\n', 'B', 'xyz')
+
+    def test_ragged_rows(self):
+        with raises(ValueError):
+            run(b'1,2\n3\n', 'B', 'KiB', delimiter=',')
+
+    def test_ragged_rows_same_count(self):
+        # rows of 1 and 3 values must not be re-flowed into two rows of 2
+        with raises(ValueError, match="line 3 has 1 columns instead of 2: '5'"):
+            run(b'1 2\n3 4\n5\n6 7 8\n', 'B', 'KiB')
+        with raises(ValueError, match="line 3 has 3 columns instead of 2: 'b,2,3'"):
+            run(b'host,bytes\na,1\nb,2,3\n', 'B', 'KiB', delimiter=',', columns=[1], header=True)
+
+    def test_ragged_rows_small_chunks(self):
+        with raises(ValueError, match='line 4 '):
+            run(b'1\n2\n3\n4 5\n', 'B', 'KiB', chunk_size=2)
+
+    def test_not_a_number(self):
+        with raises(ValueError, match="line 3 has 'x' in column 1 instead of a number: 'b,x'"):
+            run(b'host,bytes\na,1\nb,x\n', 'B', 'KiB', delimiter=',', columns=[1], header=True)
+        with raises(ValueError, match="line 2 has 'two' in column 0"):
+            run(b'1\ntwo\n', 'B', 'KiB')
+
+    def test_blank_lines(self):
+        assert run(b'1024\n\n2048\n\n', 'B', 'KiB') == (2, b'1.0\n2.0\n')
+        assert run(b'a,1024\n\r\n\nb,2048\n', 'B', 'KiB', delimiter=',', columns=[1]) == \
+            (2, b'a,1.0\nb,2.0\n')
+
+    def test_wrong_column(self):
+        with raises(IndexError):
+            run(b'1,2\n', 'B', 'KiB', delimiter=',', columns=[2])
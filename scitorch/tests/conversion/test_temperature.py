@@ -148,3 +148,61 @@ class TestToFahrenheit(object):
         assert torch.all(torch.eq(fahrenheit, T([32, 5])))
 
 
+class TestFusedConversion(object):
+    def test_tensor_input_is_not_modified(self):
+        celsius = T([0, 100])
+        to_fahrenheit(celsius, 'c')
+        to_kelvin(celsius, 'c')
+        assert torch.all(torch.eq(celsius, T([0, 100])))
+
+    def test_to_fahrenheit_matches_two_step_formula(self):
+        kelvin = torch.linspace(0, 1000, 1001, dtype=torch.float64)
+        fahrenheit = to_fahrenheit(kelvin, 'k')
+        assert torch.allclose(fahrenheit, (kelvin - 273.15) * 9 / 5 + 32)
+
+    def test_to_celsius_matches_two_step_formula(self):
+        fahrenheit = torch.linspace(-500, 500, 1001, dtype=torch.float64)
+        celsius = to_celsius(fahrenheit, 'f')
+        assert torch.allclose(celsius, (fahrenheit - 32) * 5 / 9)
+
+    def test_wrong_scale_pair(self):
+        with raises(NotImplementedError):
+            to_fahrenheit(0, 'l')
+
+
+class TestOutInplace(object):
+    def test_to_fahrenheit_out(self):
+        out = torch.empty(2, dtype=torch.float64)
+        fahrenheit = to_fahrenheit([0, -15], 'c', out=out)
+        assert fahrenheit is out
+        assert torch.all(torch.eq(out, T([32, 5])))
+
+    def test_to_kelvin_out_strided_view(self):
+        buffer = torch.zeros(2, 2, dtype=torch.float64)
+        to_kelvin(T([32, 5]), 'f', out=buffer[:, 0])
+        assert torch.all(torch.eq(buffer, T([[273.15, 0], [258.15, 0]])))
+
+    def test_to_celsius_inplace(self):
+        kelvin = T([0, 273.15])
+        celsius = to_celsius(kelvin, 'k', inplace=True)
+        assert celsius is kelvin
+        assert torch.all(torch.eq(kelvin, T([-273.15, 0])))
+
+    def test_to_kelvin_batch_out(self):
+        out = torch.empty(2, dtype=torch.float64)
+        to_kelvin_batch([32, 0], ['f', 'c'], out=out)
+        assert torch.all(torch.eq(out, T([273.15, 273.15])))
+
+
+class TestToKelvinBatch(object):
+    def test_to_kelvin_batch_strings(self):
+        kelvin = to_kelvin_batch([32, 5, 0, 10], ['f', 'f', 'c', 'k'])
+        assert torch.all(torch.eq(kelvin, T([273.15, 258.15, 273.15, 10])))
+
+    def test_to_kelvin_batch_codes(self):
+        kelvin = to_kelvin_batch([0, 32], torch.tensor([SCALES.index('c'), SCALES.index('f')]))
+        assert torch.all(torch.eq(kelvin, T([273.15, 273.15])))
+
+    def test_to_kelvin_batch_wrong_scale(self):
+        with raises(NotImplementedError):
+            to_kelvin_batch([0, 0], ['k', 'l'])
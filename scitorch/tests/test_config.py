@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import threading
+
+import torch
+
+import scitorch
+from pytest import raises
+from scitorch.tools._tensors import T
+
+
+class TestUsing(object):
+    def test_using_dtype(self):
+        with scitorch.using(dtype='float32'):
+            assert scitorch.get_dtype() == torch.float32
+            assert T([0, 1]).dtype == torch.float32
+        assert T([0, 1]).dtype == torch.float64
+
+    def test_using_device(self):
+        with scitorch.using(device='cpu'):
+            assert scitorch.get_device() == torch.device('cpu')
+            assert T([0, 1]).device == torch.device('cpu')
+
+    def test_using_nested(self):
+        with scitorch.using(dtype='float32'):
+            with scitorch.using(dtype='float16'):
+                assert scitorch.get_dtype() == torch.float16
+            assert scitorch.get_dtype() == torch.float32
+        assert scitorch.get_dtype() == torch.float64
+
+    def test_using_restores_after_error(self):
+        try:
+            with scitorch.using(dtype='float32'):
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert scitorch.get_dtype() == torch.float64
+
+
+class TestThreadLocal(object):
+    def test_local_dtype_does_not_leak_into_other_threads(self):
+        seen = []
+
+        def worker():
+            scitorch.set_dtype('float32', local=True)
+            seen.append(T(0).dtype)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        assert seen == [torch.float32]
+        assert T(0).dtype == torch.float64
+
+
+class TestEnvironment(object):
+    def test_environment_variables_are_read_at_import(self):
+        env = dict(os.environ, SCITORCH_DEVICE='cpu', SCITORCH_DTYPE='float32')
+        code = 'import scitorch; print(scitorch.get_device(), scitorch.get_dtype())'
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        assert output.decode().split() == ['cpu', 'torch.float32']
+
+
+class TestRangeCheck(object):
+    def test_default(self):
+        assert scitorch.get_range_check() == 'ignore'
+
+    def test_using_range_check(self):
+        with scitorch.using(range_check='raise'):
+            assert scitorch.get_range_check() == 'raise'
+        assert scitorch.get_range_check() == 'ignore'
+
+    def test_wrong_mode(self):
+        with raises(ValueError):
+            scitorch.set_range_check('sometimes')
+
+
+class TestContainer(object):
+    def test_default(self):
+        assert scitorch.get_container() == 'tensor'
+
+    def test_using_container(self):
+        with scitorch.using(container='same'):
+            assert scitorch.get_container() == 'same'
+        assert scitorch.get_container() == 'tensor'
+
+    def test_wrong_container(self):
+        with raises(ValueError):
+            scitorch.set_container('numpy')
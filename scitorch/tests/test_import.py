@@ -0,0 +1,37 @@
+"""Import-time budget: the constants and the converters must load without importing torch."""
+
+import subprocess
+import sys
+
+# Generous upper bound for importing all of scitorch without torch, measured in a fresh
+# interpreter. Importing torch alone takes well over a second.
+IMPORT_BUDGET = 0.25
+
+
+def _import_in_subprocess(statement):
+    code = ('import sys, time\n'
+            't = time.perf_counter()\n'
+            f'{statement}\n'
+            'print(time.perf_counter() - t, "torch" in sys.modules)')
+    seconds, torch_loaded = subprocess.check_output([sys.executable, '-c', code]).decode().split()
+    return float(seconds), torch_loaded == 'True'
+
+
+class TestImport(object):
+    def test_constants_do_not_import_torch(self):
+        seconds, torch_loaded = _import_in_subprocess('from scitorch.constants import constants')
+        assert not torch_loaded
+        assert seconds < IMPORT_BUDGET
+
+    def test_converters_do_not_import_torch(self):
+        seconds, torch_loaded = _import_in_subprocess(
+            'import scitorch\n'
+            'from scitorch.conversion import digital, energy, mass, temperature')
+        assert not torch_loaded
+        assert seconds < IMPORT_BUDGET
+
+    def test_first_tensor_imports_torch(self):
+        _, torch_loaded = _import_in_subprocess(
+            'from scitorch.conversion import digital\n'
+            'digital.to_bytes(1, "KB")')
+        assert torch_loaded
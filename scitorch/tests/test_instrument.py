@@ -0,0 +1,88 @@
+import torch
+
+from pytest import fixture
+from scitorch import instrument
+from scitorch.conversion import digital, energy, generic, parse_quantities, temperature
+
+
+@fixture
+def recording():
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def stat(function, **fields):
+    stats = [s for s in instrument.snapshot() if s['function'] == function]
+    assert len(stats) == 1, stats
+    for key, value in fields.items():
+        assert stats[0][key] == value, (key, stats[0])
+    return stats[0]
+
+
+class TestInstrument(object):
+    def test_disabled_by_default(self):
+        instrument.reset()
+        assert not instrument.is_enabled()
+        digital.to_bytes([1, 2], 'KB')
+        assert instrument.snapshot() == []
+
+    def test_counts(self, recording):
+        digital.to_bytes([1, 2], 'KB')
+        digital.to_bytes([3, 4], 'KB')
+        digital.to_bytes(torch.ones(500), unit='KB')
+        digital.to_bytes(1, 'KB', dtype='float32')
+        stats = [s for s in instrument.snapshot() if s['size'] == '1e1']
+        assert len(stats) == 1
+        assert stats[0]['unit'] == 'KB'
+        assert stats[0]['dtype'] == 'float64'
+        assert stats[0]['calls'] == 2
+        assert stats[0]['elements'] == 4
+        assert stats[0]['seconds'] > 0
+        sizes = {(s['size'], s['dtype']): s['elements'] for s in instrument.snapshot()}
+        assert sizes == {('1e1', 'float64'): 4, ('1e3', 'float64'): 500, ('1e0', 'float32'): 1}
+
+    def test_default_unit(self, recording):
+        energy.to_joule([1, 2])
+        stat('energy.to_joule', unit='J', calls=1)
+
+    def test_batch_units(self, recording):
+        temperature.to_kelvin_batch([0, 32], ['c', 'f'])
+        stat('temperature.to_kelvin_batch', unit='mixed', elements=2)
+
+    def test_unit_pair(self, recording):
+        generic.convert([1, 2, 3], 'KiB', to_unit='B', dim=True)
+        stat('generic.convert', unit='KiB->B', elements=3)
+
+    def test_exact_and_formatting(self, recording):
+        digital.to_bytes_exact([1, 2], 'Kibit')
+        parse_quantities(['1 KB', '2 MB'])
+        stat('digital.to_bytes_exact', dtype='int64', elements=2)
+        stat('parsing.parse_quantities', unit='default', elements=2)
+        instrument.reset()
+        digital.format_bytes([1, 2048], 'B')
+        stat('digital.format_bytes', dtype='str', elements=2)
+        stat('digital.autoscale', calls=1)
+
+    def test_reset(self, recording):
+        digital.to_bytes(1, 'KB')
+        instrument.reset()
+        assert instrument.snapshot() == []
+
+    def test_disable_keeps_stats(self, recording):
+        digital.to_bytes(1, 'KB')
+        instrument.disable()
+        digital.to_bytes(1, 'KB')
+        stat('digital.to_bytes', calls=1)
+
+    def test_profiler_labels(self, recording):
+        with torch.profiler.profile() as profiler:
+            digital.to_bytes([1, 2], 'KB')
+        names = [event.name for event in profiler.events()]
+        assert 'scitorch::digital.to_bytes(KB)' in names
+
+    def test_wraps(self):
+        assert digital.to_bytes.__name__ == 'to_bytes'
+        assert 'Parameters' in digital.to_bytes.__doc__
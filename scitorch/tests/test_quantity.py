@@ -0,0 +1,74 @@
+import torch
+
+from pytest import raises
+from scitorch.tools._tensors import T
+from scitorch.quantity import Quantity
+from scitorch.constants import constants
+
+
+class TestQuantity(object):
+    def test_create(self):
+        q = Quantity([1, 2], 'MB')
+        assert isinstance(q, torch.Tensor)
+        assert q.unit == 'MB'
+        assert torch.equal(q.as_subclass(torch.Tensor), T([1, 2]))
+
+    def test_slicing(self):
+        q = Quantity([1, 2, 3], 'J')
+        assert q[1:].unit == 'J'
+        assert q[0].unit == 'J'
+
+    def test_scalar_arithmetic(self):
+        q = Quantity([1, 2], 'kg')
+        assert (q * 2).unit == 'kg'
+        assert (q + 1).unit == 'kg'
+        assert (2 / q).unit == 'kg^(-1)'
+        assert (q ** 2).unit == 'kg^(2)'
+
+    def test_quantity_arithmetic(self):
+        a = Quantity([1, 2], 'J')
+        b = Quantity([1, 2], 's')
+        assert (a * b).unit == 'J*s'
+        assert (a / b).unit == 'J*s^(-1)'
+        assert (a + a).unit == 'J'
+
+    def test_different_units(self):
+        with raises(ValueError):
+            Quantity([1, 2], 'J') + Quantity([1, 2], 's')
+        with raises(ValueError):
+            torch.cat([Quantity([1], 'J'), Quantity([1], 'B')])
+
+    def test_cat_stack(self):
+        a = Quantity([1, 2], 'B')
+        assert torch.cat([a, a]).unit == 'B'
+        assert torch.stack([a, a]).unit == 'B'
+
+    def test_reductions(self):
+        q = Quantity([1, 2, 3], 'K')
+        assert q.sum().unit == 'K'
+        assert q.mean().unit == 'K'
+        values, indices = q.max(dim=0)
+        assert values.unit == 'K'
+        assert not isinstance(indices, Quantity)
+
+    def test_comparison_is_plain_tensor(self):
+        q = Quantity([1, 2], 'B')
+        assert not isinstance(q > 1, Quantity)
+
+    def test_inplace(self):
+        q = Quantity([1, 2], 'B')
+        q += 1
+        assert isinstance(q, Quantity) and q.unit == 'B'
+        assert torch.equal(q.as_subclass(torch.Tensor), T([2, 3]))
+
+    def test_repr(self):
+        assert repr(Quantity([1, 2], 'B')) == "Quantity([1., 2.], dtype=torch.float64, unit='B')"
+
+    def test_convert_to(self):
+        q = Quantity([1, 2], 'MB').convert_to('KB')
+        assert q.unit == 'KB'
+        assert torch.equal(q.as_subclass(torch.Tensor), T([constants.kilo, 2 * constants.kilo]))
+
+    def test_convert_to_same_unit_copies(self):
+        q = Quantity([1, 2], 'MB')
+        assert q.convert_to('MB') is not q
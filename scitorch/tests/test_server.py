@@ -0,0 +1,153 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+from array import array
+
+from pytest import approx, fixture, raises
+from scitorch import _protocol, server
+from scitorch.client import Client
+from scitorch.conversion import generic
+from scitorch.server import Server
+
+
+@fixture
+def address(tmp_path):
+    with Server(str(tmp_path / 'scitorch.sock'), window=1e-3).start() as server:
+        yield server.address
+
+
+class TestServer(object):
+    def test_convert(self, address):
+        with Client(address) as client:
+            assert client.convert([1, 2], 'KiB', 'B') == [1024., 2048.]
+            assert client.convert(1, 'KWh', 'Wh') == 1000.
+            assert client.convert([], 'B', 'KB') == []
+
+    def test_family_shortcuts(self, address):
+        with Client(address) as client:
+            assert client.to_bytes([1, 2], 'KB') == [1000., 2000.]
+            assert client.to_bits(1, 'B') == 8.
+            assert client.to_joule(1, 'KJ') == 1000.
+            assert client.to_kilogram(1000, 'g') == 1.
+            assert client.to_kelvin(0, 'c') == approx(273.15)
+            assert client.to_celsius(212, 'f') == approx(100.)
+            assert client.to_fahrenheit(100, 'c') == 212.
+
+    def test_concurrent_clients(self, address):
+        results = {}
+
+        def work(i):
+            with Client(address) as client:
+                results[i] = [client.convert([i, 2 * i], 'KiB' if i % 2 else 'KB', 'B') for _ in range(20)]
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(8):
+            factor = 1024 if i % 2 else 1000
+            assert results[i] == [[i * factor, 2 * i * factor]] * 20
+
+    def test_wrong_unit(self, address):
+        with Client(address) as client:
+            with raises(NotImplementedError):
+                client.convert([1], 'B', 'xyz')
+            # the connection stays usable
+            assert client.to_bytes(1, 'KB') == 1000.
+
+    def test_error_stays_with_request(self, monkeypatch):
+        convert = generic.convert
+
+        def fail_on_negative(val, *args, **kwargs):
+            if len(val) and float(val.min()) < 0:
+                raise ValueError('negative value')
+            return convert(val, *args, **kwargs)
+
+        monkeypatch.setattr(generic, 'convert', fail_on_negative)
+        pairs = [socket.socketpair() for _ in range(3)]
+        batch = [(pair[0], i, ('KB', 'B'), array('d', [value]).tobytes())
+                 for i, (pair, value) in enumerate(zip(pairs, [1, -1, 2]))]
+        server._convert(batch)
+        responses = []
+        for _, sock in pairs:
+            request_id, size, status = _protocol.RESPONSE.unpack(_protocol.recv_exact(sock, _protocol.RESPONSE.size))
+            payload = _protocol.recv_exact(sock, size * 8 if status == _protocol.OK else size)
+            responses.append((request_id, status, payload))
+        assert responses == [(0, _protocol.OK, array('d', [1000]).tobytes()),
+                             (1, _protocol.ERROR, b'ValueError: negative value'),
+                             (2, _protocol.OK, array('d', [2000]).tobytes())]
+
+    def test_invalid_unit_encoding(self, address):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        with sock:
+            for request_id in (1, 2):
+                sock.sendall(_protocol.REQUEST.pack(request_id, 0, 1, 1) + b'\xffB')
+                header = _protocol.recv_exact(sock, _protocol.RESPONSE.size)
+                response_id, size, status = _protocol.RESPONSE.unpack(header)
+                assert (response_id, status) == (request_id, _protocol.ERROR)
+                assert _protocol.recv_exact(sock, size) == b'ValueError: units must be UTF-8 encoded.'
+
+    def test_oversized_request(self, address):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        with sock:
+            sock.sendall(_protocol.REQUEST.pack(1, _protocol.MAX_VALUES + 1, 1, 1))
+            assert sock.recv(1) == b''
+
+    def test_client_request_limit(self, address, monkeypatch):
+        monkeypatch.setattr(_protocol, 'MAX_VALUES', 2)
+        with Client(address) as client:
+            with raises(ValueError, match='at most 2 values'):
+                client.convert([1, 2, 3], 'B', 'KB')
+
+    def test_existing_file(self, tmp_path):
+        path = tmp_path / 'data.txt'
+        path.write_text('keep')
+        with raises(FileExistsError):
+            Server(str(path))
+        assert path.read_text() == 'keep'
+
+    def test_stale_socket(self, tmp_path):
+        path = str(tmp_path / 'scitorch.sock')
+        Server(path)._server.server_close()
+        assert os.path.exists(path)
+        Server(path).shutdown()
+        assert not os.path.exists(path)
+
+    def test_keeps_replaced_path(self, tmp_path):
+        path = tmp_path / 'scitorch.sock'
+        server = Server(str(path))
+        path.unlink()
+        path.write_text('keep')
+        server.shutdown()
+        assert path.read_text() == 'keep'
+
+    def test_tcp(self):
+        with Server(('127.0.0.1', 0)).start() as server:
+            with Client(server.address) as client:
+                assert client.to_bytes([1], 'KiB') == [1024.]
+
+    def test_client_does_not_import_torch(self):
+        code = 'import sys, scitorch.client; print("torch" in sys.modules)'
+        assert subprocess.check_output([sys.executable, '-c', code]).decode().strip() == 'False'
+
+
+class TestClient(object):
+    def test_unusable_after_timeout(self, tmp_path):
+        # a server that accepts connections but never answers
+        path = str(tmp_path / 'silent.sock')
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+        try:
+            with Client(path, timeout=0.05) as client:
+                with raises(socket.timeout):
+                    client.to_bytes(1, 'KB')
+                with raises(ConnectionError, match='closed'):
+                    client.to_bytes(1, 'KB')
+        finally:
+            listener.close()
@@ -0,0 +1,214 @@
+from array import array
+
+import torch
+
+from pytest import raises, fixture, importorskip
+import scitorch
+from scitorch.tools._tensors import T, ingest
+from scitorch.conversion.digital import to_bytes, to_bytes_batch, to_bytes_exact
+
+
+@fixture
+def preserve():
+    default = scitorch.get_dtype()
+    scitorch.set_dtype('preserve')
+    yield
+    scitorch.set_dtype(default)
+
+
+class TestT(object):
+    def test_default_dtype(self):
+        assert T([0, 1]).dtype == torch.float64
+        assert T(torch.ones(2, dtype=torch.float32)).dtype == torch.float64
+
+    def test_float64_tensor_is_not_copied(self):
+        tensor = torch.ones(2, dtype=torch.float64)
+        assert T(tensor) is tensor
+
+    def test_preserve_float32_is_not_copied(self):
+        tensor = torch.ones(2, dtype=torch.float32)
+        assert T(tensor, dtype='preserve') is tensor
+
+    def test_preserve_bfloat16_is_not_copied(self):
+        tensor = torch.ones(2, dtype=torch.bfloat16)
+        assert T(tensor, dtype='preserve') is tensor
+
+    def test_preserve_promotes_integers(self):
+        assert T(torch.arange(3), dtype='preserve').dtype == torch.float64
+        assert T([0, 1], dtype='preserve').dtype == torch.float64
+
+    def test_explicit_dtype(self):
+        assert T([0, 1], dtype='float32').dtype == torch.float32
+        assert T([0, 1], dtype=torch.float16).dtype == torch.float16
+
+    def test_wrong_dtype(self):
+        with raises(ValueError):
+            T([0, 1], dtype='int64')
+        with raises(ValueError):
+            T([0, 1], dtype=torch.int32)
+
+
+class TestDtypePolicy(object):
+    def test_set_dtype_preserve(self, preserve):
+        tensor = torch.ones(2, dtype=torch.float32)
+        assert scitorch.get_dtype() == 'preserve'
+        assert to_bytes(tensor, 'B') is tensor
+        assert to_bytes(tensor, 'KB').dtype == torch.float32
+
+    def test_per_call_dtype_overrides_policy(self, preserve):
+        tensor = torch.ones(2, dtype=torch.float32)
+        assert to_bytes(tensor, 'KB', dtype='float64').dtype == torch.float64
+
+    def test_input_is_not_modified(self, preserve):
+        tensor = torch.ones(2, dtype=torch.float32)
+        to_bytes(tensor, 'KB')
+        assert torch.equal(tensor, torch.ones(2, dtype=torch.float32))
+
+    def test_set_wrong_dtype(self):
+        with raises(ValueError):
+            scitorch.set_dtype('float128')
+
+
+class TestIngest(object):
+    def test_array_is_shared(self):
+        values = array('d', [1, 2])
+        tensor = ingest(values)
+        assert tensor.dtype == torch.float64
+        tensor[0] = 5
+        assert values[0] == 5
+
+    def test_array_typecodes(self):
+        assert ingest(array('f', [1])).dtype == torch.float32
+        assert ingest(array('q', [1])).dtype == torch.int64
+        assert ingest(array('i', [1])).dtype == torch.int32
+        assert ingest(array('b', [1])).dtype == torch.int8
+
+    def test_empty_array(self):
+        assert ingest(array('d')).numel() == 0
+
+    def test_memoryview_shape(self):
+        view = memoryview(array('d', range(6))).cast('B').cast('d', [2, 3])
+        assert ingest(view).shape == (2, 3)
+
+    def test_read_only_buffer(self):
+        view = memoryview(array('d', [1, 2]).tobytes()).cast('d')
+        assert torch.equal(ingest(view), T([1, 2]))
+        with raises(ValueError):
+            ingest(view, writable=True)
+
+    def test_dlpack(self):
+        tensor = torch.ones(2)
+        assert ingest(torch.utils.dlpack.to_dlpack(tensor)).data_ptr() == tensor.data_ptr()
+
+    def test_other_values(self):
+        values = [1, 2]
+        assert ingest(values) is values
+        assert ingest(1.5) == 1.5
+
+    def test_preserve_array(self, preserve):
+        values = array('f', [1, 2])
+        tensor = T(values)
+        assert tensor.dtype == torch.float32
+        tensor[0] = 5
+        assert values[0] == 5
+
+    def test_convert_array(self):
+        assert torch.equal(to_bytes(array('d', [1, 2]), 'KB'), T([1000, 2000]))
+
+    def test_convert_array_inplace(self):
+        values = array('d', [1, 2])
+        to_bytes(values, 'KB', inplace=True)
+        assert list(values) == [1000, 2000]
+
+    def test_convert_into_array(self):
+        out = array('f', [0, 0])
+        to_bytes([1, 2], 'KB', out=out)
+        assert list(out) == [1000, 2000]
+
+    def test_inplace_read_only(self):
+        with raises(ValueError):
+            to_bytes(memoryview(array('d', [1]).tobytes()).cast('d'), 'KB', inplace=True)
+
+    def test_identity_read_only(self):
+        data = array('d', [1, 2]).tobytes()
+        for val in [memoryview(data).cast('d'), data]:
+            result = to_bytes(val, 'B')
+            result[0] = 5
+        assert array('d', data).tolist() == [1, 2]
+        integers = array('q', [3]).tobytes()
+        result, _ = to_bytes_exact(memoryview(integers).cast('q'), 'B')
+        result[0] = 5
+        assert array('q', integers).tolist() == [3]
+
+    def test_exact_array(self):
+        result, _ = to_bytes_exact(array('q', [2**53 + 1]), 'B')
+        assert result.item() == 2**53 + 1
+
+
+class TestNumpy(object):
+    def test_shared(self):
+        numpy = importorskip('numpy')
+        values = numpy.ones(2)
+        tensor = T(values)
+        tensor[0] = 5
+        assert values[0] == 5
+
+    def test_preserve_float32(self, preserve):
+        numpy = importorskip('numpy')
+        values = numpy.ones(2, dtype=numpy.float32)
+        assert T(values).dtype == torch.float32
+
+    def test_read_only(self):
+        numpy = importorskip('numpy')
+        values = numpy.ones(2)
+        values.flags.writeable = False
+        assert torch.equal(to_bytes(values, 'KB'), T([1000, 1000]))
+        with raises(ValueError):
+            to_bytes(values, 'KB', inplace=True)
+
+    def test_identity_read_only(self):
+        numpy = importorskip('numpy')
+        values = numpy.ones(2)
+        values.flags.writeable = False
+        with scitorch.using(container='same'):
+            result = to_bytes(values, 'B')
+        assert result.flags.writeable
+        result[0] = 5
+        assert values.tolist() == [1, 1]
+
+    def test_non_native_byte_order(self):
+        numpy = importorskip('numpy')
+        values = numpy.ones(2, dtype='>f8')
+        assert torch.equal(to_bytes(values, 'KB'), T([1000, 1000]))
+
+    def test_tensor_container_by_default(self):
+        numpy = importorskip('numpy')
+        assert isinstance(to_bytes(numpy.ones(2), 'KB'), torch.Tensor)
+
+    def test_same_container(self):
+        numpy = importorskip('numpy')
+        with scitorch.using(container='same'):
+            result = to_bytes(numpy.ones(2), 'KB')
+            assert isinstance(result, numpy.ndarray)
+            assert result.tolist() == [1000, 1000]
+            assert isinstance(to_bytes([1, 2], 'KB'), torch.Tensor)
+
+    def test_same_container_inplace(self):
+        numpy = importorskip('numpy')
+        values = numpy.ones(2)
+        with scitorch.using(container='same'):
+            assert to_bytes(values, 'KB', inplace=True) is values
+        assert values.tolist() == [1000, 1000]
+
+    def test_same_container_out(self):
+        numpy = importorskip('numpy')
+        out = numpy.empty(2, dtype=numpy.float32)
+        with scitorch.using(container='same'):
+            assert to_bytes_batch(numpy.ones(2), ['KB', 'B'], out=out) is out
+        assert out.tolist() == [1000, 1]
+
+    def test_same_container_result_is_shared(self):
+        numpy = importorskip('numpy')
+        with scitorch.using(container='same'):
+            values = numpy.ones(2)
+            assert numpy.shares_memory(to_bytes(values, 'B'), values)
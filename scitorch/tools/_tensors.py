@@ -1,8 +1,135 @@
 """Small tools for tensor manipulation/creation."""
 
-import torch
+import sys
+import warnings
 
-from scitorch._device import DEVICE as device
+from scitorch._lazy import torch
+from scitorch import _config
 
-def T(val):
-    return torch.as_tensor(val, device=device, dtype=torch.float64)
\ No newline at end of file
+# Integer dtypes of buffer-protocol items by signedness and size in bytes.
+_INTEGERS = {
+    (True, 1): 'int8',
+    (False, 1): 'uint8',
+    (True, 2): 'int16',
+    (True, 4): 'int32',
+    (True, 8): 'int64',
+}
+
+_FLOATS = {
+    'e': 'float16',
+    'f': 'float32',
+    'd': 'float64',
+}
+
+
+def is_ndarray(val):
+    """True if `val` is a NumPy array. NumPy is not imported for the check."""
+
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(val, numpy.ndarray)
+
+
+def ingest(val, writable=False):
+    """Returns NumPy arrays, DLPack capsules and producers and buffer-protocol objects as tensors
+    that share their memory. Everything else, including tensors, is returned as it is.
+
+    Read-only arrays and buffers are shared as well, since scitorch does not write to its input;
+    results that would share their memory are copied (see is_read_only). With `writable=True`, as
+    for in-place conversions and `out=`, they raise ValueError instead.
+    """
+
+    if isinstance(val, (torch.Tensor, int, float, list, tuple, str)):
+        return val
+    if is_ndarray(val):
+        if writable and not val.flags.writeable:
+            raise ValueError('the NumPy array is read-only.')
+        if not val.dtype.isnative:
+            if writable:
+                raise ValueError('the NumPy array is not in native byte order.')
+            val = val.astype(val.dtype.newbyteorder('='))
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings('ignore', message='The given NumPy array is not writable')
+                return torch.from_numpy(val)
+        except TypeError:
+            # dtypes that torch does not support are left to torch.as_tensor
+            return val
+    if hasattr(val, '__dlpack__'):
+        return torch.from_dlpack(val)
+    if type(val).__name__ == 'PyCapsule':
+        return torch.utils.dlpack.from_dlpack(val)
+    try:
+        view = memoryview(val)
+    except TypeError:
+        return val
+    if writable and view.readonly:
+        raise ValueError(f'the {type(val).__name__} buffer is read-only.')
+    return _from_buffer(view, val)
+
+
+def is_read_only(val):
+    """True if `val` is a read-only NumPy array or buffer, whose memory ingest() shares."""
+
+    if isinstance(val, (torch.Tensor, int, float, list, tuple, str)):
+        return False
+    if is_ndarray(val):
+        return not val.flags.writeable
+    try:
+        return memoryview(val).readonly
+    except TypeError:
+        return False
+
+
+def _from_buffer(view, val):
+    code = view.format.lstrip('@=')
+    if code in _FLOATS:
+        dtype = _FLOATS[code]
+    elif len(code) == 1 and code.lower() in 'bhilq':
+        dtype = _INTEGERS.get((code.islower(), view.itemsize))
+    else:
+        dtype = None
+    if dtype is None or not view.c_contiguous:
+        return val
+    if not view.nbytes:
+        return torch.empty(view.shape, dtype=getattr(torch, dtype))
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='The given buffer is not writable')
+        tensor = torch.frombuffer(view, dtype=getattr(torch, dtype))
+    return tensor.reshape(view.shape)
+
+
+def T(val, dtype=None):
+    """Returns `val` as a tensor on the configured device.
+
+    `dtype` overrides the default dtype policy (see scitorch.set_dtype). NumPy arrays, DLPack
+    capsules and producers and buffer-protocol objects (e.g. array.array) are taken over without
+    a copy (see ingest()). Tensors that already have an acceptable dtype and device are returned
+    as they are; everything else is converted in a single step.
+    """
+
+    device = _config.get_device()
+    dtype = _config.get_dtype() if dtype is None else _config.resolve_dtype(dtype)
+    val = ingest(val)
+    if dtype == 'preserve':
+        if isinstance(val, torch.Tensor) and val.is_floating_point():
+            return val.to(device=device)
+        dtype = torch.float64
+    return torch.as_tensor(val, device=device, dtype=dtype)
+
+
+def restore(result, val, shared=False):
+    """Returns `result` in the container type of `val` if the container policy is 'same' (see
+    scitorch.set_container).
+
+    With `shared=True`, `result` was written into the memory of `val` (in-place conversions and
+    `out=`), and `val` itself is returned. Otherwise NumPy arrays give NumPy arrays that share the
+    memory of `result`, and everything else gives `result`.
+    """
+
+    if isinstance(val, torch.Tensor) or _config.get_container() != 'same':
+        return result
+    if shared:
+        return val
+    if is_ndarray(val):
+        return result.detach().cpu().numpy()
+    return result